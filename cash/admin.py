@@ -1,4 +1,5 @@
 from django.contrib import admin, messages
+from django.db.models import Q, Sum
 from django.utils import timezone
 from .models import CashRegister, CashMovement
 
@@ -21,10 +22,18 @@ class CashRegisterAdmin(admin.ModelAdmin):
     ordering = ("-opened_at",)
     actions = ["cerrar_caja"]
 
+    def get_queryset(self, request):
+        # ingresos y egresos de todas las cajas en la misma consulta
+        return super().get_queryset(request).select_related("opened_by", "closed_by").annotate(
+            total_ingresos=Sum("movements__amount", filter=Q(movements__movement_type="ingreso")),
+            total_egresos=Sum("movements__amount", filter=Q(movements__movement_type="egreso")),
+        )
+
     @admin.display(description="Balance actual (RD$)")
     def current_balance(self, obj):
         """Muestra el balance actual calculado."""
-        return f"{obj.balance_actual:.2f}"
+        balance = obj.opening_balance + (obj.total_ingresos or 0) - (obj.total_egresos or 0)
+        return f"{balance:.2f}"
 
     @admin.action(description="Cerrar caja seleccionada")
     def cerrar_caja(self, request, queryset):
@@ -75,6 +84,7 @@ class CashMovementAdmin(admin.ModelAdmin):
     list_filter = ("movement_type", "register", "created_by")
     search_fields = ("description", "related_order__code")
     ordering = ("-created_at",)
+    list_select_related = ("register", "created_by", "related_order")
     readonly_fields = ("created_at",)
 
     @admin.display(description="Orden relacionada")
@@ -1,3 +1,41 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import CashMovement, CashRegister
+
+
+class CashListPaginationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("cajero", password="x")
+        self.client.force_login(self.user)
+        now = timezone.now()
+        self.registers = [
+            CashRegister.objects.create(
+                name=f"Caja {n}", opened_by=self.user, is_open=False, opened_at=now - timedelta(days=n),
+            )
+            for n in range(21)
+        ]
+
+    def test_registers_are_paginated(self):
+        response = self.client.get(reverse("cash:list"))
+        self.assertEqual(len(response.context["registers"]), 20)
+        self.assertEqual(response.context["page_obj"].paginator.num_pages, 2)
+
+        response = self.client.get(reverse("cash:list"), {"page": 2})
+        self.assertEqual(list(response.context["registers"]), [self.registers[-1]])
 
-# Create your tests here.
+    def test_movements_are_paginated(self):
+        register = self.registers[0]
+        for n in range(21):
+            CashMovement.objects.create(
+                register=register, movement_type="ingreso", amount=Decimal("10"),
+                description=f"Pago {n}", created_by=self.user,
+            )
+        response = self.client.get(reverse("cash:movements"))
+        self.assertEqual(len(response.context["movements"]), 20)
+        self.assertEqual(response.context["page_obj"].paginator.num_pages, 2)
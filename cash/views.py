@@ -8,6 +8,8 @@ from django.views.generic import ListView, CreateView, DetailView, View
 from django.utils import timezone
 from django.db.models import Sum
 
+from core.conditional import ConditionalViewMixin
+
 from .models import CashRegister, CashMovement
 
 logger = logging.getLogger(__name__)
@@ -16,14 +18,16 @@ logger = logging.getLogger(__name__)
 # ===============================
 # 🔹 LISTADO DE CAJAS
 # ===============================
-class CashRegisterListView(LoginRequiredMixin, ListView):
+class CashRegisterListView(LoginRequiredMixin, ConditionalViewMixin, ListView):
     model = CashRegister
     template_name = "cash/list.html"
+    conditional_tables = ("cash.CashRegister", "cash.CashMovement")
     context_object_name = "registers"
+    paginate_by = 20
 
     def get_queryset(self):
-        qs = CashRegister.objects.order_by("-opened_at")
-        logger.debug(f"[CASH] Listando cajas ({qs.count()})")
+        qs = CashRegister.objects.select_related("opened_by").order_by("-opened_at")
+        logger.debug("[CASH] Listando cajas")
         return qs
 
     def get_context_data(self, **kwargs):
@@ -65,6 +69,7 @@ class CashRegisterDetailView(LoginRequiredMixin, DetailView):
     model = CashRegister
     template_name = "cash/detail.html"
     context_object_name = "register"
+    queryset = CashRegister.objects.select_related("opened_by", "closed_by")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -98,14 +103,16 @@ class CloseCashRegisterView(LoginRequiredMixin, View):
 # ===============================
 # 🔹 LISTADO DE MOVIMIENTOS
 # ===============================
-class CashMovementListView(LoginRequiredMixin, ListView):
+class CashMovementListView(LoginRequiredMixin, ConditionalViewMixin, ListView):
     model = CashMovement
     template_name = "cash/movements.html"
+    conditional_tables = ("cash.CashRegister", "cash.CashMovement", "orders.Order")
     context_object_name = "movements"
+    paginate_by = 20
 
     def get_queryset(self):
         qs = CashMovement.objects.select_related("register", "related_order", "created_by").order_by("-created_at")
-        logger.debug(f"[CASH] Listando movimientos ({qs.count()})")
+        logger.debug("[CASH] Listando movimientos")
         return qs
 
     def get_context_data(self, **kwargs):
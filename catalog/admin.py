@@ -52,6 +52,7 @@ class ServiceAdmin(admin.ModelAdmin):
         "is_express_available",
     )
     list_filter = ("category", "unit_type", "is_active", "is_express_available")
+    list_select_related = ("category",)
     search_fields = ("name", "description")
     list_editable = ("is_active", "is_express_available")
     inlines = [ServiceMaterialInline, ServiceComponentInline, ServicePricingInline]
@@ -6,14 +6,19 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.template.loader import render_to_string
 
+from core.conditional import ConditionalViewMixin
+from core.partials import PartialListMixin
+
 from .models import Service
 from .forms import ServiceForm
 
 
-class ServiceListView(LoginRequiredMixin, ListView):
+class ServiceListView(LoginRequiredMixin, ConditionalViewMixin, PartialListMixin, ListView):
     """Listado principal de servicios."""
     model = Service
     template_name = "catalog/list.html"
+    partial_template_name = "catalog/_results.html"
+    conditional_tables = ("catalog.Service", "catalog.ServiceCategory")
     context_object_name = "services"
     paginate_by = 10
 
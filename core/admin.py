@@ -0,0 +1,50 @@
+from django.contrib import admin
+from django.utils.html import format_html
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("short_sql", "calls", "avg_display", "max_ms", "full_scan", "view", "call_site", "last_seen")
+    list_filter = ("full_scan", "database", "view")
+    search_fields = ("sql", "view", "call_site")
+    ordering = ("-max_ms",)
+    readonly_fields = (
+        "fingerprint", "database", "sql_display", "plan_display", "full_scan",
+        "view", "call_site", "stack_display", "calls", "avg_display", "max_ms",
+        "last_ms", "first_seen", "last_seen",
+    )
+    fieldsets = (
+        ("Consulta", {"fields": ("sql_display", "fingerprint", "database")}),
+        ("Plan", {"fields": ("plan_display", "full_scan")}),
+        ("Origen", {"fields": ("view", "call_site", "stack_display")}),
+        ("Tiempos", {"fields": ("calls", "avg_display", "max_ms", "last_ms", "first_seen", "last_seen")}),
+    )
+
+    # 🔹 Solo lectura: las filas las escribe core/slowlog.py
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        return obj.sql[:120]
+
+    @admin.display(description="Prom. (ms)", ordering="total_ms")
+    def avg_display(self, obj):
+        return f"{obj.avg_ms:.1f}"
+
+    @admin.display(description="SQL normalizado")
+    def sql_display(self, obj):
+        return format_html('<pre style="white-space:pre-wrap">{}</pre>', obj.sql)
+
+    @admin.display(description="Plan de ejecución")
+    def plan_display(self, obj):
+        return format_html("<pre>{}</pre>", obj.plan or "—")
+
+    @admin.display(description="Pila")
+    def stack_display(self, obj):
+        return format_html("<pre>{}</pre>", obj.stack or "—")
@@ -0,0 +1,25 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import checks  # registra las verificaciones de despliegue
+        from .signals import connect_signals
+        connect_signals()
+
+        if getattr(settings, "REQUEST_TIMING_ENABLED", True):
+            from . import timing
+            timing.install()
+
+        if getattr(settings, "SLOW_QUERY_LOG_ENABLED", True):
+            from . import slowlog
+            slowlog.install()
+
+        if getattr(settings, "NPLUSONE_DETECTION", settings.DEBUG):
+            from . import nplusone
+            nplusone.install()
@@ -0,0 +1,309 @@
+# core/assets.py
+# Bundles de CSS/JS por grupo de páginas: cada plantilla declara solo las
+# librerías que usa ({% bundle "charts" "js" %}). `build_assets` concatena,
+# minifica, nombra por hash de contenido y precomprime (.br/.gz); la vista
+# `serve_bundle` los entrega con caché inmutable.
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.templatetags.static import static
+from django.utils._os import safe_join
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Extensiones que vale la pena precomprimir (las imágenes ya vienen comprimidas)
+COMPRESSIBLE = {".css", ".js", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ico", ".ttf", ".eot", ".otf"}
+MIN_COMPRESS_SIZE = 1024
+
+_manifest_cache = {"mtime": None, "data": None}
+
+
+def get_bundles_dir():
+    return Path(getattr(settings, "ASSET_BUNDLES_DIR", settings.BASE_DIR / "var" / "bundles"))
+
+
+def get_bundles_url():
+    return getattr(settings, "ASSET_BUNDLES_URL", "/bundles/")
+
+
+# =====================================================
+# 🔹 MINIFICACIÓN CONSERVADORA
+# =====================================================
+# Solo transformaciones que no requieren un parser completo: los archivos
+# de terceros ya vienen minificados y lo que más pesa son los comentarios
+# y la indentación de los propios.
+_CSS_TOKENS = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/)""", re.S)
+
+
+def minify_css(text):
+    out = []
+    for i, part in enumerate(_CSS_TOKENS.split(text)):
+        if i % 2:
+            # cadenas intactas; comentarios fuera salvo los de licencia /*! */
+            if part.startswith("/*"):
+                if part.startswith("/*!"):
+                    out.append(part)
+                continue
+            out.append(part)
+            continue
+        part = re.sub(r"\s+", " ", part)
+        part = re.sub(r"\s*([{};])\s*", r"\1", part)
+        part = part.replace(";}", "}")
+        out.append(part)
+    return "".join(out).strip()
+
+
+def minify_js(text):
+    """
+    Quita comentarios de línea completa, bloques /* */ al inicio de línea y
+    la indentación. Nunca une líneas (no altera la inserción automática de
+    ';') ni toca el interior de template literals multilínea.
+    """
+    out = []
+    in_comment = False
+    in_template = False
+    for line in text.splitlines():
+        if in_template:
+            out.append(line)
+            if line.count("`") % 2:
+                in_template = False
+            continue
+
+        stripped = line.strip()
+        if in_comment:
+            if "*/" not in stripped:
+                continue
+            stripped = stripped.split("*/", 1)[1].strip()
+            in_comment = False
+
+        while stripped.startswith("/*") and not stripped.startswith("/*!"):
+            if "*/" not in stripped[2:]:
+                in_comment = True
+                stripped = ""
+                break
+            stripped = stripped[2:].split("*/", 1)[1].strip()
+
+        if not stripped or stripped.startswith("//"):
+            continue
+        out.append(stripped)
+        if stripped.count("`") % 2:
+            in_template = True
+    return "\n".join(out)
+
+
+# =====================================================
+# 🔹 CONSTRUCCIÓN
+# =====================================================
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_CSS_IMPORT = re.compile(r"""@import\s+[^;]+;""")
+
+
+def _static_url(path):
+    """URL pública de un estático (con hash si el storage es de manifiesto)."""
+    try:
+        return static(path)
+    except ValueError:
+        return settings.STATIC_URL + path
+
+
+def _rewrite_css_urls(text, source):
+    """Convierte las url() relativas de `source` en URLs absolutas de STATIC_URL."""
+    base = posixpath.dirname(source)
+
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+        # ?v=... y #iefix se conservan tal cual
+        cut = re.search(r"[?#]", url)
+        path, suffix = (url[:cut.start()], url[cut.start():]) if cut else (url, "")
+        resolved = posixpath.normpath(posixpath.join(base, path))
+        return f"url({quote}{_static_url(resolved)}{suffix}{quote})"
+
+    return _CSS_URL.sub(replace, text)
+
+
+def _read_source(path):
+    found = finders.find(path)
+    if not found:
+        raise FileNotFoundError(f"Estático no encontrado: {path}")
+    return Path(found).read_text(encoding="utf-8")
+
+
+def _build_css(sources):
+    imports, bodies = [], []
+    for source in sources:
+        text = _rewrite_css_urls(_read_source(source), source)
+        text = text.replace('@charset "UTF-8";', "")
+        # @import solo es válido al principio de la hoja: se suben todos.
+        imports.extend(_CSS_IMPORT.findall(text))
+        bodies.append(minify_css(_CSS_IMPORT.sub("", text)))
+    return '@charset "UTF-8";' + "".join(imports) + "\n".join(bodies)
+
+
+def _build_js(sources):
+    # ';' entre archivos por si alguno termina sin punto y coma
+    return "\n;\n".join(minify_js(_read_source(source)) for source in sources)
+
+
+def precompress(path):
+    """Escribe `path.br` y `path.gz` junto al archivo si reducen su tamaño."""
+    path = Path(path)
+    data = path.read_bytes()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return {}
+
+    try:
+        import brotli
+        compressed = {"br": brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)}
+    except ImportError:
+        compressed = {}
+    try:
+        import zopfli.gzip
+        compressed["gz"] = zopfli.gzip.compress(data)
+    except ImportError:
+        compressed["gz"] = gzip.compress(data, compresslevel=9, mtime=0)
+
+    sizes = {}
+    for ext, content in compressed.items():
+        if len(content) < len(data) * 0.95:
+            Path(f"{path}.{ext}").write_bytes(content)
+            sizes[ext] = len(content)
+    return sizes
+
+
+def build_bundles(compress=True):
+    """
+    Genera los bundles declarados en ASSET_BUNDLES y el manifiesto
+    {nombre: {"css": archivo, "js": archivo}}. Borra los de builds anteriores.
+    """
+    out_dir = get_bundles_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {"bundles": {}, "sources": {}}
+    builders = {"css": _build_css, "js": _build_js}
+    for name, kinds in settings.ASSET_BUNDLES.items():
+        manifest["bundles"][name] = {}
+        for kind, sources in kinds.items():
+            if not sources:
+                continue
+            content = builders[kind](sources).encode("utf-8")
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            filename = f"{name}.{digest}.{kind}"
+            target = out_dir / filename
+            if not target.exists():
+                target.write_bytes(content)
+            if compress and not target.with_name(f"{filename}.gz").exists():
+                precompress(target)
+            manifest["bundles"][name][kind] = filename
+            for source in sources:
+                manifest["sources"][source] = _source_mtime(source)
+
+    tmp = out_dir / f".{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2))
+    tmp.replace(out_dir / MANIFEST_NAME)
+    _prune(out_dir, manifest)
+    logger.info(f"[ASSETS] {sum(len(k) for k in manifest['bundles'].values())} bundles generados en {out_dir}")
+    return manifest
+
+
+def _source_mtime(source):
+    found = finders.find(source)
+    return Path(found).stat().st_mtime if found else None
+
+
+def _prune(out_dir, manifest):
+    current = {f for kinds in manifest["bundles"].values() for f in kinds.values()}
+    for path in out_dir.iterdir():
+        base = path.name
+        for ext in (".br", ".gz"):
+            base = base.removesuffix(ext)
+        if base != MANIFEST_NAME and not base.startswith(".") and base not in current:
+            path.unlink()
+
+
+# =====================================================
+# 🔹 RESOLUCIÓN DESDE PLANTILLAS
+# =====================================================
+def load_manifest():
+    """Manifiesto del último build (releído solo si cambió el archivo)."""
+    path = get_bundles_dir() / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    if _manifest_cache["mtime"] != mtime:
+        _manifest_cache["data"] = json.loads(path.read_text())
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["data"]
+
+
+def _is_stale(manifest, sources):
+    # En desarrollo se vuelve a los archivos sueltos si alguno cambió tras el build.
+    return any(manifest["sources"].get(s) != _source_mtime(s) for s in sources)
+
+
+def bundle_urls(name, kind):
+    """URLs a incluir para un bundle: el archivo generado o, sin build, las fuentes."""
+    sources = settings.ASSET_BUNDLES[name].get(kind, [])
+    manifest = load_manifest() if getattr(settings, "ASSET_BUNDLES_ENABLED", True) else None
+    filename = manifest and manifest["bundles"].get(name, {}).get(kind)
+    if filename and not (settings.DEBUG and _is_stale(manifest, sources)):
+        return [get_bundles_url() + filename]
+    return [_static_url(source) for source in sources]
+
+
+# =====================================================
+# 🔹 ENTREGA
+# =====================================================
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def serve_bundle(request, path):
+    """
+    Sirve un bundle con Cache-Control inmutable (el nombre lleva el hash) y
+    la variante precomprimida que acepte el cliente. En producción el
+    servidor web puede servir ASSET_BUNDLES_DIR directamente.
+    """
+    try:
+        full = Path(safe_join(get_bundles_dir(), path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not full.is_file() or full.name == MANIFEST_NAME:
+        raise Http404
+
+    content_type, _ = mimetypes.guess_type(full.name)
+    accepted = _accepted_encodings(request)
+    served, encoding = full, None
+    for ext, name in (("br", "br"), ("gz", "gzip")):
+        candidate = full.with_name(f"{full.name}.{ext}")
+        if name in accepted and candidate.is_file():
+            served, encoding = candidate, name
+            break
+
+    response = FileResponse(served.open("rb"), content_type=content_type)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["Cache-Control"] = IMMUTABLE
+    response["Vary"] = "Accept-Encoding"
+    return response
@@ -0,0 +1,184 @@
+# core/benchmarks.py
+# Benchmarks de extremo a extremo de las vistas principales: cada escenario
+# hace un request con el cliente de pruebas de Django sobre un historial de
+# generate_dataset y se mide latencia, consultas y pico de memoria.
+# `bench_views` escribe el resultado en JSON; `compare_benchmarks` lo compara
+# con un baseline y falla si algo empeoró más allá de la tolerancia.
+import itertools
+import statistics
+import time
+import tracemalloc
+
+from django.core.cache import caches
+from django.urls import reverse
+
+from . import nplusone
+from .timing import _percentile
+
+ORDER_LINES = 30  # líneas de la orden que crea el escenario orders:add
+
+
+# =====================================================
+# 🔹 ESCENARIOS
+# =====================================================
+# Cada escenario es (nombre, método, preparar). `preparar(datos)` devuelve
+# (url, datos del POST) y se llama antes de cada repetición, así las
+# escrituras trabajan siempre sobre una fila distinta.
+def _get(name, **kwargs):
+    return lambda data: (reverse(name, kwargs={k: data[v] for k, v in kwargs.items()}), None)
+
+
+def _order_create(data):
+    services = itertools.islice(itertools.cycle(data["services"]), ORDER_LINES)
+    post = {"customer": data["customer"], "discount": "0", "notes": "benchmark"}
+    post["service_id"], post["quantity"], post["price"] = zip(*[(pk, "2", str(price)) for pk, price in services])
+    return reverse("orders:add"), post
+
+
+def _order_advance(data):
+    return reverse("orders:advance", kwargs={"pk": next(data["advance"])}), {}
+
+
+SCENARIOS = [
+    ("dashboard:home", "get", _get("dashboard:home")),
+    ("orders:list", "get", _get("orders:list")),
+    ("orders:workflow", "get", _get("orders:workflow")),
+    ("orders:detail", "get", _get("orders:detail", pk="order")),
+    ("orders:add", "post", _order_create),
+    ("orders:advance", "post", _order_advance),
+    ("reports:orders_report", "get", _get("reports:orders_report")),
+    ("reports:inventory_report", "get", _get("reports:inventory_report")),
+    ("reports:financial_report", "get", _get("reports:financial_report")),
+    ("reports:customers_report", "get", _get("reports:customers_report")),
+    ("reports:services_report", "get", _get("reports:services_report")),
+    ("reports:sla_report", "get", _get("reports:sla_report")),
+    ("cash:detail", "get", _get("cash:detail", pk="register")),
+    ("inventory:movements", "get", _get("inventory:movements")),
+]
+
+
+def scenario_data():
+    """Filas de la base con las que se arman las URL y los POST."""
+    from cash.models import CashRegister
+    from catalog.models import Service
+    from customers.models import Customer
+    from orders.models import Order
+
+    order = Order.objects.filter(status="entregado").order_by("-pk").first() or Order.objects.order_by("-pk").first()
+    # la última caja cerrada tiene el día completo de movimientos
+    register = (
+        CashRegister.objects.filter(is_open=False).order_by("-opened_at").first()
+        or CashRegister.objects.order_by("-opened_at").first()
+    )
+    customer = Customer.objects.filter(is_active=True).order_by("pk").first()
+    services = list(Service.objects.filter(is_active=True).order_by("pk").values_list("pk", "base_price"))
+    if not (order and register and customer and services):
+        return None
+    # pendientes más recientes; cada pasada las avanza un estado más
+    pending = list(Order.objects.filter(status="pendiente").order_by("-pk").values_list("pk", flat=True)[:200])
+    return {
+        "order": order.pk,
+        "register": register.pk,
+        "customer": customer.pk,
+        "services": services,
+        "advance": itertools.cycle(pending or [order.pk]),
+    }
+
+
+def dataset_counts():
+    from cash.models import CashMovement
+    from customers.models import Customer
+    from inventory.models import InventoryMovement
+    from orders.models import Order, OrderLine
+
+    return {
+        model._meta.label: model.objects.count()
+        for model in (Customer, Order, OrderLine, InventoryMovement, CashMovement)
+    }
+
+
+# =====================================================
+# 🔹 MEDICIÓN
+# =====================================================
+def _request(client, method, url, post, cold):
+    if cold:
+        for alias in caches:
+            caches[alias].clear()
+    with nplusone.track_queries() as tracker:
+        started = time.perf_counter()
+        response = getattr(client, method)(url, post) if method == "post" else client.get(url)
+        elapsed = time.perf_counter() - started
+    return response.status_code, elapsed, tracker.total
+
+
+def run_scenario(client, scenario, data, iterations, warmup, cold=True):
+    """Latencias (ms), consultas y pico de memoria (KiB) de un escenario.
+
+    El pico se mide en una repetición aparte: tracemalloc hace más lento
+    todo lo que corre con él activo.
+    """
+    name, method, prepare = scenario
+    statuses = set()
+    for _ in range(warmup):
+        statuses.add(_request(client, method, *prepare(data), cold)[0])
+
+    latencies, queries = [], []
+    for _ in range(iterations):
+        status, elapsed, total = _request(client, method, *prepare(data), cold)
+        statuses.add(status)
+        latencies.append(elapsed * 1000)
+        queries.append(total)
+
+    tracemalloc.start()
+    try:
+        statuses.add(_request(client, method, *prepare(data), cold)[0])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "status": sorted(statuses),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies),
+        "max_ms": latencies[-1],
+        "queries": statistics.median_low(queries),
+        "queries_max": max(queries),
+        "peak_kib": peak / 1024,
+    }
+
+
+# =====================================================
+# 🔹 COMPARACIÓN
+# =====================================================
+def compare(baseline, current, tolerance=0.2, memory_tolerance=0.2, min_ms=5.0):
+    """[(escenario, métrica, antes, ahora, empeoró)] y avisos generales.
+
+    La latencia (p50 y p95) cuenta como regresión si sube más de
+    `tolerance` y además más de `min_ms` (ruido de la máquina); el pico de
+    memoria, si sube más de `memory_tolerance`; las consultas, si sube una.
+    """
+    warnings = []
+    if baseline.get("dataset") != current.get("dataset"):
+        warnings.append("Los datos de origen no coinciden: la comparación es orientativa.")
+    if baseline.get("database") != current.get("database"):
+        warnings.append(f"Motor distinto: {baseline.get('database')} → {current.get('database')}.")
+
+    rows = []
+    for name, before in baseline["scenarios"].items():
+        after = current["scenarios"].get(name)
+        if after is None:
+            warnings.append(f"{name}: no está en la corrida actual.")
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            old, new = before[metric], after[metric]
+            rows.append((name, metric, old, new, new > old * (1 + tolerance) and new - old > min_ms))
+        rows.append((name, "queries", before["queries"], after["queries"], after["queries"] > before["queries"]))
+        old, new = before["peak_kib"], after["peak_kib"]
+        rows.append((name, "peak_kib", old, new, new > old * (1 + memory_tolerance)))
+    for name in current["scenarios"].keys() - baseline["scenarios"].keys():
+        warnings.append(f"{name}: nuevo, sin baseline.")
+    return rows, warnings
@@ -0,0 +1,25 @@
+# core/checks.py
+# Verificaciones de despliegue (python manage.py check --deploy).
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from reports.cache import versions_are_shared
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Las versiones por tabla (ETag, reportes, dashboard) y la del tema necesitan una caché compartida."""
+    if versions_are_shared():
+        return []
+    return [
+        Warning(
+            f"La caché '{settings.CACHES['default']['BACKEND']}' es por proceso: con varios workers "
+            "una escritura solo invalida los reportes del worker que la atendió, y un cambio de "
+            "tema tarda hasta THEME_LOCAL_CACHE_TTL segundos en verse en los demás.",
+            hint=(
+                "Usar Redis, Memcached o la caché de base de datos. Mientras tanto los listados "
+                "no envían ETag de versiones. Con un único proceso, TABLE_VERSIONS_SHARED = True."
+            ),
+            id="core.W001",
+        )
+    ]
@@ -0,0 +1,86 @@
+# core/conditional.py
+# GET condicional para listados y reportes: ETag y Last-Modified salen de las
+# versiones por tabla (reports/cache.py), así que una visita repetida a una
+# página sin cambios responde 304 antes de ejecutar consultas o plantillas.
+# Requiere una caché compartida (reports.cache.versions_are_shared); con una
+# caché por proceso queda el ETag del contenido de ConditionalGetMiddleware.
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from reports.cache import get_table_versions, get_tables_changed_at, versions_are_shared
+
+from .fragments import LayoutCache
+from .partials import PARTIAL_HEADERS, is_partial
+
+
+class ConditionalViewMixin:
+    """
+    La página depende de `conditional_tables` y, además, del usuario (layout,
+    permisos, tema), del token CSRF, de la URL con sus filtros, del tipo de
+    respuesta (completa o parcial) y del día. Todo eso forma el ETag débil;
+    Last-Modified es la última escritura sobre las tablas.
+
+    Va después de LoginRequiredMixin para no responder 304 a anónimos.
+    """
+    conditional_tables = ()
+
+    def get_conditional_variant(self):
+        """Parte extra del ETag (p. ej. el snapshot analítico usado)."""
+        return ""
+
+    def get_validators(self):
+        request = self.request
+        versions = get_table_versions(self.conditional_tables)
+        raw = "|".join([
+            self.__class__.__name__,
+            request.get_full_path(),
+            "partial" if is_partial(request) else "page",
+            LayoutCache.for_request(request).user_key,
+            request.META.get("CSRF_COOKIE", ""),
+            str(timezone.localdate()),
+            self.get_conditional_variant(),
+            ",".join(f"{label}={versions[label]}" for label in sorted(versions)),
+        ])
+        etag = 'W/"%s"' % hashlib.md5(raw.encode()).hexdigest()
+        return etag, int(get_tables_changed_at(self.conditional_tables))
+
+    def is_conditional(self, request):
+        # los mensajes pendientes se muestran una sola vez: no reutilizar la copia del navegador
+        return (
+            request.method in ("GET", "HEAD")
+            and bool(self.conditional_tables)
+            and versions_are_shared()
+            and not len(get_messages(request))
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_conditional(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        # el 304/412 copia los encabezados de esta respuesta "modelo"; si no
+        # hay respuesta condicional, Django la devuelve tal cual
+        template = self._set_validators(HttpResponse(), etag, last_modified)
+        conditional = get_conditional_response(
+            request, etag=etag, last_modified=last_modified, response=template,
+        )
+        if conditional is not template:
+            return conditional
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            self._set_validators(response, etag, last_modified)
+        return response
+
+    def _set_validators(self, response, etag, last_modified):
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+        # que el navegador revalide siempre en vez de usar una copia vieja
+        response.headers.setdefault("Cache-Control", "private, no-cache")
+        patch_vary_headers(response, PARTIAL_HEADERS)
+        return response
@@ -0,0 +1,79 @@
+# core/fanout.py
+# Ejecución concurrente de consultas independientes de solo lectura.
+# Cada tarea debe devolver datos ya evaluados (listas, dicts, números), nunca
+# un QuerySet perezoso: la consulta tiene que ocurrir dentro del hilo del pool.
+# Cada hilo usa su propia conexión (Django las mantiene por hilo) y una copia
+# del contexto del request (p. ej. lecturas en réplica, core/routers.py).
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = Lock()
+
+
+def _get_workers():
+    return int(getattr(settings, "QUERY_FANOUT_WORKERS", 4))
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=_get_workers(), thread_name_prefix="fanout"
+                )
+    return _pool
+
+
+def can_run_parallel():
+    """
+    Solo se paraleliza cuando tiene sentido y es seguro:
+    - SQLite serializa el acceso al archivo: no se gana nada.
+    - Dentro de una transacción los otros hilos no verían los cambios.
+    """
+    if _get_workers() <= 1:
+        return False
+    if connection.vendor == "sqlite":
+        return False
+    return not connection.in_atomic_block
+
+
+def _run_in_thread(fn):
+    close_old_connections()
+    try:
+        return fn()
+    finally:
+        close_old_connections()
+
+
+def fanout(tasks):
+    """
+    Ejecuta {nombre: callable} y devuelve {nombre: resultado}.
+
+    Si no se puede paralelizar se ejecutan en serie, en el mismo orden.
+    """
+    started = time.perf_counter()
+    if len(tasks) <= 1 or not can_run_parallel():
+        results = {name: fn() for name, fn in tasks.items()}
+        mode = "serie"
+    else:
+        pool = _get_pool()
+        futures = {
+            name: pool.submit(contextvars.copy_context().run, _run_in_thread, fn)
+            for name, fn in tasks.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+        mode = "paralelo"
+
+    elapsed = (time.perf_counter() - started) * 1000
+    logger.debug(f"[FANOUT] {len(tasks)} consultas en {mode} → {elapsed:.1f} ms")
+    return results
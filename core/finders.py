@@ -0,0 +1,30 @@
+# core/finders.py
+from django.contrib.staticfiles.finders import FileSystemFinder
+from django.core.exceptions import ImproperlyConfigured
+
+from .static_audit import find_references, load_unused, unused_file
+
+
+class PrunedFileSystemFinder(FileSystemFinder):
+    """
+    FileSystemFinder que no lista los estáticos marcados como no usados por
+    `optimize_static` (STATIC_UNUSED_FILE), así collectstatic no los copia.
+    `find()` no cambia: en desarrollo se siguen sirviendo todos.
+    """
+
+    def list(self, ignore_patterns):
+        unused = load_unused()
+        if unused:
+            # la lista puede ser anterior a cambios en plantillas o estáticos:
+            # se repite el escaneo (décimas de segundo) y, si hoy se referencia
+            # algo marcado, collectstatic falla en vez de publicar sin ello
+            stale = sorted(unused & find_references())
+            if stale:
+                raise ImproperlyConfigured(
+                    f"{unused_file()} está desactualizado: marca como no usados "
+                    f"{len(stale)} estáticos referenciados ({', '.join(stale[:5])}"
+                    f"{', …' if len(stale) > 5 else ''}). Ejecuta `python manage.py optimize_static`."
+                )
+        for path, storage in super().list(ignore_patterns):
+            if path.replace("\\", "/") not in unused:
+                yield path, storage
@@ -0,0 +1,92 @@
+# core/fragments.py
+# Claves para cachear los fragmentos del layout (header, sidebar, footer,
+# preloader) con {% layoutcache %}. Solo cambian con el usuario (nombre y
+# permisos) y con el tema activo, así que la clave combina:
+#   id de usuario + versión del usuario + hash de permisos + versión del tema.
+# Las versiones se incrementan con señales (ver core/signals.py).
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+from theme.cache import get_theme_version
+
+USER_VERSION_KEY = "layout:user:{}"
+GROUPS_VERSION_KEY = "layout:groups"
+PERMS_KEY = "layout:perms:{}:{}:{}"
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_user_version(user_id):
+    """Invalida los fragmentos de un usuario (nombre, estado o permisos)."""
+    _bump(USER_VERSION_KEY.format(user_id))
+
+
+def bump_groups_version():
+    """Invalida los fragmentos de todos (cambió algún grupo o sus permisos)."""
+    _bump(GROUPS_VERSION_KEY)
+
+
+def _versions(keys):
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            found[key] = time.time_ns()
+            if not cache.add(key, found[key], None):
+                found[key] = cache.get(key, found[key])
+    return [found[key] for key in keys]
+
+
+def permission_hash(user, user_version, groups_version):
+    """Hash corto del conjunto de permisos; se calcula una vez por versión."""
+    key = PERMS_KEY.format(user.pk, user_version, groups_version)
+    value = cache.get(key)
+    if value is None:
+        perms = sorted(user.get_all_permissions())
+        flags = f"{user.is_active}:{user.is_staff}:{user.is_superuser}"
+        value = hashlib.md5("|".join([flags, *perms]).encode()).hexdigest()[:12]
+        cache.set(key, value, 60 * 60 * 24)
+    return value
+
+
+class LayoutCache:
+    """
+    Claves de un request: `user_key` (fragmentos que dependen del usuario
+    y del tema) y `theme_key` (solo del tema). Se calculan una vez por
+    request aunque el layout tenga varios fragmentos.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    @classmethod
+    def for_request(cls, request):
+        layout = getattr(request, "_layout_cache", None)
+        if layout is None:
+            layout = request._layout_cache = cls(request)
+        return layout
+
+    @cached_property
+    def theme_key(self):
+        return str(get_theme_version())
+
+    @cached_property
+    def user_key(self):
+        user = getattr(self.request, "user", None)
+        if user is None or not user.is_authenticated:
+            return f"anon.{self.theme_key}"
+        user_version, groups_version = _versions([
+            USER_VERSION_KEY.format(user.pk), GROUPS_VERSION_KEY,
+        ])
+        perms = permission_hash(user, user_version, groups_version)
+        return f"{user.pk}.{user_version}.{perms}.{self.theme_key}"
+
+    def key(self, scope):
+        return self.theme_key if scope == "theme" else self.user_key
@@ -0,0 +1,253 @@
+# core/loadtest.py
+# Prueba de carga contra un servidor local (gunicorn, uvicorn o runserver).
+# Cada usuario virtual es un hilo con su propia sesión HTTP (keep-alive,
+# cookies, CSRF) que repite el guion de su perfil con pausas aleatorias:
+#
+#   mostrador — crea órdenes y las avanza por el flujo
+#   gerente   — panel y reportes
+#   cajero    — caja y movimientos manuales
+#
+# Así se ven juntas las escrituras del mostrador y las lecturas pesadas de
+# los reportes, que es donde aparecen los "database is locked" de SQLite.
+# Solo usa la biblioteca estándar; `load_test` arma los usuarios y el informe.
+import http.client
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from .timing import _percentile
+
+LOCKED_MARKERS = (b"database is locked", b"database table is locked")
+_CSRF_INPUT = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+_ORDER_LOCATION = re.compile(r"/orders/(\d+)/$")
+
+
+class Session:
+    """Conexión keep-alive con cookies, como un navegador con la sesión abierta."""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.cookies = {}
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, timeout=self.timeout)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def request(self, method, path, data=None, headers=None):
+        """(estado, cuerpo, encabezados). Reabre la conexión si el servidor la cerró."""
+        headers = dict(headers or {})
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        body = None
+        if method == "POST":
+            body = urlencode(data or {}, doseq=True)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            headers["X-CSRFToken"] = self.cookies.get("csrftoken", "")
+        for attempt in (1, 2):
+            try:
+                conn = self._connection()
+                conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = conn.getresponse()
+                content = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt == 2:
+                    raise
+        for header in response.headers.get_all("Set-Cookie") or ():
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        if response.headers.get("Connection", "").lower() == "close":
+            self.close()
+        return response.status, content, response.headers
+
+    def login(self, login_path, username, password):
+        status, body, _ = self.request("GET", login_path)
+        match = _CSRF_INPUT.search(body)
+        form = {"username": username, "password": password}
+        if match:
+            form["csrfmiddlewaretoken"] = match.group(1).decode()
+        status, _, headers = self.request("POST", login_path, form)
+        if status != 302 or "login" in headers.get("Location", ""):
+            raise RuntimeError(f"No se pudo iniciar sesión como {username} (estado {status}).")
+
+
+# =====================================================
+# 🔹 PERFILES
+# =====================================================
+# Cada acción devuelve (endpoint, método, ruta, datos) o None si no aplica
+# (p. ej. no hay órdenes que avanzar). `ctx` es común a todos los hilos.
+def _clerk_create(ctx, rng):
+    lines = rng.choices(ctx["services"], k=rng.randint(1, 4))
+    return "orders:add", "POST", ctx["urls"]["orders:add"], {
+        "customer": rng.choice(ctx["customers"]),
+        "discount": "0",
+        "notes": "carga",
+        "service_id": [pk for pk, _ in lines],
+        "quantity": [str(rng.randint(1, 6)) for _ in lines],
+        "price": [price for _, price in lines],
+    }
+
+
+def _clerk_advance(ctx, rng):
+    pk = ctx["orders"].pop()
+    if pk is None:
+        return None
+    return "orders:advance", "POST", ctx["urls"]["orders:advance"].format(pk=pk), {}
+
+
+def _get(name):
+    def action(ctx, rng):
+        return name, "GET", ctx["urls"][name], None
+
+    action.endpoint = name
+    return action
+
+
+def _cashier_movement(ctx, rng):
+    return "cash:movement_new", "POST", ctx["urls"]["cash:movement_new"], {
+        "movement_type": rng.choice(["ingreso", "egreso"]),
+        "amount": f"{rng.randint(50, 2000)}.00",
+        "description": "Movimiento de carga",
+    }
+
+
+PERSONAS = {
+    # perfil: [(peso, acción)]
+    "mostrador": [
+        (4, _clerk_create),
+        (5, _clerk_advance),
+        (2, _get("orders:pending")),
+        (1, _get("orders:workflow")),
+    ],
+    "gerente": [
+        (3, _get("dashboard:home")),
+        (2, _get("reports:orders_report")),
+        (2, _get("reports:financial_report")),
+        (1, _get("reports:services_report")),
+        (1, _get("reports:customers_report")),
+        (1, _get("reports:sla_report")),
+    ],
+    "cajero": [
+        (3, _get("cash:movements")),
+        (2, _cashier_movement),
+        (1, _get("cash:list")),
+    ],
+}
+
+
+class OrderPool:
+    """Órdenes que se pueden avanzar. Se toman de a una y vuelven al final de la cola."""
+
+    def __init__(self, pks):
+        self._pks = list(pks)
+        self._lock = threading.Lock()
+
+    def add(self, pk):
+        with self._lock:
+            self._pks.insert(0, pk)
+
+    def pop(self):
+        with self._lock:
+            return self._pks.pop() if self._pks else None
+
+
+# =====================================================
+# 🔹 EJECUCIÓN
+# =====================================================
+class LoadStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))  # endpoint → resultado → n
+
+    def record(self, endpoint, elapsed, outcome):
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            self.outcomes[endpoint][outcome] += 1
+
+    def rows(self, duration):
+        """Por endpoint: requests, req/s, % errores, bloqueos, p50/p95/p99 (ms)."""
+        rows = []
+        for endpoint in sorted(self.latencies):
+            latencies = sorted(self.latencies[endpoint])
+            outcomes = self.outcomes[endpoint]
+            total = len(latencies)
+            errors = total - outcomes["ok"]
+            rows.append({
+                "endpoint": endpoint,
+                "requests": total,
+                "rps": total / duration,
+                "error_pct": errors / total * 100,
+                "locked": outcomes["locked"],
+                "outcomes": dict(outcomes),
+                "p50_ms": _percentile(latencies, 50) * 1000,
+                "p95_ms": _percentile(latencies, 95) * 1000,
+                "p99_ms": _percentile(latencies, 99) * 1000,
+            })
+        return rows
+
+
+def _outcome(status, body):
+    # el nombre de la excepción solo está en la página de error de DEBUG; sin
+    # DEBUG un "database is locked" cuenta como 500 (ver el log del servidor)
+    if status >= 500 and any(marker in body for marker in LOCKED_MARKERS):
+        return "locked"
+    if status >= 400:
+        return str(status)
+    return "ok"
+
+
+def run_user(base_url, persona, credentials, ctx, stats, stop_at, think, seed):
+    """Hilo de un usuario virtual hasta `stop_at` (time.monotonic)."""
+    rng = random.Random(seed)
+    actions = PERSONAS[persona]
+    weights = [w for w, _ in actions]
+    session = Session(base_url)
+    try:
+        session.login(ctx["urls"]["login"], *credentials)
+        while time.monotonic() < stop_at:
+            step = rng.choices(actions, weights=weights)[0][1](ctx, rng)
+            if step is None:
+                time.sleep(think or 0.1)
+                continue
+            endpoint, method, path, data = step
+            headers = {"HX-Request": "true"} if endpoint == "orders:advance" else None
+            started = time.perf_counter()
+            try:
+                status, body, response_headers = session.request(method, path, data, headers)
+            except (OSError, http.client.HTTPException) as e:
+                session.close()
+                stats.record(endpoint, time.perf_counter() - started, type(e).__name__)
+                continue
+            outcome = _outcome(status, body)
+            stats.record(endpoint, time.perf_counter() - started, outcome)
+
+            if endpoint == "orders:add":
+                match = _ORDER_LOCATION.search(response_headers.get("Location", ""))
+                if match:
+                    ctx["orders"].add(int(match.group(1)))
+            elif endpoint == "orders:advance" and (
+                outcome != "ok" or response_headers.get("X-Message-Level") == "success"
+            ):
+                # falló o avanzó: vuelve a la cola; al llegar a entregado responde
+                # "warning" y sale del flujo
+                ctx["orders"].add(int(path.rstrip("/").split("/")[-2]))
+            if think:
+                time.sleep(rng.expovariate(1 / think))
+    finally:
+        session.close()
@@ -0,0 +1,148 @@
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import Sum
+
+# Ciclo artificial para poder avanzar órdenes indefinidamente.
+CYCLE = {"pendiente": "en_proceso", "en_proceso": "listo", "listo": "pendiente"}
+
+MODES = {
+    # lo que hace Django por defecto, forzando el journal clásico por si el
+    # archivo de origen ya quedó en WAL
+    "por defecto": {"init_command": "PRAGMA journal_mode=DELETE"},
+    "WAL + IMMEDIATE": None,  # settings.SQLITE_TUNED_OPTIONS
+}
+
+
+def _advance(pk):
+    """Transición de estado como OrderAdvanceView (sin caja ni inventario)."""
+    from orders.models import Order, OrderTracking
+
+    with transaction.atomic():
+        order = Order.objects.get(pk=pk)
+        previous = order.status
+        order.status = CYCLE.get(previous, "pendiente")
+        order.save(update_fields=["status"])
+        OrderTracking.objects.create(order=order, previous_status=previous, new_status=order.status)
+
+
+def _read():
+    """Lecturas del panel y de un reporte, sin pasar por la caché."""
+    from dashboard.metrics import compute_metrics
+    from orders.models import OrderLine
+
+    compute_metrics()
+    list(
+        OrderLine.objects.values("service__name")
+        .annotate(total=Sum("subtotal"))
+        .order_by("-total")[:20]
+    )
+
+
+def _worker(path, options, order_ids, write_ratio, start_at, stop_at, seed):
+    # proceso hijo (fork): conexión propia contra la copia de este modo
+    connection = connections["default"]
+    connection.close()
+    connection.settings_dict["NAME"] = path
+    connection.settings_dict["OPTIONS"] = dict(options)
+
+    rng = random.Random(seed)
+    stats = {"read": [], "write": [], "locked_read": 0, "locked_write": 0}
+    time.sleep(max(0, start_at - time.time()))
+    while time.time() < stop_at:
+        kind = "write" if rng.random() < write_ratio else "read"
+        started = time.perf_counter()
+        try:
+            _advance(rng.choice(order_ids)) if kind == "write" else _read()
+        except OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            stats[f"locked_{kind}"] += 1
+            continue
+        stats[kind].append(time.perf_counter() - started)
+    connections.close_all()
+    return stats
+
+
+def _p95(samples):
+    if len(samples) < 2:
+        return samples[0] * 1000 if samples else 0
+    return statistics.quantiles(samples, n=20)[-1] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara SQLite por defecto contra WAL + BEGIN IMMEDIATE (SQLITE_TUNED_OPTIONS) "
+        "con procesos que mezclan transiciones de órdenes y lecturas del panel. "
+        "Trabaja sobre copias de la base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sqlite", help="Base de origen (por defecto, la configurada si es SQLite).")
+        parser.add_argument("--workers", type=int, default=4, help="Procesos concurrentes (como workers de gunicorn).")
+        parser.add_argument("--duration", type=float, default=10.0, help="Segundos por modo.")
+        parser.add_argument("--write-ratio", type=float, default=0.3, help="Fracción de operaciones de escritura.")
+
+    def handle(self, *args, **options):
+        source = options["sqlite"]
+        if not source:
+            db = settings.DATABASES["default"]
+            if db["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError("La base configurada no es SQLite: indica --sqlite ruta.")
+            source = db["NAME"]
+        source = Path(source)
+        if not source.exists():
+            raise CommandError(f"No existe {source}")
+
+        with sqlite3.connect(source) as db:
+            order_ids = [pk for (pk,) in db.execute("SELECT id FROM orders_order")]
+        if not order_ids:
+            raise CommandError("La base no tiene órdenes con las que trabajar.")
+
+        self.stdout.write(
+            f"{options['workers']} procesos × {options['duration']:.0f}s, "
+            f"{options['write_ratio']:.0%} escrituras, {len(order_ids)} órdenes"
+        )
+        self.stdout.write(
+            f"{'modo':18} {'ops/s':>8} {'escr/s':>8} {'lect/s':>8} "
+            f"{'locked escr':>12} {'locked lect':>12} {'p95 escr':>10} {'p95 lect':>10}"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, (name, mode_options) in enumerate(MODES.items()):
+                if mode_options is None:
+                    mode_options = settings.SQLITE_TUNED_OPTIONS
+                copy = Path(tmp) / f"bench-{i}.sqlite3"
+                with sqlite3.connect(source) as src, sqlite3.connect(copy) as dst:
+                    src.backup(dst)
+                self._run(name, str(copy), mode_options, order_ids, options)
+
+    def _run(self, name, path, mode_options, order_ids, options):
+        connections.close_all()  # no heredar conexiones abiertas en el fork
+        start_at = time.time() + 1.0
+        stop_at = start_at + options["duration"]
+        jobs = [
+            (path, mode_options, order_ids, options["write_ratio"], start_at, stop_at, seed)
+            for seed in range(options["workers"])
+        ]
+        with multiprocessing.get_context("fork").Pool(options["workers"]) as pool:
+            results = pool.starmap(_worker, jobs)
+
+        reads = [s for r in results for s in r["read"]]
+        writes = [s for r in results for s in r["write"]]
+        locked_read = sum(r["locked_read"] for r in results)
+        locked_write = sum(r["locked_write"] for r in results)
+        elapsed = options["duration"]
+        self.stdout.write(
+            f"{name:18} {(len(reads) + len(writes)) / elapsed:>8.1f} "
+            f"{len(writes) / elapsed:>8.1f} {len(reads) / elapsed:>8.1f} "
+            f"{locked_write:>12} {locked_read:>12} "
+            f"{_p95(writes):>8.1f}ms {_p95(reads):>8.1f}ms"
+        )
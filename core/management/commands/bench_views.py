@@ -0,0 +1,125 @@
+import json
+import platform
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core import nplusone
+from core.benchmarks import SCENARIOS, dataset_counts, run_scenario, scenario_data
+
+# Historial por defecto: ~9.000 órdenes, fijo para que las corridas comparen
+# lo mismo (el --until ancla las fechas).
+DATASET = ["--orders-per-day", "100", "--days", "90", "--customers", "2000", "--seed", "42", "--until", "2026-01-31"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de extremo a extremo de las vistas principales sobre una base de prueba "
+        "con generate_dataset: latencia p50/p95/p99, consultas y pico de memoria por "
+        "escenario. Escribe JSON para compare_benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="*", help="Escenarios a correr (por defecto, todos).")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--output", help="Archivo JSON (por defecto, BENCHMARK_DIR/latest.json).")
+        parser.add_argument(
+            "--dataset", nargs="+", metavar="ARG",
+            help="Argumentos para generate_dataset (por defecto: " + " ".join(DATASET) + ").",
+        )
+        parser.add_argument("--warm", action="store_true", help="No vaciar la caché antes de cada request.")
+        parser.add_argument("--keepdb", action="store_true", help="Reutiliza la base de prueba (y sus datos) si existe.")
+        parser.add_argument(
+            "--current-db", action="store_true",
+            help="Usa la base configurada tal cual. Los escenarios de escritura crean órdenes y las avanzan.",
+        )
+
+    def handle(self, *args, **options):
+        scenarios = [s for s in SCENARIOS if not options["scenarios"] or s[0] in options["scenarios"]]
+        unknown = set(options["scenarios"]) - {s[0] for s in SCENARIOS}
+        if unknown:
+            raise CommandError(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+        output = Path(options["output"] or Path(settings.BENCHMARK_DIR) / "latest.json")
+
+        nplusone.install()
+        setup_test_environment()
+        old_name = None
+        try:
+            if not options["current_db"]:
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, keepdb=options["keepdb"], serialize=False,
+                )
+                self._generate(options["dataset"] or DATASET)
+            # todo contra la primaria, sin registrar consultas lentas ni
+            # avisos de N+1 (check_query_budgets se ocupa de eso)
+            with override_settings(
+                READ_REPLICA_ALIAS=None, SLOW_QUERY_MS=float("inf"), NPLUSONE_DETECTION=False,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                result = self._run(scenarios, options)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+        self.stdout.write(self.style.SUCCESS(f"✅ Resultados en {output}"))
+
+    def _generate(self, dataset):
+        from orders.models import Order
+
+        if Order.objects.exists():
+            self.stdout.write("Base de prueba con datos: se reutiliza.")
+            return
+        self.stdout.write(f"Generando datos: generate_dataset {' '.join(dataset)}")
+        call_command("generate_dataset", *dataset, stdout=StringIO())
+
+    def _run(self, scenarios, options):
+        data = scenario_data()
+        if data is None:
+            raise CommandError("La base no tiene órdenes, cajas, clientes o servicios (¿falta generate_dataset?).")
+        User = get_user_model()
+        user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            user = User.objects.create_superuser("bench-admin", "bench@example.com", None)
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+
+        result = {
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "cold_cache": not options["warm"],
+            "dataset": dataset_counts(),
+            "scenarios": {},
+        }
+        self.stdout.write(
+            f"{'escenario':28} {'p50':>8} {'p95':>8} {'p99':>8} {'consultas':>9} {'memoria':>10}"
+        )
+        failed = []
+        for scenario in scenarios:
+            stats = run_scenario(client, scenario, data, options["iterations"], options["warmup"], cold=not options["warm"])
+            result["scenarios"][scenario[0]] = stats
+            line = (
+                f"{scenario[0]:28} {stats['p50_ms']:>6.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms "
+                f"{stats['queries']:>9} {stats['peak_kib']:>7.0f}KiB"
+            )
+            if any(status >= 400 for status in stats["status"]):
+                failed.append(f"{scenario[0]}: respondió {stats['status']}")
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        if failed:
+            raise CommandError("Escenarios con error:\n  " + "\n  ".join(failed))
+        return result
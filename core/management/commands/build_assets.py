@@ -0,0 +1,98 @@
+import gzip
+import time
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+
+from core.assets import build_bundles, get_bundles_dir
+
+# Lo que base.html cargaba en cada página antes de los bundles; se usa
+# solo como referencia para el informe antes/después.
+LEGACY_BASE = [
+    "assets/css/sidebar-menu.css", "assets/css/simplebar.css", "assets/css/apexcharts.css",
+    "assets/css/prism.css", "assets/css/rangeslider.css", "assets/css/quill.snow.css",
+    "assets/css/google-icon.css", "assets/css/remixicon.css", "assets/css/swiper-bundle.min.css",
+    "assets/css/fullcalendar.main.css", "assets/css/jsvectormap.min.css", "assets/css/lightpick.css",
+    "assets/css/style.css",
+    "assets/js/bootstrap.bundle.min.js", "assets/js/sidebar-menu.js", "assets/js/dragdrop.js",
+    "assets/js/rangeslider.min.js", "assets/js/quill.min.js", "assets/js/data-table.js",
+    "assets/js/prism.js", "assets/js/clipboard.min.js", "assets/js/feather.min.js",
+    "assets/js/simplebar.min.js", "assets/js/apexcharts.min.js", "assets/js/echarts.min.js",
+    "assets/js/swiper-bundle.min.js", "assets/js/fullcalendar.main.js", "assets/js/jsvectormap.min.js",
+    "assets/js/world-merc.js", "assets/js/moment.min.js", "assets/js/lightpick.js",
+    "assets/js/custom/apexcharts.js", "assets/js/custom/echarts.js", "assets/js/custom/custom.js",
+]
+LEGACY_AUTH = ["assets/css/style.css", "assets/js/bootstrap.bundle.min.js"]
+
+# página → (assets antes, bundles después)
+PAGES = {
+    "panel (base.html)": (LEGACY_BASE, ["core"]),
+    "dashboard": (LEGACY_BASE, ["core", "charts"]),
+    "login (base_auth.html)": (LEGACY_AUTH, ["auth"]),
+}
+
+
+def _kb(size):
+    return f"{size / 1024:,.0f} KB"
+
+
+class Command(BaseCommand):
+    help = "Genera los bundles CSS/JS por grupo de páginas, precomprimidos (.br/.gz)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-compress", action="store_true",
+            help="No genera las variantes .br/.gz.",
+        )
+        parser.add_argument(
+            "--report", action="store_true",
+            help="Muestra peticiones y bytes de primera carga antes/después por página.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        manifest = build_bundles(compress=not options["no_compress"])
+        out_dir = get_bundles_dir()
+        for name, kinds in manifest["bundles"].items():
+            for kind, filename in kinds.items():
+                self.stdout.write(f"  {name:8} {kind:3} → {filename} ({_kb((out_dir / filename).stat().st_size)})")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Bundles en {out_dir} ({time.perf_counter() - started:.1f}s)"
+        ))
+
+        if options["report"]:
+            self._report(manifest, out_dir)
+
+    def _report(self, manifest, out_dir):
+        self.stdout.write("\nPrimera carga de CSS/JS (sin caché del navegador):")
+        self.stdout.write(f"{'página':24} {'peticiones':>12} {'transferido':>22}   (sin comprimir después / gzip antes)")
+        for page, (before, bundles) in PAGES.items():
+            raw = gz = 0
+            for source in before:
+                data = Path(finders.find(source)).read_bytes()
+                raw += len(data)
+                gz += len(gzip.compress(data, compresslevel=6))
+
+            after = [
+                out_dir / manifest["bundles"][name][kind]
+                for name in bundles for kind in ("css", "js")
+                if kind in manifest["bundles"].get(name, {})
+            ]
+            after_raw = sum(p.stat().st_size for p in after)
+            after_br = sum(self._encoded_size(p) for p in after)
+
+            self.stdout.write(
+                f"{page:24} {len(before):>5} → {len(after):<4} {_kb(raw):>10} → {_kb(after_br):>9}"
+                f"   ({_kb(after_raw)} / {_kb(gz)})"
+            )
+        self.stdout.write(self.style.WARNING(
+            "ℹ️  Antes no había compresión en el servidor: la columna gzip es solo referencia."
+        ))
+
+    def _encoded_size(self, path):
+        for ext in ("br", "gz"):
+            variant = path.with_name(f"{path.name}.{ext}")
+            if variant.exists():
+                return variant.stat().st_size
+        return path.stat().st_size
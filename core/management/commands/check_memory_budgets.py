@@ -0,0 +1,185 @@
+import json
+import tracemalloc
+from collections import defaultdict
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from core.memory_budgets import MEMORY_BUDGETS, MEMORY_SCENARIOS
+
+TRACE_FRAMES = 10
+# factor medio de llegada de generate_dataset (días de semana y temporada)
+ORDERS_PER_DAY_FACTOR = 0.96
+
+
+def _project_site(traceback):
+    """Línea del proyecto más interna de una traza de tracemalloc."""
+    base = str(settings.BASE_DIR)
+    for frame in reversed(traceback):
+        if frame.filename.startswith(base) and "site-packages" not in frame.filename:
+            return f"{frame.filename[len(base) + 1:]}:{frame.lineno}"
+    return "(Django / plantillas)"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide con tracemalloc el pico de memoria de reportes, listados y respuestas JSON "
+        "sobre bases generadas de distinto tamaño y falla si alguno supera su techo "
+        "(core/memory_budgets.py). Muestra dónde se asigna la memoria."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales", nargs="+", type=int, default=[10000, 100000],
+            help="Órdenes de cada base generada (p. ej. 10000 100000 1000000).",
+        )
+        parser.add_argument("--top", type=int, default=3, help="Sitios de asignación a mostrar por vista.")
+        parser.add_argument("--keepdb", action="store_true", help="Reutiliza la base de prueba si existe.")
+        parser.add_argument(
+            "--current-db", action="store_true",
+            help="Mide la base configurada tal cual, en una sola escala (los POST no guardan nada).",
+        )
+        parser.add_argument(
+            "--i-know", action="store_true",
+            help="Permite --current-db con DEBUG=False (vacía todas las cachés de ese entorno).",
+        )
+        parser.add_argument("--json", help="Guarda los resultados también en este archivo.")
+
+    def handle(self, *args, **options):
+        # igual que check_query_budgets: vacía las cachés y puede crear un superusuario
+        if options["current_db"] and not (settings.DEBUG or options["i_know"]):
+            raise CommandError(
+                "--current-db vacía todas las cachés configuradas y puede crear un superusuario en la "
+                "base; con DEBUG=False se asume producción. Añade --i-know para ejecutarlo igualmente."
+            )
+        setup_test_environment()
+        old_name = None
+        results = {}
+        try:
+            if not options["current_db"]:
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, keepdb=options["keepdb"], serialize=False,
+                )
+            # sin réplica, consultas lentas ni N+1: solo la vista
+            with override_settings(
+                READ_REPLICA_ALIAS=None, SLOW_QUERY_LOG_ENABLED=False, NPLUSONE_DETECTION=False,
+                REQUEST_TIMING_ENABLED=False, PROFILER_ENABLED=False,
+            ):
+                scales = [None] if options["current_db"] else sorted(options["scales"])
+                for scale in scales:
+                    rows = self._generate(scale) if scale else self._count()
+                    self.stdout.write(f"Midiendo con {rows:,} órdenes…")
+                    results[rows] = self._measure(options["top"])
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        failures = self._report(results)
+        if options["json"]:
+            Path(options["json"]).write_text(json.dumps(
+                {str(rows): measured for rows, measured in results.items()}, indent=2, ensure_ascii=False,
+            ))
+        if failures:
+            raise CommandError(f"{len(failures)} vistas sobre su techo de memoria:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("✅ Todas las vistas dentro de su techo de memoria."))
+
+    def _generate(self, scale):
+        per_day = max(1, round(scale / (365 * ORDERS_PER_DAY_FACTOR)))
+        dataset = [
+            "--flush", "--days", "365", "--orders-per-day", str(per_day),
+            "--customers", str(max(500, scale // 20)), "--seed", "42", "--until", "2026-01-31",
+        ]
+        self.stdout.write(f"Generando ~{scale:,} órdenes…")
+        call_command("generate_dataset", *dataset, stdout=StringIO())
+        return self._count()
+
+    def _count(self):
+        from orders.models import Order
+
+        return Order.objects.count()
+
+    def _measure(self, top):
+        User = get_user_model()
+        user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            user = User.objects.create_superuser("memory-admin", "memory@example.com", None)
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+
+        measured = {}
+        for name, method, data in MEMORY_SCENARIOS:
+            url = reverse(name)
+            # una vez sin medir: importaciones, plantillas compiladas, etc.
+            self._request(client, method, url, data)
+            for alias in caches:
+                caches[alias].clear()
+
+            budget = MEMORY_BUDGETS.get(name)
+            tracemalloc.start(TRACE_FRAMES)
+            try:
+                before = tracemalloc.take_snapshot()
+                tracemalloc.reset_peak()
+                response = self._request(client, method, url, data)
+                peak = tracemalloc.get_traced_memory()[1]
+                # los sitios (caros de agrupar) solo si hacen falta, con la
+                # respuesta y su contexto todavía vivos
+                after = tracemalloc.take_snapshot() if budget is None or peak / 1024 > budget else None
+            finally:
+                tracemalloc.stop()
+
+            sites = defaultdict(int)
+            for stat in after.compare_to(before, "traceback") if after else ():
+                if stat.size_diff > 0:
+                    sites[_project_site(stat.traceback)] += stat.size_diff
+            self.stdout.write(f"  {name:28} {peak / 1024:>10.0f} KiB")
+            measured[name] = {
+                "status": response.status_code,
+                "peak_kib": peak / 1024,
+                "sites": [
+                    (site, size / 1024)
+                    for site, size in sorted(sites.items(), key=lambda item: item[1], reverse=True)[:top]
+                ],
+            }
+            del response
+        return measured
+
+    def _request(self, client, method, url, data):
+        if method == "post":
+            return client.post(url, data)
+        return client.get(url)
+
+    def _report(self, results):
+        scales = sorted(results)
+        header = "".join(f"{f'{rows:,} órd.':>14}" for rows in scales)
+        self.stdout.write(f"\n{'vista':28}{header}{'techo':>10}")
+        failures = []
+        for name, _, _ in MEMORY_SCENARIOS:
+            budget = MEMORY_BUDGETS.get(name)
+            peaks = [results[rows][name]["peak_kib"] for rows in scales]
+            over = budget is not None and max(peaks) > budget
+            cells = "".join(f"{peak:>11.0f}KiB" for peak in peaks)
+            line = f"{name:28}{cells}{budget if budget is not None else '—':>10}"
+            self.stdout.write(self.style.ERROR(line) if over else line)
+
+            largest = results[scales[-1]][name]
+            if largest["status"] >= 400:
+                failures.append(f"{name}: respondió {largest['status']}")
+            if budget is None:
+                failures.append(f"{name}: sin techo en core/memory_budgets.py ({max(peaks):.0f} KiB)")
+            elif over:
+                growth = f", ×{peaks[-1] / peaks[0]:.1f} de {scales[0]:,} a {scales[-1]:,} órdenes" if len(peaks) > 1 else ""
+                failures.append(f"{name}: {max(peaks):.0f} KiB, techo {budget}{growth}")
+            if over or budget is None:
+                for site, size in largest["sites"]:
+                    self.stdout.write(f"{'':30}{size:>10.0f} KiB  {site}")
+        return failures
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core import nplusone
+from core.query_budgets import QUERY_BUDGETS, collect_urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta core.tests.QueryBudgetTests: recorre con GET todas las URL de core/urls.py y "
+        "los changelists del admin sobre una base de prueba sembrada con generate_dataset, con "
+        "la caché vacía, y falla si alguna no hace las consultas de core/query_budgets.py o "
+        "repite un SELECT (N+1). Con --current-db recorre la base configurada y solo busca N+1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keepdb", action="store_true", help="Reutiliza la base de prueba si existe.")
+        parser.add_argument(
+            "--current-db", action="store_true",
+            help="Usa la base configurada tal cual (N+1 que solo aparecen con volumen; conteos informativos).",
+        )
+        parser.add_argument(
+            "--i-know", action="store_true",
+            help="Permite --current-db con DEBUG=False (vacía todas las cachés de ese entorno).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["current_db"]:
+            # `test` termina el proceso con código 1 si la prueba falla
+            call_command(
+                "test", "core.tests.QueryBudgetTests",
+                keepdb=options["keepdb"], verbosity=options["verbosity"],
+            )
+            return
+
+        # vacía todas las cachés en cada URL e inicia sesión como superusuario:
+        # con DEBUG=False se asume una base (y caché) de producción
+        if not (settings.DEBUG or options["i_know"]):
+            raise CommandError(
+                "--current-db vacía todas las cachés configuradas y recorre la base como superusuario; "
+                "con DEBUG=False se asume producción. Añade --i-know para ejecutarlo igualmente."
+            )
+        nplusone.install()
+        setup_test_environment()
+        try:
+            with override_settings(READ_REPLICA_ALIAS=None, SLOW_QUERY_MS=float("inf"), NPLUSONE_DETECTION=False):
+                failures = self._walk_current_db()
+        finally:
+            teardown_test_environment()
+        if failures:
+            raise CommandError(f"{len(failures)} URL con problemas:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("✅ Ninguna URL con N+1 sobre la base configurada."))
+
+    def _walk_current_db(self):
+        User = get_user_model()
+        user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError("La base no tiene un superusuario con el que recorrer el admin.")
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+
+        try:
+            urls = collect_urls()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        failures = []
+        self.stdout.write(f"{'URL':45} {'estado':>6} {'consultas':>9} {'presupuesto':>11}")
+        for name, url in urls:
+            for alias in caches:
+                caches[alias].clear()
+            with nplusone.track_queries() as tracker:
+                response = client.get(url)
+            line = f"{name:45} {response.status_code:>6} {tracker.total:>9} {QUERY_BUDGETS.get(name, '—'):>11}"
+            if response.status_code >= 400:
+                failures.append(f"  {name}: respondió {response.status_code}")
+            if tracker.repeated():
+                failures.append(f"  {name}: posible N+1\n{tracker.report()}")
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
+        return failures
@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import compare
+
+
+def _load(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError) as e:
+        raise CommandError(f"No se pudo leer {path}: {e}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara dos resultados de bench_views y falla si algún escenario empeoró en "
+        "latencia, consultas o memoria más allá de la tolerancia."
+    )
+
+    def add_arguments(self, parser):
+        benchmarks = Path(settings.BENCHMARK_DIR)
+        parser.add_argument("baseline", nargs="?", default=str(benchmarks / "baseline.json"))
+        parser.add_argument("current", nargs="?", default=str(benchmarks / "latest.json"))
+        parser.add_argument("--tolerance", type=float, default=0.2, help="Aumento de latencia tolerado (0.2 = 20 %%).")
+        parser.add_argument("--memory-tolerance", type=float, default=0.2, help="Aumento de pico de memoria tolerado.")
+        parser.add_argument("--min-ms", type=float, default=5.0, help="Diferencias de latencia menores se ignoran (ruido).")
+
+    def handle(self, *args, **options):
+        baseline, current = _load(options["baseline"]), _load(options["current"])
+        rows, warnings = compare(
+            baseline, current, options["tolerance"], options["memory_tolerance"], options["min_ms"],
+        )
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(f"⚠️  {warning}"))
+
+        self.stdout.write(f"{'escenario':28} {'métrica':9} {'antes':>10} {'ahora':>10} {'cambio':>8}")
+        regressions = []
+        for name, metric, old, new, worse in rows:
+            change = (new - old) / old * 100 if old else 0
+            line = f"{name:28} {metric:9} {old:>10.1f} {new:>10.1f} {change:>+7.0f}%"
+            if worse:
+                regressions.append(f"{name} {metric}: {old:.1f} → {new:.1f}")
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"{len(regressions)} regresiones:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("✅ Sin regresiones respecto del baseline."))
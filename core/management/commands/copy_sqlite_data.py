@@ -0,0 +1,194 @@
+import io
+import json
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections, models as db_models, transaction
+from django.db.migrations.recorder import MigrationRecorder
+
+SOURCE_ALIAS = "sqlite_source"
+
+# Tablas que `migrate` ya llena en la base nueva: se reemplazan sin preguntar.
+MIGRATE_FILLED = {"django_content_type", "auth_permission"}
+
+
+def _copy_value(value, is_json=False):
+    """Valor en el formato de texto de COPY (\\N = NULL, escapes con \\)."""
+    if value is None:
+        return "\\N"
+    if is_json:
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        return "t" if value else "f"
+    elif isinstance(value, timedelta):
+        value = f"{value.total_seconds()} seconds"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (bytes, memoryview)):
+        return "\\\\x" + bytes(value).hex()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_rows(cursor, sql, lines):
+    """COPY ... FROM STDIN con psycopg 3 o psycopg2."""
+    raw = cursor.cursor
+    if hasattr(raw, "copy"):
+        with raw.copy(sql) as copy:
+            copy.write("".join(lines))
+    else:
+        raw.copy_expert(sql, io.StringIO("".join(lines)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia todos los datos de una base SQLite a la base PostgreSQL configurada "
+        "(ya migrada) con COPY por lotes, dentro de una transacción, y verifica los conteos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sqlite", default=str(Path(settings.BASE_DIR) / "db.sqlite3"),
+            help="Archivo SQLite de origen (por defecto, db.sqlite3 del proyecto).",
+        )
+        parser.add_argument("--database", default="default", help="Alias de la base PostgreSQL destino.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--replace", action="store_true",
+            help="Vacía las tablas destino que ya tengan datos (por defecto se aborta).",
+        )
+
+    def handle(self, *args, **options):
+        target = connections[options["database"]]
+        if target.vendor != "postgresql":
+            raise CommandError(
+                f"La base destino '{options['database']}' es {target.vendor}; "
+                "configura DATABASE_URL=postgres://..."
+            )
+        path = Path(options["sqlite"])
+        if not path.exists():
+            raise CommandError(f"No existe {path}")
+
+        connections.settings[SOURCE_ALIAS] = connections.configure_settings({
+            **connections.settings,
+            SOURCE_ALIAS: {"ENGINE": "django.db.backends.sqlite3", "NAME": str(path)},
+        })[SOURCE_ALIAS]
+        source = connections[SOURCE_ALIAS]
+
+        models = [
+            m for m in apps.get_models(include_auto_created=True)
+            if m._meta.managed and not m._meta.proxy
+        ]
+        source_tables = set(source.introspection.table_names())
+        missing = [m._meta.db_table for m in models if m._meta.db_table not in source_tables]
+        if missing:
+            self.stdout.write(self.style.WARNING(f"⚠️  Sin tabla en SQLite (se omiten): {', '.join(missing)}"))
+            models = [m for m in models if m._meta.db_table in source_tables]
+
+        self._check_migrations(source, target)
+        target_tables = set(target.introspection.table_names())
+        absent = [m._meta.db_table for m in models if m._meta.db_table not in target_tables]
+        if absent:
+            raise CommandError(f"Faltan tablas en destino ({', '.join(absent)}): ejecuta migrate primero.")
+
+        started = time.perf_counter()
+        try:
+            # las FK de Django en PostgreSQL son DEFERRABLE INITIALLY DEFERRED:
+            # dentro de una transacción el orden de las tablas no importa
+            with transaction.atomic(using=target.alias):
+                self._prepare_target(target, models, options["replace"])
+                copied = {m: self._copy_model(m, source, target, options["batch_size"]) for m in models}
+                self._reset_sequences(target, models)
+                self._verify(source, target, models)
+        finally:
+            source.close()
+
+        total = sum(copied.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {total:,} filas en {len(models)} tablas copiadas en {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _check_migrations(self, source, target):
+        applied = {
+            alias: set(MigrationRecorder(connections[alias]).applied_migrations())
+            for alias in (source.alias, target.alias)
+        }
+        pending = applied[target.alias] - applied[source.alias]
+        extra = applied[source.alias] - applied[target.alias]
+        if extra:
+            names = ", ".join(f"{app}.{name}" for app, name in sorted(extra))
+            raise CommandError(f"SQLite tiene migraciones que el destino no: {names}. Ejecuta migrate en destino.")
+        if pending:
+            names = ", ".join(f"{app}.{name}" for app, name in sorted(pending))
+            raise CommandError(f"Migra primero el SQLite de origen (le faltan: {names}).")
+
+    def _count(self, connection, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+
+    def _prepare_target(self, target, models, replace):
+        tables = [m._meta.db_table for m in models]
+        filled = [t for t in tables if self._count(target, t)]
+        blocking = [t for t in filled if t not in MIGRATE_FILLED]
+        if blocking and not replace:
+            raise CommandError(
+                f"El destino ya tiene datos en: {', '.join(blocking)}. Usa --replace para vaciarlas."
+            )
+        if filled:
+            quoted = ", ".join(target.ops.quote_name(t) for t in filled)
+            with target.cursor() as cursor:
+                cursor.execute(f"TRUNCATE {quoted} RESTART IDENTITY CASCADE")
+
+    def _copy_model(self, model, source, target, batch_size):
+        fields = list(model._meta.concrete_fields)
+        is_json = [isinstance(f, db_models.JSONField) for f in fields]
+        columns = ", ".join(target.ops.quote_name(f.column) for f in fields)
+        sql = f"COPY {target.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN"
+        rows = (
+            model._base_manager.using(source.alias)
+            .order_by("pk")
+            .values_list(*[f.attname for f in fields])
+            .iterator(chunk_size=batch_size)
+        )
+
+        count, lines = 0, []
+        with target.cursor() as cursor:
+            for row in rows:
+                lines.append("\t".join(_copy_value(v, j) for v, j in zip(row, is_json)) + "\n")
+                if len(lines) >= batch_size:
+                    _copy_rows(cursor, sql, lines)
+                    count += len(lines)
+                    lines = []
+            if lines:
+                _copy_rows(cursor, sql, lines)
+                count += len(lines)
+        self.stdout.write(f"  {model._meta.db_table:40} {count:>9,}")
+        return count
+
+    def _reset_sequences(self, target, models):
+        statements = target.ops.sequence_reset_sql(no_style(), models)
+        with target.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def _verify(self, source, target, models):
+        errors = []
+        for model in models:
+            table = model._meta.db_table
+            expected, found = self._count(source, table), self._count(target, table)
+            if found != expected:
+                errors.append(f"{table}: origen {expected}, destino {found}")
+        if errors:
+            # CommandError dentro de atomic(): se revierte toda la copia
+            raise CommandError("Conteos distintos, copia revertida:\n  " + "\n  ".join(errors))
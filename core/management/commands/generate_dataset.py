@@ -0,0 +1,544 @@
+import bisect
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as dtime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.duration import duration_microseconds
+
+from cash.models import CashMovement, CashRegister
+from catalog.models import Service, ServiceCategory, ServiceComponent
+from customers.models import Customer
+from inventory.models import InventoryItem, InventoryMovement, Unit
+from orders.models import Order, OrderLine, OrderTracking
+from reports.cache import TRACKED_MODELS, bump_table_version, versions_are_shared
+
+CENT = Decimal("0.01")
+MILLI = Decimal("0.001")
+
+# Tablas que --flush vacía (hijas antes que padres).
+FLUSH_MODELS = [CashMovement, CashRegister, InventoryMovement, OrderTracking, OrderLine, Order, Customer]
+
+# Tablas de volumen: se insertan con executemany de tuplas ya preparadas.
+# bulk_create prepara cada valor campo por campo y no pasa de ~1.000 órdenes/s;
+# si un modelo gana un campo, el comando se niega a correr hasta listarlo aquí.
+COLUMNS = {
+    Order: ("id", "customer_id", "code", "date_created", "status", "notes",
+            "total_amount", "discount", "final_amount", "is_paid"),
+    OrderLine: ("id", "order_id", "service_id", "quantity", "unit_price", "subtotal"),
+    OrderTracking: ("id", "order_id", "previous_status", "new_status", "timestamp",
+                    "changed_by_id", "notes", "previous_duration"),
+    InventoryMovement: ("id", "item_id", "order_id", "related_service_id", "movement_type",
+                        "quantity", "balance_after", "created_at", "user_id", "notes"),
+    CashMovement: ("id", "register_id", "movement_type", "amount", "description",
+                   "created_at", "created_by_id", "related_order_id"),
+}
+
+# ---------------------------------------------------------------------
+# Distribuciones
+# ---------------------------------------------------------------------
+# lunes..domingo
+WEEKDAY_FACTOR = [1.0, 0.95, 0.95, 1.0, 1.1, 1.25, 0.45]
+# hora de llegada (7:00–20:00): picos de mañana y de salida del trabajo
+HOUR_WEIGHTS = [4, 8, 10, 9, 7, 6, 6, 5, 5, 6, 8, 9, 7, 3]
+LINES_WEIGHTS = {1: 50, 2: 30, 3: 15, 4: 5}
+CUSTOMER_TYPES = (["personal"] * 80) + (["business"] * 15) + (["delivery"] * 5)
+
+# (estado, siguiente, mediana en horas, dispersión lognormal)
+FLOW = [
+    ("pendiente", "en_proceso", 1.5, 0.8),
+    ("en_proceso", "listo", 18.0, 0.5),
+    ("listo", "entregado", 20.0, 1.0),
+]
+CANCEL_RATE = {"pendiente": 0.03, "en_proceso": 0.01}
+NEVER_COLLECTED = 0.01
+PREPAID_RATE = 0.3
+DISCOUNT_RATE = 0.15
+
+FIRST_NAMES = [
+    "María", "José", "Ana", "Luis", "Carmen", "Juan", "Rosa", "Carlos", "Laura", "Pedro",
+    "Julia", "Miguel", "Elena", "Rafael", "Sofía", "Manuel", "Isabel", "Jorge", "Lucía", "Ramón",
+]
+LAST_NAMES = [
+    "Gómez", "Pérez", "Rodríguez", "Martínez", "García", "Fernández", "López", "Díaz", "Reyes",
+    "Santos", "Castillo", "Ramírez", "Núñez", "Jiménez", "Vargas", "Peña", "Almonte", "Féliz",
+]
+BUSINESS_NAMES = ["Hotel", "Restaurante", "Clínica", "Spa", "Gimnasio", "Colegio", "Residencial", "Salón"]
+SECTORS = ["Piantini", "Naco", "Gazcue", "Los Prados", "Bella Vista", "Zona Colonial", "Arroyo Hondo", "Ensanche Ozama"]
+
+CATALOG = {
+    # categoría: [(servicio, unidad, precio base, [(insumo, cantidad por unidad)])]
+    "Lavado": [
+        ("Lavado por kilo", "kilo", 90, [("Detergente líquido", 40), ("Suavizante", 15)]),
+        ("Lavado por prenda", "prenda", 60, [("Detergente líquido", 12), ("Suavizante", 5)]),
+        ("Lavado de edredón", "servicio", 450, [("Detergente líquido", 120), ("Suavizante", 40)]),
+    ],
+    "Planchado": [
+        ("Planchado sencillo", "prenda", 30, [("Bolsas de entrega", 0.2)]),
+        ("Planchado de traje", "servicio", 180, [("Bolsas de entrega", 1), ("Ganchos", 1)]),
+    ],
+    "Tintorería": [
+        ("Tintorería camisa", "prenda", 150, [("Solvente", 60), ("Ganchos", 1)]),
+        ("Tintorería vestido", "prenda", 350, [("Solvente", 120), ("Bolsas de entrega", 1)]),
+        ("Desmanchado", "prenda", 120, [("Blanqueador", 30)]),
+    ],
+}
+SUPPLIES = {
+    # insumo: (unidad, stock mínimo, reposición hasta, costo)
+    "Detergente líquido": ("ml", 20000, 120000, "0.08"),
+    "Suavizante": ("ml", 8000, 60000, "0.06"),
+    "Blanqueador": ("ml", 3000, 20000, "0.05"),
+    "Solvente": ("ml", 5000, 40000, "0.12"),
+    "Bolsas de entrega": ("unidad", 200, 2000, "3.50"),
+    "Ganchos": ("unidad", 200, 3000, "1.25"),
+}
+EXPENSES = [("Compra de insumos", 800, 6000), ("Transporte", 150, 800), ("Mantenimiento", 500, 4000), ("Servicios", 300, 2500)]
+
+
+def _money(cents):
+    return (Decimal(cents) * CENT).quantize(CENT)
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un historial sintético de la lavandería (clientes, órdenes con líneas, "
+        "seguimiento, movimientos de inventario y de caja) con inserciones por lotes. "
+        "Determinista con --seed; escala con --orders-per-day y --days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=5000)
+        parser.add_argument("--services", type=int, default=0, help="Servicios extra además del catálogo base.")
+        parser.add_argument("--orders-per-day", type=int, default=300, help="Promedio de órdenes por día.")
+        parser.add_argument("--days", type=int, default=365, help="Días de historial hasta hoy.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--until", type=date.fromisoformat, default=None,
+            help="Último día del historial (AAAA-MM-DD, cerrado a las 21:00). Por defecto, ahora.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10000, help="Órdenes por lote (y filas por INSERT).")
+        parser.add_argument(
+            "--flush", action="store_true",
+            help="Vacía antes clientes, órdenes, caja y movimientos de inventario.",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.tz = timezone.get_current_timezone()
+        if options["until"]:
+            # con la misma semilla y --until el historial sale idéntico
+            self.today = options["until"]
+            self.now = datetime.combine(self.today, dtime(21), tzinfo=self.tz)
+        else:
+            self.now = timezone.now()
+            self.today = timezone.localdate()
+        self.counts = defaultdict(int)
+        self._check_columns()
+        # valores ya en el formato del motor (SQLite guarda fechas como texto
+        # UTC); adapt_datetimefield_value revisa cada valor y pesa en el perfil
+        if connection.vendor == "sqlite" and settings.USE_TZ:
+            db_tz = connection.timezone
+            self.db_datetime = lambda value: str(value.astimezone(db_tz).replace(tzinfo=None))
+        else:
+            self.db_datetime = connection.ops.adapt_datetimefield_value
+        self.db_duration = (
+            (lambda value: value) if connection.features.has_native_duration_field else duration_microseconds
+        )
+        started = time.perf_counter()
+
+        self.flushed = options["flush"]
+        if self.flushed:
+            self._flush_tables()
+        elif Order.objects.exists():
+            raise CommandError("Ya hay órdenes en la base: usa --flush para reemplazarlas.")
+
+        with transaction.atomic():
+            self._prepare_users()
+            self._prepare_catalog(options["services"])
+            self._prepare_customers(options["customers"], options["days"])
+            self._prepare_registers(options["days"])
+
+        self.next_ids = {m: (m.objects.aggregate(m=Max("id"))["m"] or 0) + 1 for m in
+                         (Order, OrderLine, OrderTracking, InventoryMovement, CashMovement)}
+        self.pending = defaultdict(list)
+
+        first_day = self.today - timedelta(days=options["days"] - 1)
+        for offset in range(options["days"]):
+            self._generate_day(first_day + timedelta(days=offset), options["orders_per_day"])
+            if len(self.pending[Order]) >= self.batch_size:
+                self._write_batch(started)
+        self._write_batch(started)
+        self._finish()
+
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{n:,} {m._meta.verbose_name_plural.lower()}" for m, n in self.counts.items())
+        self.stdout.write(self.style.SUCCESS(f"✅ {summary} en {elapsed:.0f}s"))
+
+    # =====================================================
+    # 🔹 PREPARACIÓN
+    # =====================================================
+    def _check_columns(self):
+        for model, columns in COLUMNS.items():
+            fields = {f.attname for f in model._meta.concrete_fields}
+            if fields != set(columns):
+                missing = ", ".join(sorted(fields ^ set(columns)))
+                raise CommandError(f"{model._meta.label} cambió ({missing}): actualiza COLUMNS en generate_dataset.")
+
+    def _flush_tables(self):
+        tables = [m._meta.db_table for m in FLUSH_MODELS]
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                quoted = ", ".join(connection.ops.quote_name(t) for t in tables)
+                cursor.execute(f"TRUNCATE {quoted} RESTART IDENTITY CASCADE")
+            else:
+                for table in tables:
+                    cursor.execute(f"DELETE FROM {connection.ops.quote_name(table)}")
+        self.stdout.write(f"🧹 Tablas vaciadas: {', '.join(tables)}")
+
+    def _prepare_users(self):
+        User = get_user_model()
+        self.operators = []
+        for i in range(1, 4):
+            user, created = User.objects.get_or_create(
+                username=f"operador{i}",
+                defaults={"first_name": f"Operador {i}", "is_staff": True},
+            )
+            if created:
+                user.set_unusable_password()
+                user.save(update_fields=["password"])
+            self.operators.append(user.pk)
+
+    def _prepare_catalog(self, extra_services):
+        units = {}
+        for abbreviation in {unit for unit, *_ in SUPPLIES.values()}:
+            units[abbreviation], _ = Unit.objects.get_or_create(name=abbreviation, defaults={"abbreviation": abbreviation})
+
+        self.stock, self.restock = {}, {}
+        items = {}
+        for name, (unit, minimum, target, cost) in SUPPLIES.items():
+            item, _ = InventoryItem.objects.get_or_create(
+                name=name,
+                defaults={"unit": units[unit], "min_stock": minimum, "cost_per_unit": Decimal(cost), "current_stock": target},
+            )
+            items[name] = item
+            # con --flush los movimientos anteriores desaparecen: se parte del
+            # stock de reposición para que el resultado no dependa de la corrida previa
+            self.stock[item.pk] = Decimal(target) if self.flushed else Decimal(item.current_stock)
+            self.restock[item.pk] = (Decimal(item.min_stock or minimum), Decimal(target))
+        self.last_restock = {}
+
+        catalog = []
+        for category_name, services in CATALOG.items():
+            category, _ = ServiceCategory.objects.get_or_create(name=category_name)
+            for name, unit_type, price, components in services:
+                catalog.append((category, name, unit_type, price, components))
+        for i in range(extra_services):
+            category, name, unit_type, price, components = catalog[i % len(catalog)]
+            catalog.append((category, f"{name} especial {i + 1}", unit_type, round(price * self.rng.uniform(1.1, 1.8)), components))
+
+        self.services = []
+        self.components = {}
+        for category, name, unit_type, price, components in catalog:
+            service, _ = Service.objects.get_or_create(
+                name=name,
+                defaults={"category": category, "unit_type": unit_type, "base_price": Decimal(price)},
+            )
+            for item_name, quantity in components:
+                ServiceComponent.objects.get_or_create(
+                    service=service, item=items[item_name], defaults={"quantity_used": Decimal(str(quantity))},
+                )
+            self.components[service.pk] = [
+                (c.item_id, c.quantity_used) for c in ServiceComponent.objects.filter(service=service)
+            ]
+            self.services.append((service.pk, service.unit_type, int(service.base_price * 100), service.name))
+        # pocos servicios concentran la mayoría de los pedidos
+        self.service_weights = list(_cumulative([1 / (rank + 1) for rank in range(len(self.services))]))
+
+    def _prepare_customers(self, count, days):
+        rng = self.rng
+        start = self.today - timedelta(days=days)
+        # 30 % ya era cliente antes del historial; el resto llega repartido
+        signup = sorted(
+            start - timedelta(days=rng.randint(1, 365)) if rng.random() < 0.3
+            else start + timedelta(days=int(days * rng.random() ** 0.7))
+            for _ in range(count)
+        )
+        first_id = (Customer.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+        customers = []
+        for i, day in enumerate(signup):
+            kind = rng.choice(CUSTOMER_TYPES)
+            if kind == "business":
+                name = f"{rng.choice(BUSINESS_NAMES)} {rng.choice(LAST_NAMES)} {i + 1}"
+            else:
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+            customers.append(Customer(
+                id=first_id + i,
+                name=name,
+                customer_type=kind,
+                email=f"cliente{first_id + i}@example.com",
+                phone=f"+1 809-{rng.randint(200, 999)}-{(first_id + i) % 10000:04d}",
+                address=f"{rng.choice(SECTORS)}, calle {rng.randint(1, 60)}",
+                contact_person=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" if kind == "business" else None,
+                credit_limit=Decimal(rng.choice([5000, 10000, 25000])) if kind == "business" else Decimal(0),
+            ))
+        Customer.objects.bulk_create(customers, batch_size=self.batch_size)
+
+        # created_at es auto_now_add: se corrige por día (ids consecutivos)
+        by_day = defaultdict(list)
+        for customer, day in zip(customers, signup):
+            by_day[day].append(customer.id)
+        for day, ids in by_day.items():
+            at = datetime.combine(day, dtime(10), tzinfo=self.tz)
+            Customer.objects.filter(id__range=(ids[0], ids[-1])).update(created_at=at, updated_at=at)
+
+        self.customer_ids = [c.id for c in customers]
+        self.customer_business = {c.id for c in customers if c.customer_type == "business"}
+        self.signup = signup
+        self.counts[Customer] = len(customers)
+
+    def _prepare_registers(self, days):
+        """Una caja por día; la de hoy queda abierta salvo que ya haya una."""
+        open_register = CashRegister.objects.filter(is_open=True).first()
+        first_day = self.today - timedelta(days=days - 1)
+        registers = []
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            opened_by, closed_by = self.rng.choice(self.operators), self.rng.choice(self.operators)
+            if day == self.today and open_register:
+                continue
+            is_today = day == self.today
+            registers.append(CashRegister(
+                name=f"Caja {day.isoformat()}",
+                opened_at=datetime.combine(day, dtime(7), tzinfo=self.tz),
+                closed_at=None if is_today else datetime.combine(day, dtime(21), tzinfo=self.tz),
+                is_open=is_today,
+                opened_by_id=opened_by,
+                closed_by_id=None if is_today else closed_by,
+                opening_balance=Decimal("1000.00"),
+            ))
+        CashRegister.objects.bulk_create(registers, batch_size=self.batch_size)
+        self.registers = {r.opened_at.astimezone(self.tz).date(): r for r in CashRegister.objects.filter(
+            name__in=[r.name for r in registers]
+        )}
+        if open_register:
+            self.registers[self.today] = open_register
+        self.register_totals = defaultdict(int)  # centavos netos por caja
+        self.counts[CashRegister] = len(registers)
+
+    # =====================================================
+    # 🔹 GENERACIÓN
+    # =====================================================
+    def _generate_day(self, day, orders_per_day):
+        # todo lo aleatorio se sortea aunque caiga después de `now`: así el
+        # historial con la misma semilla no depende de la hora de ejecución
+        rng = self.rng
+        season = 1 + 0.15 * math.sin(2 * math.pi * day.timetuple().tm_yday / 365)
+        count = max(0, round(orders_per_day * WEEKDAY_FACTOR[day.weekday()] * season * rng.gauss(1, 0.1)))
+        opening = datetime.combine(day, dtime(7), tzinfo=self.tz)
+        available = bisect.bisect_right(self.signup, day) or 1
+        hours = rng.choices(range(len(HOUR_WEIGHTS)), weights=HOUR_WEIGHTS, k=count)
+
+        for hour in sorted(hours):
+            created = opening + timedelta(hours=hour, seconds=rng.randrange(3600))
+            # los clientes más antiguos son los más frecuentes
+            customer_id = self.customer_ids[int(available * rng.random() ** 2)]
+            self._generate_order(created, customer_id)
+
+        for description, low, high in EXPENSES:
+            happens = rng.random() < 0.35
+            at = opening + timedelta(hours=rng.uniform(1, 12))
+            cents = rng.randint(low, high) * 100
+            operator = rng.choice(self.operators)
+            if happens and at <= self.now:
+                self._cash(day, "egreso", cents, description, at, None, operator)
+
+    def _generate_order(self, created, customer_id):
+        rng = self.rng
+        steps = self._lifecycle(created)
+
+        total = 0
+        lines = []
+        consumption = defaultdict(Decimal)
+        n_lines = rng.choices(list(LINES_WEIGHTS), weights=list(LINES_WEIGHTS.values()))[0]
+        for service_id, unit_type, price, _ in rng.choices(self.services, cum_weights=self.service_weights, k=n_lines):
+            if unit_type == "kilo":
+                quantity = Decimal(rng.randint(20, 120)) / 10
+            elif unit_type == "servicio":
+                quantity = Decimal(rng.randint(1, 2))
+            else:
+                quantity = Decimal(rng.randint(1, 12))
+            subtotal = round(price * quantity)
+            total += subtotal
+            lines.append((service_id, quantity, _money(price), _money(subtotal)))
+            for item_id, used in self.components.get(service_id, ()):
+                consumption[item_id] += quantity * used
+
+        discounted = rng.random() < DISCOUNT_RATE
+        discount_cents = rng.choice([1000, 2500, 5000])
+        prepaid = rng.random() < PREPAID_RATE
+        if created > self.now:
+            return
+
+        discount = 0
+        if customer_id in self.customer_business:
+            discount = total // 10
+        elif discounted:
+            discount = min(total, discount_cents)
+        final = total - discount
+
+        status = steps[-1][1]
+        paid_at = None
+        if status == "entregado":
+            paid_at = steps[-1][2]
+        elif status != "cancelado" and prepaid:
+            paid_at = created
+
+        order_id = self._next_id(Order)
+        code = f"ORD-{order_id:05d}"
+        self.pending[Order].append((
+            order_id, customer_id, code, self.db_datetime(created), status, None,
+            _money(total), _money(discount), _money(final), paid_at is not None,
+        ))
+        for line in lines:
+            self.pending[OrderLine].append((self._next_id(OrderLine), order_id, *line))
+
+        entered = created
+        for previous, new, at, operator in steps:
+            self.pending[OrderTracking].append((
+                self._next_id(OrderTracking), order_id, previous, new, self.db_datetime(at),
+                operator, None, self.db_duration(at - entered) if previous else None,
+            ))
+            entered = at
+            # los insumos los registra quien empezó (o canceló) el proceso
+            if new == "en_proceso":
+                for item_id, quantity in consumption.items():
+                    self._inventory(item_id, "salida", -quantity, at, order_id, operator)
+            elif new == "cancelado" and previous == "en_proceso":
+                for item_id, quantity in consumption.items():
+                    self._inventory(item_id, "devolucion", quantity, at, order_id, operator)
+
+        if paid_at is not None and final > 0:
+            self._cash(
+                timezone.localtime(paid_at, self.tz).date(), "ingreso", final, f"Pago de orden {code}",
+                paid_at, order_id, steps[-1][3],
+            )
+
+    def _lifecycle(self, created):
+        """[(estado anterior, estado, momento, operador)] hasta ahora.
+
+        El recorrido completo se sortea siempre y después se corta en `now`.
+        """
+        rng = self.rng
+        steps = [(None, "pendiente", created, rng.choice(self.operators))]
+        at = created
+        for current, following, median, sigma in FLOW:
+            if rng.random() < CANCEL_RATE.get(current, 0):
+                at += timedelta(hours=rng.uniform(0.2, 8))
+                steps.append((current, "cancelado", at, rng.choice(self.operators)))
+                break
+            if following == "entregado" and rng.random() < NEVER_COLLECTED:
+                break
+            at += timedelta(hours=rng.lognormvariate(math.log(median), sigma))
+            steps.append((current, following, at, rng.choice(self.operators)))
+        return [step for step in steps if step[2] <= self.now]
+
+    def _inventory(self, item_id, movement_type, delta, at, order_id, user_id):
+        stock = self.stock[item_id] + delta
+        self.stock[item_id] = stock
+        self.pending[InventoryMovement].append((
+            self._next_id(InventoryMovement), item_id, order_id, None, movement_type,
+            abs(delta).quantize(MILLI), stock.quantize(MILLI), self.db_datetime(at), user_id, None,
+        ))
+        minimum, target = self.restock[item_id]
+        if stock < minimum:
+            # reposición como la haría el encargado al ver el bajo stock
+            self.stock[item_id] = target
+            self.last_restock[item_id] = at
+            self.pending[InventoryMovement].append((
+                self._next_id(InventoryMovement), item_id, None, None, "entrada",
+                (target - stock).quantize(MILLI), target, self.db_datetime(at + timedelta(minutes=30)),
+                user_id, "Reposición de stock",
+            ))
+
+    def _cash(self, day, movement_type, cents, description, at, order_id, user_id):
+        register = self.registers.get(day)
+        if register is None:
+            return
+        self.register_totals[register.pk] += cents if movement_type == "ingreso" else -cents
+        self.pending[CashMovement].append((
+            self._next_id(CashMovement), register.pk, movement_type, _money(cents), description,
+            self.db_datetime(at), user_id, order_id,
+        ))
+
+    def _next_id(self, model):
+        value = self.next_ids[model]
+        self.next_ids[model] = value + 1
+        return value
+
+    # =====================================================
+    # 🔹 ESCRITURA
+    # =====================================================
+    def _write_batch(self, started):
+        if not self.pending:
+            return
+        qn = connection.ops.quote_name
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model, columns in COLUMNS.items():
+                rows = self.pending.pop(model, [])
+                if not rows:
+                    continue
+                names = ", ".join(qn(model._meta.get_field(c).column) for c in columns)
+                placeholders = ", ".join(["%s"] * len(columns))
+                sql = f"INSERT INTO {qn(model._meta.db_table)} ({names}) VALUES ({placeholders})"
+                for start in range(0, len(rows), self.batch_size):
+                    cursor.executemany(sql, rows[start:start + self.batch_size])
+                self.counts[model] += len(rows)
+        orders = self.counts[Order]
+        self.stdout.write(f"  {orders:>10,} órdenes  ({orders / (time.perf_counter() - started):,.0f}/s)")
+
+    def _finish(self):
+        with transaction.atomic():
+            items = list(InventoryItem.objects.filter(pk__in=self.stock))
+            for item in items:
+                item.current_stock = self.stock[item.pk].quantize(CENT)
+                if item.pk in self.last_restock:
+                    item.last_restock_date = timezone.localtime(self.last_restock[item.pk], self.tz).date()
+            InventoryItem.objects.bulk_update(items, ["current_stock", "last_restock_date"])
+
+            registers = [r for r in self.registers.values() if not r.is_open]
+            for register in registers:
+                register.closing_balance = register.opening_balance + _money(self.register_totals[register.pk])
+            CashRegister.objects.bulk_update(registers, ["closing_balance"], batch_size=self.batch_size)
+
+            # ids explícitos: poner al día las secuencias de PostgreSQL
+            statements = connection.ops.sequence_reset_sql(no_style(), FLUSH_MODELS)
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+        # executemany y bulk_update no disparan señales: invalidar las cachés
+        # por tabla. Solo llega a los servidores si la caché es compartida.
+        for label in TRACKED_MODELS:
+            bump_table_version(label)
+        if not versions_are_shared():
+            self.stdout.write(self.style.WARNING(
+                "⚠️  La caché es por proceso: reinicia los servidores en marcha (o vacía su caché) "
+                "para que no sigan sirviendo reportes cacheados de antes de la carga."
+            ))
+
+
+def _cumulative(weights):
+    total = 0
+    for weight in weights:
+        total += weight
+        yield total
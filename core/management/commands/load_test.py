@@ -0,0 +1,229 @@
+import importlib.util
+import json
+import re
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import ProtectedError
+from django.urls import reverse
+
+from cash.models import CashRegister
+from catalog.models import Service
+from core.loadtest import LOCKED_MARKERS, PERSONAS, LoadStats, OrderPool, run_user
+from customers.models import Customer
+from orders.models import Order
+
+# usuarios de carga: uno por perfil, sin staff, creados en la base del
+# servidor al empezar y borrados al terminar
+USER_PREFIX = "carga-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga HTTP contra un servidor local con usuarios virtuales de mostrador, "
+        "gerencia y caja. Informa throughput, errores (incluido 'database is locked') y "
+        "p50/p95/p99 por endpoint. Usa la misma base que la configuración activa. La columna "
+        "'locked' solo se llena si el servidor corre con DEBUG (la página de error nombra la "
+        "excepción); con --serve se cuentan además en el log del servidor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Servidor a probar.")
+        parser.add_argument(
+            "--serve", action="store_true",
+            help="Levanta el servidor en --url (gunicorn si está instalado; si no, runserver) y lee su log.",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="Workers de gunicorn con --serve.")
+        parser.add_argument("--clerks", type=int, default=4, help="Usuarios de mostrador.")
+        parser.add_argument("--managers", type=int, default=1, help="Usuarios de gerencia.")
+        parser.add_argument("--cashiers", type=int, default=1, help="Usuarios de caja.")
+        parser.add_argument("--duration", type=float, default=30.0, help="Segundos de carga.")
+        parser.add_argument("--think", type=float, default=0.5, help="Pausa media entre acciones (s); 0 = sin pausa.")
+        parser.add_argument(
+            "--password",
+            help="Contraseña de los usuarios de carga (por defecto, una aleatoria para esta corrida).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", help="Guarda el informe también en este archivo.")
+
+    def handle(self, *args, **options):
+        ctx = self._context()
+        mix = [("mostrador", options["clerks"]), ("gerente", options["managers"]), ("cajero", options["cashiers"])]
+        users = [persona for persona, count in mix for _ in range(count)]
+        if not users:
+            raise CommandError("No hay usuarios virtuales: usa --clerks, --managers o --cashiers.")
+
+        password = options["password"] or secrets.token_urlsafe(16)
+        self._users(password)
+        try:
+            stats, elapsed, log = self._run(options, ctx, mix, users, password)
+        finally:
+            self._remove_users()
+
+        locked_in_log = self._count_locked(log) if log else None
+        self._report(stats.rows(elapsed), elapsed, locked_in_log, options["json"])
+
+    def _run(self, options, ctx, mix, users, password):
+        server, log = (self._serve(options) if options["serve"] else (None, None))
+        try:
+            self._wait_ready(options["url"])
+            stats = LoadStats()
+            self.stdout.write(
+                f"{len(users)} usuarios ({', '.join(f'{n} {p}' for p, n in mix if n)}) × "
+                f"{options['duration']:.0f}s contra {options['url']}"
+            )
+            stop_at = time.monotonic() + options["duration"]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(users)) as pool:
+                futures = [
+                    pool.submit(
+                        run_user, options["url"], persona, (f"{USER_PREFIX}{persona}", password),
+                        ctx, stats, stop_at, options["think"], options["seed"] * 1000 + i,
+                    )
+                    for i, persona in enumerate(users)
+                ]
+                for future in futures:
+                    future.result()
+            elapsed = time.perf_counter() - started
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+        return stats, elapsed, log
+
+    # =====================================================
+    # 🔹 PREPARACIÓN
+    # =====================================================
+    def _context(self):
+        customers = list(Customer.objects.filter(is_active=True).values_list("pk", flat=True)[:500])
+        services = [
+            (pk, str(price))
+            for pk, price in Service.objects.filter(is_active=True).values_list("pk", "base_price")
+        ]
+        if not customers or not services:
+            raise CommandError("Faltan clientes o servicios: genera datos con generate_dataset.")
+        if not CashRegister.objects.filter(is_open=True).exists():
+            self.stdout.write(self.style.WARNING("⚠️  No hay caja abierta: los movimientos de caja no se registrarán."))
+        in_flow = Order.objects.filter(status__in=["pendiente", "en_proceso", "listo"]).order_by("-pk")
+        urls = {
+            name: reverse(name)
+            for actions in PERSONAS.values()
+            for _, action in actions
+            if (name := getattr(action, "endpoint", None))
+        }
+        urls.update({
+            "login": reverse(settings.LOGIN_URL),
+            "orders:add": reverse("orders:add"),
+            "orders:advance": reverse("orders:advance", kwargs={"pk": 0}).replace("/0/", "/{pk}/"),
+            "cash:movement_new": reverse("cash:movement_new"),
+        })
+        return {
+            "urls": urls,
+            "customers": customers,
+            "services": services,
+            "orders": OrderPool(in_flow.values_list("pk", flat=True)[:1000]),
+        }
+
+    def _users(self, password):
+        User = get_user_model()
+        for persona in PERSONAS:
+            user, _ = User.objects.get_or_create(
+                username=f"{USER_PREFIX}{persona}", defaults={"first_name": f"Carga {persona}"},
+            )
+            # los perfiles no usan el admin ni /perf/: sin staff
+            user.is_staff = user.is_superuser = False
+            user.is_active = True
+            user.set_password(password)
+            user.save(update_fields=["password", "is_staff", "is_superuser", "is_active"])
+
+    def _remove_users(self):
+        """Borra los usuarios de carga; si la caja los referencia (PROTECT), los desactiva."""
+        kept = 0
+        for user in get_user_model().objects.filter(username__startswith=USER_PREFIX):
+            try:
+                user.delete()
+            except ProtectedError:
+                user.is_active = False
+                user.set_unusable_password()
+                user.save(update_fields=["is_active", "password"])
+                kept += 1
+        if kept:
+            self.stdout.write(f"{kept} usuarios de carga con movimientos de caja quedan desactivados.")
+
+    def _serve(self, options):
+        bind = re.sub(r"^https?://", "", options["url"]).rstrip("/")
+        if importlib.util.find_spec("gunicorn"):
+            command = [
+                sys.executable, "-m", "gunicorn", settings.WSGI_APPLICATION.replace(".application", ":application"),
+                "--workers", str(options["workers"]), "--bind", bind, "--access-logfile", "-",
+            ]
+        else:
+            self.stdout.write(self.style.WARNING("⚠️  gunicorn no está instalado: se usa runserver (un proceso, hilos)."))
+            command = [sys.executable, "manage.py", "runserver", "--noreload", bind]
+        log = tempfile.NamedTemporaryFile(prefix="load_test-", suffix=".log", delete=False)
+        self.stdout.write(f"Servidor: {' '.join(command[1:])} (log en {log.name})")
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, stdout=log, stderr=subprocess.STDOUT)
+        return server, Path(log.name)
+
+    def _wait_ready(self, url, timeout=30):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(url.rstrip("/") + reverse(settings.LOGIN_URL), timeout=5)
+                return
+            except OSError as e:
+                if time.monotonic() > deadline:
+                    raise CommandError(f"El servidor no responde en {url}: {e}")
+                time.sleep(0.5)
+
+    def _count_locked(self, log):
+        # cada 500 deja su traceback; se cuenta la línea final de la excepción
+        text = log.read_bytes()
+        return sum(
+            1 for line in text.splitlines()
+            if line.startswith(b"django.db.utils.OperationalError") and any(m in line for m in LOCKED_MARKERS)
+        )
+
+    # =====================================================
+    # 🔹 INFORME
+    # =====================================================
+    def _report(self, rows, elapsed, locked_in_log, json_path):
+        total = sum(r["requests"] for r in rows)
+        errors = sum(r["requests"] * r["error_pct"] / 100 for r in rows)
+        self.stdout.write(
+            f"\n{'endpoint':28} {'requests':>8} {'req/s':>7} {'errores':>8} {'locked':>7} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8}"
+        )
+        for r in rows:
+            line = (
+                f"{r['endpoint']:28} {r['requests']:>8} {r['rps']:>7.1f} {r['error_pct']:>7.1f}% {r['locked']:>7} "
+                f"{r['p50_ms']:>6.0f}ms {r['p95_ms']:>6.0f}ms {r['p99_ms']:>6.0f}ms"
+            )
+            self.stdout.write(self.style.ERROR(line) if r["error_pct"] else line)
+            others = {k: v for k, v in r["outcomes"].items() if k not in ("ok", "locked")}
+            if others:
+                self.stdout.write(f"{'':28} {others}")
+
+        self.stdout.write(
+            f"\nTotal: {total} requests en {elapsed:.0f}s → {total / elapsed:.1f} req/s, "
+            f"{errors / total * 100 if total else 0:.1f}% errores"
+        )
+        if locked_in_log is not None:
+            self.stdout.write(f"'database is locked' en el log del servidor: {locked_in_log}")
+        if json_path:
+            Path(json_path).write_text(json.dumps({
+                "duration_s": elapsed,
+                "requests": total,
+                "rps": total / elapsed,
+                "locked_in_log": locked_in_log,
+                "endpoints": rows,
+            }, indent=2, ensure_ascii=False))
@@ -0,0 +1,103 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from core.static_audit import RASTER, audit, optimize_image, project_static_files, write_unused
+
+
+def _mb(size):
+    if size < 1024 * 1024:
+        return f"{size / 1024:,.0f} KB"
+    return f"{size / 1024 / 1024:,.1f} MB"
+
+
+def _group(name):
+    # assets/images/x/y.png → assets/images
+    return "/".join(name.split("/")[:2])
+
+
+class Command(BaseCommand):
+    help = (
+        "Informa los estáticos no referenciados (collectstatic deja de copiarlos) "
+        "y recomprime las imágenes usadas en STATICFILES_DIRS (antes de collectstatic)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--list", action="store_true", help="Lista cada archivo no referenciado.")
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Solo informa; no actualiza STATIC_UNUSED_FILE.",
+        )
+        parser.add_argument(
+            "--images", action="store_true",
+            help=(
+                "Recomprime las imágenes referenciadas en sus fuentes. Va antes de collectstatic: "
+                "los nombres con hash de STATIC_ROOT se sirven como inmutables y no se tocan."
+            ),
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--quality", type=int, default=85, help="Calidad JPEG.")
+
+    def handle(self, *args, **options):
+        used, unused = audit()
+        self._report(used, unused, options["list"])
+
+        if not options["dry_run"]:
+            path = write_unused(unused)
+            self.stdout.write(f"📝 Lista de no usados → {path} (collectstatic los omite)")
+
+        if options["images"]:
+            self._optimize(used, options)
+
+    def _report(self, used, unused, verbose):
+        totals = defaultdict(lambda: [0, 0, 0, 0])
+        for name, size in used.items():
+            totals[_group(name)][0] += 1
+            totals[_group(name)][1] += size
+        for name, size in unused.items():
+            totals[_group(name)][2] += 1
+            totals[_group(name)][3] += size
+
+        self.stdout.write(f"{'carpeta':22} {'usados':>18} {'no referenciados':>22}")
+        for group in sorted(totals):
+            n_used, b_used, n_unused, b_unused = totals[group]
+            self.stdout.write(
+                f"{group:22} {n_used:>6} {_mb(b_used):>11} {n_unused:>8} {_mb(b_unused):>13}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(used)} referenciados ({_mb(sum(used.values()))}), "
+            f"{len(unused)} sin referencias ({_mb(sum(unused.values()))})"
+        ))
+        if verbose:
+            for name in sorted(unused):
+                self.stdout.write(f"  - {name}")
+
+    def _optimize(self, used, options):
+        sources = project_static_files()
+        jobs = [sources[name] for name in sorted(used) if Path(name).suffix.lower() in RASTER]
+        if not jobs:
+            self.stdout.write("Nada que optimizar.")
+            return
+
+        started = time.perf_counter()
+        before = after = changed = 0
+        with ProcessPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+            futures = {pool.submit(optimize_image, str(path), options["quality"]): path for path in jobs}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.stderr.write(f"❌ {futures[future]}: {e}")
+                    continue
+                before += result["original"]
+                after += result["optimized"]
+                changed += result["optimized"] < result["original"]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(jobs)} imágenes en {time.perf_counter() - started:.1f}s, {changed} reescritas: "
+            f"{_mb(before)} → {_mb(after)}. Revisar y commitear los cambios antes de collectstatic."
+        ))
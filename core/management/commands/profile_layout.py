@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+DEFAULT_PAGES = [
+    "dashboard:home",
+    "orders:list",
+    "orders:workflow",
+    "customers:list",
+    "catalog:list",
+    "inventory:list",
+    "cash:list",
+    "reports:financial_report",
+]
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de respuesta por página con y sin caché de fragmentos del layout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("pages", nargs="*", help="Nombres de URL o rutas (por defecto, las principales).")
+        parser.add_argument("--user", help="Usuario con el que navegar (por defecto, el primer superusuario).")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by("pk").first()
+        if user is None:
+            raise CommandError("No hay usuario con el que navegar.")
+
+        paths = [p if p.startswith("/") else reverse(p) for p in (options["pages"] or DEFAULT_PAGES)]
+        ttl = settings.LAYOUT_CACHE_TTL or 600
+
+        self.stdout.write(f"{'página':32} {'sin caché':>10} {'con caché':>10} {'ahorro':>8}")
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            client = Client()
+            client.force_login(user)
+            for path in paths:
+                cold, warm = self._measure(client, path, ttl, options["repeat"])
+                saved = (cold - warm) / cold * 100 if cold else 0
+                self.stdout.write(f"{path:32} {cold:>8.1f}ms {warm:>8.1f}ms {saved:>7.0f}%")
+
+    def _get(self, client, path, ttl):
+        with override_settings(LAYOUT_CACHE_TTL=ttl):
+            started = time.perf_counter()
+            response = client.get(path)
+            elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise CommandError(f"{path} respondió {response.status_code}")
+        return elapsed
+
+    def _measure(self, client, path, ttl, repeat):
+        """
+        Medianas en ms (sin caché, con caché). Las muestras se alternan para
+        que el ruido de la máquina afecte a ambas por igual; la primera
+        petición calienta plantillas y cachés de datos.
+        """
+        cache.clear()
+        self._get(client, path, ttl)
+        cold, warm = [], []
+        for _ in range(repeat):
+            cold.append(self._get(client, path, 0))
+            warm.append(self._get(client, path, ttl))
+        return statistics.median(cold), statistics.median(warm)
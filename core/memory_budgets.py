@@ -0,0 +1,61 @@
+# core/memory_budgets.py
+# Pico de memoria permitido (KiB, medido con tracemalloc) por request en
+# reportes, listados y respuestas JSON. El techo es el mismo a cualquier
+# escala: una vista paginada o agregada no debería crecer con los datos, y
+# la que materializa todo lo supera en cuanto la base crece.
+#
+# python manage.py check_memory_budgets --scales 10000 100000 1000000
+# Si una vista baja, bajar su techo; si sube, que sea una decisión.
+
+# Escenarios: (nombre de URL, método, datos del POST). Los POST inválidos
+# renderizan el listado con los errores del formulario.
+MEMORY_SCENARIOS = [
+    ("dashboard:home", "get", None),
+    ("dashboard:chart_data", "get", None),
+    ("orders:list", "get", None),
+    ("orders:pending", "get", None),
+    ("orders:ready", "get", None),
+    ("orders:workflow", "get", None),
+    ("customers:list", "get", None),
+    ("customers:add", "post", {"name": ""}),
+    ("catalog:list", "get", None),
+    ("inventory:list", "get", None),
+    ("inventory:add", "post", {"name": ""}),
+    ("inventory:movements", "get", None),
+    ("cash:list", "get", None),
+    ("cash:movements", "get", None),
+    ("reports:orders_report", "get", None),
+    ("reports:inventory_report", "get", None),
+    ("reports:financial_report", "get", None),
+    ("reports:customers_report", "get", None),
+    ("reports:services_report", "get", None),
+    ("reports:sla_report", "get", None),
+]
+
+MEMORY_BUDGETS = {
+    "dashboard:home": 500,
+    # una fila por día del rango (acotado por MAX_SPAN_DAYS), no por orden;
+    # medido 58–100 KiB: el doble de margen para no fallar por ruido
+    "dashboard:chart_data": 200,
+    "orders:list": 550,
+    "orders:pending": 550,
+    "orders:ready": 550,
+    # hasta COLUMN_LIMIT tarjetas por columna (más antiguas en las activas)
+    "orders:workflow": 4500,
+    "customers:list": 750,
+    "customers:add": 750,
+    "catalog:list": 700,
+    "inventory:list": 650,
+    "inventory:add": 650,
+    "inventory:movements": 500,
+    "cash:list": 550,
+    "cash:movements": 500,
+    "reports:orders_report": 650,
+    "reports:inventory_report": 450,
+    "reports:financial_report": 600,
+    "reports:customers_report": 400,
+    "reports:services_report": 350,
+    # la excepción: percentiles exactos guardan un doble por transición
+    # (~9 MiB con 100.000 órdenes); con una base mayor, subirlo a conciencia
+    "reports:sla_report": 12000,
+}
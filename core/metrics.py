@@ -0,0 +1,184 @@
+# core/metrics.py
+# /metrics en formato de texto de Prometheus. Dos tipos de cifras:
+#
+# - Por proceso, de core/timing.py: histograma de latencia, consultas y
+#   tiempo de BD por nombre de URL y aciertos de caché. Son contadores en
+#   memoria; con varios workers cada uno exporta los suyos.
+# - Del negocio (órdenes por estado, saldo de la caja abierta, insumos bajo
+#   mínimo): se calculan con pocas consultas y se guardan en la caché junto
+#   con las versiones por tabla de reports/cache.py. Mientras ninguna tabla
+#   cambie, un scrape solo lee la caché; si cambiaron, se recalculan como
+#   mucho cada METRICS_GAUGES_TTL segundos (un worker a la vez).
+import logging
+import math
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+
+from reports.cache import get_cache_stats, get_table_versions
+
+from .timing import LATENCY_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "clean"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+GAUGES_KEY = "metrics:gauges"
+GAUGES_LOCK_KEY = "metrics:gauges:lock"
+GAUGE_TABLES = ("orders.Order", "cash.CashRegister", "cash.CashMovement", "inventory.InventoryItem")
+
+
+# =====================================================
+# 🔹 GAUGES DEL NEGOCIO (CACHEADOS)
+# =====================================================
+def compute_gauges():
+    """Órdenes por estado, caja abierta y insumos bajo mínimo (sin caché)."""
+    from cash.models import CashRegister
+    from inventory.models import InventoryItem
+    from orders.models import Order
+
+    counts = dict(Order.objects.order_by().values_list("status").annotate(n=Count("id")))
+    orders = {status: counts.get(status, 0) for status, _ in Order.STATUS_CHOICES}
+
+    register = (
+        CashRegister.objects.filter(is_open=True)
+        .annotate(
+            total_ingresos=Sum("movements__amount", filter=Q(movements__movement_type="ingreso")),
+            total_egresos=Sum("movements__amount", filter=Q(movements__movement_type="egreso")),
+        )
+        .last()
+    )
+    balance = (
+        register.opening_balance + (register.total_ingresos or Decimal("0")) - (register.total_egresos or Decimal("0"))
+        if register else Decimal("0")
+    )
+
+    # igual que el reporte de inventario: en el mínimo ya hay que reponer
+    low_stock = InventoryItem.objects.filter(is_active=True, current_stock__lte=F("min_stock")).count()
+    return {
+        "orders": orders,
+        "register_open": register is not None,
+        "register_balance": float(balance),
+        "low_stock_items": low_stock,
+    }
+
+
+def get_gauges():
+    """
+    Gauges del negocio y su antigüedad en segundos. Se recalculan solo si
+    cambió alguna tabla de GAUGE_TABLES y la copia tiene más de
+    METRICS_GAUGES_TTL segundos; si otro worker ya está en eso, se sirve la
+    copia anterior.
+    """
+    versions = get_table_versions(GAUGE_TABLES)
+    entry = cache.get(GAUGES_KEY)
+    now = time.time()
+    ttl = getattr(settings, "METRICS_GAUGES_TTL", 60)
+    if entry is not None and (entry["versions"] == versions or now - entry["at"] < ttl):
+        return entry["data"], now - entry["at"]
+
+    locked = cache.add(GAUGES_LOCK_KEY, 1, timeout=30)
+    if locked or entry is None:
+        try:
+            data = compute_gauges()
+            cache.set(GAUGES_KEY, {"versions": versions, "at": now, "data": data}, None)
+        finally:
+            if locked:
+                cache.delete(GAUGES_LOCK_KEY)
+        logger.debug("[METRICS] Gauges recalculados")
+        return data, 0.0
+    return entry["data"], now - entry["at"]
+
+
+# =====================================================
+# 🔹 FORMATO DE EXPOSICIÓN
+# =====================================================
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+class _Exposition:
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, kind, help_text):
+        self.lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        self.lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    def sample(self, name, value, **labels):
+        self.lines.append(f"{PREFIX}_{name}{_labels(**labels)} {_number(value)}")
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def render_metrics():
+    """Texto completo de /metrics."""
+    out = _Exposition()
+    totals, request_cache = registry.counters()
+    names = sorted(totals)
+
+    out.family("http_request_duration_seconds", "histogram", "Duración de los requests por nombre de URL.")
+    for name in names:
+        t = totals[name]
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (math.inf,), t["buckets"]):
+            cumulative += count
+            out.sample("http_request_duration_seconds_bucket", cumulative, view=name, le=_number(float(bound)))
+        out.sample("http_request_duration_seconds_sum", t["sum"], view=name)
+        out.sample("http_request_duration_seconds_count", t["count"], view=name)
+
+    out.family("http_db_queries_total", "counter", "Consultas SQL ejecutadas por nombre de URL.")
+    for name in names:
+        out.sample("http_db_queries_total", totals[name]["queries"], view=name)
+    out.family("http_db_seconds_total", "counter", "Tiempo en la base de datos por nombre de URL.")
+    for name in names:
+        out.sample("http_db_seconds_total", totals[name]["db"], view=name)
+
+    out.family("cache_requests_total", "counter", "Lecturas de caché durante requests (este proceso).")
+    out.sample("cache_requests_total", request_cache["hits"], result="hit")
+    out.sample("cache_requests_total", request_cache["misses"], result="miss")
+    lookups = request_cache["hits"] + request_cache["misses"]
+    out.family("cache_hit_ratio", "gauge", "Aciertos / lecturas de caché durante requests (este proceso).")
+    out.sample("cache_hit_ratio", request_cache["hits"] / lookups if lookups else 0.0)
+
+    report_cache = get_cache_stats()
+    out.family("report_cache_requests_total", "counter", "Lecturas de la caché de reportes (contador en la caché compartida).")
+    out.sample("report_cache_requests_total", report_cache["hits"], result="hit")
+    out.sample("report_cache_requests_total", report_cache["misses"], result="miss")
+    out.family("report_cache_hit_ratio", "gauge", "Aciertos / lecturas de la caché de reportes.")
+    out.sample("report_cache_hit_ratio", float(report_cache["ratio"]))
+
+    gauges, age = get_gauges()
+    out.family("orders", "gauge", "Órdenes por estado.")
+    for status, count in gauges["orders"].items():
+        out.sample("orders", count, status=status)
+    out.family("cash_register_open", "gauge", "1 si hay una caja abierta.")
+    out.sample("cash_register_open", gauges["register_open"])
+    out.family("cash_register_balance", "gauge", "Saldo corriente de la caja abierta (RD$).")
+    out.sample("cash_register_balance", gauges["register_balance"])
+    out.family("inventory_low_stock_items", "gauge", "Insumos activos en o por debajo de su existencia mínima.")
+    out.sample("inventory_low_stock_items", gauges["low_stock_items"])
+    out.family("metrics_gauges_age_seconds", "gauge", "Antigüedad de los gauges del negocio.")
+    out.sample("metrics_gauges_age_seconds", round(age, 3))
+    return out.render()
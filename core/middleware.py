@@ -0,0 +1,208 @@
+# core/middleware.py
+import logging
+import re
+import time
+
+import brotli
+from django.conf import settings
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+from . import nplusone, profiler, slowlog
+from .routers import PIN_COOKIE, is_pinned, replica_alias, request_state
+from .timing import end_request, registry, start_request
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/|application/(json|javascript|xml|xhtml\+xml|manifest\+json)|image/svg\+xml)"
+)
+
+
+def accepted_encodings(header):
+    """{codificación: q} de un Accept-Encoding ("br;q=0" la excluye)."""
+    codings = {}
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        match = re.search(r"q=([0-9.]+)", params)
+        try:
+            codings[name] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            codings[name] = 0.0
+    return codings
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Comprime HTML, JSON y parciales con Brotli o, si el cliente no lo acepta,
+    gzip. Sigue las reglas de GZipMiddleware (al que reemplaza): no toca
+    respuestas con Content-Encoding (los bundles ya precomprimidos) ni en
+    streaming, agrega Vary y debilita el ETag. Para gzip conserva los bytes
+    aleatorios contra BREACH; los tokens CSRF ya van enmascarados por respuesta.
+    """
+
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 512)
+        self.brotli_quality = getattr(settings, "RESPONSE_COMPRESSION_BROTLI_QUALITY", 5)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < self.min_size:
+            return response
+        if not COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        codings = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if codings.get("br", 0) > 0:
+            encoding = "br"
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        elif codings.get("gzip", codings.get("*", 0)) > 0:
+            encoding = "gzip"
+            compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes para la réplica (core/routers.py): los requests que no son
+    GET/HEAD, o que llegan con la cookie de fijación vigente, leen siempre de
+    la primaria; si el request escribió, la cookie se renueva por
+    READ_YOUR_WRITES_SECONDS segundos.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if replica_alias() is None:
+            return self.get_response(request)
+
+        pinned = request.method not in ("GET", "HEAD", "OPTIONS") or is_pinned(request)
+        with request_state(pinned) as state:
+            response = self.get_response(request)
+
+        if state["wrote"]:
+            seconds = getattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+            response.set_cookie(
+                PIN_COOKIE, f"{time.time() + seconds:.3f}", max_age=seconds,
+                httponly=True, samesite="Lax", secure=request.is_secure(),
+            )
+        return response
+
+
+class RequestTimingMiddleware:
+    """
+    Mide cada request (core/timing.py) y lo suma al histograma por nombre de
+    URL. El encabezado Server-Timing solo se envía a staff (o con DEBUG): las
+    cifras de consultas no son asunto de cualquier cliente.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "REQUEST_TIMING_ENABLED", True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        timing, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+
+        match = getattr(request, "resolver_match", None)
+        name = match.view_name if match else "(sin ruta)"
+        registry.record(name, request.path, response.status_code, timing)
+
+        user = getattr(request, "user", None)
+        if settings.DEBUG or (user is not None and user.is_staff):
+            response.headers["Server-Timing"] = timing.server_timing()
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """
+    Deja el request a mano de core/slowlog.py (para saber la vista de cada
+    consulta lenta) y guarda lo capturado al final, fuera de la transacción
+    de la vista.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "SLOW_QUERY_LOG_ENABLED", True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = slowlog.request_started(request)
+        try:
+            return self.get_response(request)
+        finally:
+            slowlog.request_finished(token)
+
+
+class NPlusOneMiddleware:
+    """Avisa en el log de los SELECT repetidos de cada request (core/nplusone.py)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "NPLUSONE_DETECTION", settings.DEBUG)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        with nplusone.track_queries() as tracker:
+            response = self.get_response(request)
+
+        if tracker.repeated():
+            match = getattr(request, "resolver_match", None)
+            view = match.view_name if match else request.path
+            logger.warning(f"[NPLUSONE] {view}: consultas repetidas\n{tracker.report()}")
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Perfil a pedido para staff (core/profiler.py). Va después de
+    AuthenticationMiddleware; sin `?_profile` ni `X-Profile` solo mira los
+    parámetros y sigue.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "PROFILER_ENABLED", True)
+
+    def __call__(self, request):
+        if not (self.enabled and profiler.requested(request) and request.user.is_staff):
+            return self.get_response(request)
+
+        response, profile_id = profiler.profile_request(self.get_response, request)
+        response.headers["X-Profile-Id"] = profile_id
+        response.headers["X-Profile-URL"] = reverse("request_profile", args=[profile_id])
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True, verbose_name='Huella')),
+                ('sql', models.TextField(verbose_name='SQL normalizado')),
+                ('database', models.CharField(default='default', max_length=50, verbose_name='Base')),
+                ('plan', models.TextField(blank=True, verbose_name='Plan de ejecución')),
+                ('full_scan', models.BooleanField(default=False, verbose_name='Recorrido completo')),
+                ('view', models.CharField(blank=True, max_length=200, verbose_name='Vista')),
+                ('call_site', models.CharField(blank=True, max_length=255, verbose_name='Origen')),
+                ('stack', models.TextField(blank=True, verbose_name='Pila')),
+                ('calls', models.PositiveIntegerField(default=1, verbose_name='Veces')),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0, verbose_name='Máx. (ms)')),
+                ('last_ms', models.FloatField(default=0, verbose_name='Última (ms)')),
+                ('first_seen', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Primera vez')),
+                ('last_seen', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Última vez')),
+            ],
+            options={
+                'verbose_name': 'Consulta lenta',
+                'verbose_name_plural': 'Consultas lentas',
+                'ordering': ['-max_ms'],
+            },
+        ),
+    ]
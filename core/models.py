@@ -0,0 +1,83 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .slowlog import is_full_scan
+
+
+class SlowQuery(models.Model):
+    """Consulta lenta agrupada por huella (core/slowlog.py). Tabla acotada."""
+
+    fingerprint = models.CharField(max_length=40, unique=True, verbose_name="Huella")
+    sql = models.TextField(verbose_name="SQL normalizado")
+    database = models.CharField(max_length=50, default="default", verbose_name="Base")
+    plan = models.TextField(blank=True, verbose_name="Plan de ejecución")
+    full_scan = models.BooleanField(default=False, verbose_name="Recorrido completo")
+    view = models.CharField(max_length=200, blank=True, verbose_name="Vista")
+    call_site = models.CharField(max_length=255, blank=True, verbose_name="Origen")
+    stack = models.TextField(blank=True, verbose_name="Pila")
+    calls = models.PositiveIntegerField(default=1, verbose_name="Veces")
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0, verbose_name="Máx. (ms)")
+    last_ms = models.FloatField(default=0, verbose_name="Última (ms)")
+    first_seen = models.DateTimeField(default=timezone.now, verbose_name="Primera vez")
+    last_seen = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Última vez")
+
+    class Meta:
+        verbose_name = "Consulta lenta"
+        verbose_name_plural = "Consultas lentas"
+        ordering = ["-max_ms"]
+
+    def __str__(self):
+        return self.sql[:80]
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0
+
+    @classmethod
+    def record(cls, fingerprint, sql, database, duration_ms, view, call_site, stack, plan, seen_at):
+        """
+        Suma una ocurrencia; el plan se guarda solo la primera vez. Si otro
+        proceso crea la misma huella entre el update y el create, el create
+        choca con la restricción única y la ocurrencia se suma con el update.
+        """
+        def add_occurrence():
+            return cls.objects.filter(fingerprint=fingerprint).update(
+                calls=F("calls") + 1,
+                total_ms=F("total_ms") + duration_ms,
+                max_ms=Greatest("max_ms", Value(duration_ms, output_field=FloatField())),
+                last_ms=duration_ms,
+                view=view,
+                call_site=call_site,
+                stack=stack,
+                last_seen=seen_at,
+            )
+
+        if not add_occurrence():
+            try:
+                # savepoint: en PostgreSQL el error no debe invalidar una transacción externa
+                with transaction.atomic():
+                    cls.objects.create(
+                        fingerprint=fingerprint, sql=sql, database=database,
+                        plan=plan or "", full_scan=is_full_scan(plan),
+                        view=view, call_site=call_site, stack=stack,
+                        total_ms=duration_ms, max_ms=duration_ms, last_ms=duration_ms,
+                        first_seen=seen_at, last_seen=seen_at,
+                    )
+                return
+            except IntegrityError:
+                add_occurrence()
+        if plan:
+            # otro proceso (o un reinicio) registró la huella sin plan
+            cls.objects.filter(fingerprint=fingerprint, plan="").update(
+                plan=plan, full_scan=is_full_scan(plan)
+            )
+
+    @classmethod
+    def prune(cls, keep):
+        """Deja solo las `keep` huellas vistas más recientemente."""
+        stale = list(cls.objects.order_by("-last_seen").values_list("pk", flat=True)[keep:])
+        if stale:
+            cls.objects.filter(pk__in=stale).delete()
@@ -0,0 +1,108 @@
+# core/nplusone.py
+# Detector de N+1: cuenta los SELECT por huella (core/slowlog.normalize)
+# dentro de un bloque y señala las que se repiten NPLUSONE_THRESHOLD veces o
+# más. En desarrollo NPlusOneMiddleware lo abre en cada request y deja un
+# aviso [NPLUSONE] en el log; en pruebas y en check_query_budgets se usa
+# assert_no_nplusone(), que falla con NPlusOneError.
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from django.conf import settings
+
+from .slowlog import fingerprint, normalize, project_stack
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("nplusone", default=None)
+_SELECT = re.compile(r"^\s*SELECT\b", re.I)
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+class QueryFingerprints:
+    """Consultas de un bloque: total y SELECT repetidos por huella."""
+
+    def __init__(self, threshold=None, parent=None):
+        self.parent = parent  # bloques anidados (middleware dentro de una prueba)
+        self.threshold = threshold or getattr(settings, "NPLUSONE_THRESHOLD", 5)
+        self.total = 0
+        self.counts = Counter()
+        self.sql = {}
+        self.sites = {}
+        self._lock = Lock()
+
+    def add(self, sql):
+        if self.parent is not None:
+            self.parent.add(sql)
+        with self._lock:
+            self.total += 1
+        if not _SELECT.match(sql):
+            return
+        normalized = normalize(sql)
+        key = fingerprint(normalized)
+        with self._lock:
+            self.counts[key] += 1
+            count = self.counts[key]
+            self.sql.setdefault(key, normalized)
+        if count == self.threshold:
+            # la pila solo se arma una vez por huella sospechosa
+            stack = project_stack()
+            self.sites[key] = stack[-1] if stack else "(Django / plantilla)"
+
+    def repeated(self):
+        """[(veces, origen, sql)] de las huellas que llegaron al umbral."""
+        return [
+            (count, self.sites.get(key, ""), self.sql[key])
+            for key, count in self.counts.most_common()
+            if count >= self.threshold
+        ]
+
+    def report(self):
+        return "\n".join(f"  {count}× {site}: {sql[:200]}" for count, site, sql in self.repeated())
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.add(sql)
+    return execute(sql, params, many, context)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+def install():
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_on_connection_created, dispatch_uid="nplusone")
+    for connection in connections.all(initialized_only=True):
+        _on_connection_created(None, connection)
+
+
+@contextmanager
+def track_queries(threshold=None):
+    """Cuenta las consultas del bloque (también las de hilos de fanout)."""
+    tracker = QueryFingerprints(threshold, parent=_current.get())
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_no_nplusone(threshold=None):
+    """Para pruebas: falla si algún SELECT se repite `threshold` veces."""
+    with track_queries(threshold) as tracker:
+        yield tracker
+    if tracker.repeated():
+        raise NPlusOneError(f"Consultas repetidas (posible N+1):\n{tracker.report()}")
@@ -0,0 +1,52 @@
+# core/partials.py
+# Respuestas parciales para interacciones dentro de una página (búsqueda,
+# paginación, transiciones del Kanban). El JS del panel (custom/partials.js)
+# pide la URL normal con `X-Requested-With: XMLHttpRequest` (o htmx con
+# `HX-Request: true`) y la vista responde solo con el fragmento a
+# reemplazar, sin base.html ni sus estáticos.
+from urllib.parse import quote
+
+from django.shortcuts import render
+from django.utils.cache import patch_vary_headers
+
+PARTIAL_HEADERS = ("HX-Request", "X-Requested-With")
+
+
+def is_partial(request):
+    """True si la petición espera un fragmento HTML en vez de la página completa."""
+    return (
+        request.headers.get("HX-Request") == "true"
+        or request.headers.get("X-Requested-With") == "XMLHttpRequest"
+    )
+
+
+def render_fragment(request, template_name, context=None, message=None, level="info", status=200):
+    """
+    Renderiza un fragmento. El mensaje (si lo hay) viaja en `X-Message` /
+    `X-Message-Level` en lugar del framework de mensajes, que lo mostraría
+    en la siguiente página completa.
+    """
+    response = render(request, template_name, context, status=status)
+    if message:
+        response["X-Message"] = quote(str(message))
+        response["X-Message-Level"] = level
+    return response
+
+
+class PartialListMixin:
+    """
+    ListView que, ante una petición parcial, renderiza `partial_template_name`
+    (filas de la tabla + paginación) con el mismo contexto que la página.
+    """
+    partial_template_name = None
+
+    def get_template_names(self):
+        if self.partial_template_name and is_partial(self.request):
+            return [self.partial_template_name]
+        return super().get_template_names()
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        # la misma URL devuelve documento o fragmento según los encabezados
+        patch_vary_headers(response, PARTIAL_HEADERS)
+        return response
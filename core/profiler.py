@@ -0,0 +1,177 @@
+# core/profiler.py
+# Perfil de un request a pedido, solo para staff: con `?_profile=1` (o el
+# encabezado `X-Profile: 1`) ProfilerMiddleware corre la vista bajo cProfile
+# y anota sus consultas SQL. Sin la marca no se instala nada: ni profiler ni
+# execute wrapper.
+#
+# Los perfiles quedan en PROFILE_DIR (un .prof de pstats y un .json con los
+# datos del request y las consultas), como mucho PROFILE_MAX_FILES; se ven en
+# /perf/profiles/ y el .prof se puede abrir con snakeviz o pstats.
+#
+# cProfile mide solo el hilo del request: las consultas en paralelo de
+# reports/fanout.py aparecen como espera.
+import cProfile
+import json
+import logging
+import pstats
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = "_profile"
+PROFILE_HEADER = "X-Profile"
+MAX_QUERIES = 500  # consultas que se guardan por perfil
+_PROFILE_ID = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{6}$")
+
+
+def profile_dir():
+    return Path(getattr(settings, "PROFILE_DIR", settings.BASE_DIR / "var" / "profiles"))
+
+
+def requested(request):
+    return PROFILE_PARAM in request.GET or PROFILE_HEADER in request.headers
+
+
+class QueryLog:
+    """Execute wrapper que anota cada consulta del request perfilado."""
+
+    def __init__(self):
+        self.queries = []
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total += 1
+            if len(self.queries) < MAX_QUERIES:
+                self.queries.append({
+                    "sql": sql,
+                    "params": repr(params)[:500],
+                    "many": many,
+                    "database": context["connection"].alias,
+                    "ms": (time.perf_counter() - started) * 1000,
+                })
+
+
+def profile_request(get_response, request):
+    """Corre el request bajo cProfile; devuelve (respuesta, id del perfil)."""
+    queries = QueryLog()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(queries))
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    elapsed = (time.perf_counter() - started) * 1000
+
+    match = getattr(request, "resolver_match", None)
+    meta = {
+        "method": request.method,
+        "path": request.get_full_path(),
+        "view": match.view_name if match else "",
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "total_ms": elapsed,
+        "db_ms": sum(q["ms"] for q in queries.queries),
+        "query_count": queries.total,
+        "queries": queries.queries,
+        "created_at": timezone.now().isoformat(),
+    }
+    return response, save(profiler, meta)
+
+
+# =====================================================
+# 🔹 ALMACÉN EN DISCO
+# =====================================================
+def save(profiler, meta):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    (directory / f"{profile_id}.json").write_text(json.dumps(meta, ensure_ascii=False))
+    prune(getattr(settings, "PROFILE_MAX_FILES", 50))
+    logger.info(f"[PROFILE] {meta['method']} {meta['path']} → {profile_id} ({meta['total_ms']:.0f} ms)")
+    return profile_id
+
+
+def prune(keep):
+    """Borra los perfiles más viejos dejando `keep`."""
+    for meta in sorted(profile_dir().glob("*.json"), reverse=True)[keep:]:
+        meta.unlink(missing_ok=True)
+        meta.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Metadatos (sin consultas) de los perfiles guardados, el más nuevo primero."""
+    profiles = []
+    for path in sorted(profile_dir().glob("*.json"), reverse=True):
+        try:
+            meta = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        meta.pop("queries", None)
+        meta["id"] = path.stem
+        meta["created_at"] = datetime.fromisoformat(meta["created_at"])
+        profiles.append(meta)
+    return profiles
+
+
+def load(profile_id):
+    """(metadatos, pstats.Stats) o None si el id no existe o no es válido."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = profile_dir() / f"{profile_id}.json"
+    try:
+        meta = json.loads(path.read_text())
+        stats = pstats.Stats(str(path.with_suffix(".prof")))
+    except (OSError, ValueError, EOFError):
+        return None
+    meta["id"] = profile_id
+    meta["created_at"] = datetime.fromisoformat(meta["created_at"])
+    return meta, stats
+
+
+def stats_rows(stats, sort="cumulative", project_only=False, limit=60):
+    """Funciones ordenadas por tiempo acumulado (o propio) con % del total."""
+    total = stats.total_tt or 1
+    key = 3 if sort == "cumulative" else 2
+    base = str(settings.BASE_DIR)
+    rows = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        project = filename.startswith(base) and "site-packages" not in filename
+        if project_only and not project:
+            continue
+        rows.append({
+            "function": name,
+            "location": f"{_short_path(filename)}:{line}" if line else filename,
+            "calls": nc if nc == cc else f"{nc}/{cc}",
+            "tottime_ms": tt * 1000,
+            "cumtime_ms": ct * 1000,
+            "percent": (ct if key == 3 else tt) / total * 100,
+            "project": project,
+        })
+    rows.sort(key=lambda r: r["cumtime_ms" if key == 3 else "tottime_ms"], reverse=True)
+    return rows[:limit], total * 1000
+
+
+def _short_path(filename):
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base) and "site-packages" not in filename:
+        return filename[len(base) + 1:]
+    marker = "site-packages/"
+    return filename.split(marker, 1)[1] if marker in filename else filename
@@ -0,0 +1,126 @@
+# core/query_budgets.py
+# Consultas por URL, medidas con la caché vacía sobre una base de prueba
+# sembrada con generate_dataset (core.tests.QueryBudgetTests; también
+# python manage.py check_query_budgets). Si una URL nueva no está aquí, la
+# prueba falla: agregarla con su conteo actual.
+# Un presupuesto que sube necesita explicación en el commit.
+from django.conf import settings
+from django.contrib import admin
+from django.urls import URLResolver, get_resolver, reverse
+
+QUERY_BUDGETS = {
+    # core
+    "request_timings": 5,
+    "request_profiles": 5,
+    # sesión y usuario + 3 de los gauges (solo con la caché vacía)
+    "metrics": 5,
+    "root": 2,
+    # Cuentas
+    "accounts:login": 2,
+    "accounts:register": 2,
+    # Panel (incluye el recálculo de dashboard.metrics con la caché vacía)
+    "dashboard:chart_data": 4,
+    "dashboard:home": 8,
+    # Clientes
+    "customers:add": 2,
+    "customers:detail": 6,
+    "customers:edit": 3,
+    "customers:list": 7,
+    # Catálogo
+    "catalog:add": 3,
+    "catalog:edit": 4,
+    "catalog:list": 9,
+    # Inventario
+    "inventory:add": 3,
+    "inventory:edit": 4,
+    "inventory:list": 9,
+    "inventory:movements": 7,
+    # Órdenes
+    "orders:add": 7,
+    "orders:detail": 10,
+    "orders:edit": 10,
+    "orders:list": 9,
+    "orders:pending": 9,
+    "orders:ready": 9,
+    "orders:workflow": 6,
+    # Caja
+    "cash:detail": 9,
+    "cash:list": 8,
+    "cash:movement_new": 5,
+    "cash:movements": 8,
+    # Reportes
+    "reports:customers_report": 6,
+    "reports:financial_report": 9,
+    "reports:inventory_report": 11,
+    "reports:orders_report": 10,
+    "reports:services_report": 7,
+    "reports:sla_report": 7,
+    # Admin (changelists de las apps del proyecto)
+    "admin:cash_cashmovement_changelist": 10,
+    "admin:cash_cashregister_changelist": 11,
+    "admin:catalog_service_changelist": 9,
+    "admin:catalog_servicecategory_changelist": 8,
+    "admin:catalog_servicecomponent_changelist": 9,
+    "admin:catalog_servicematerial_changelist": 9,
+    "admin:catalog_servicepricing_changelist": 8,
+    "admin:core_slowquery_changelist": 10,
+    "admin:customers_customer_changelist": 8,
+    "admin:index": 7,
+    "admin:inventory_inventoryitem_changelist": 9,
+    "admin:inventory_inventorymovement_changelist": 10,
+    "admin:inventory_unit_changelist": 8,
+    "admin:orders_order_changelist": 12,
+    "admin:orders_orderline_changelist": 9,
+    "admin:orders_ordertracking_changelist": 11,
+    "admin:theme_theme_changelist": 8,
+}
+
+# URL que el recorrido no visita.
+SKIP_URLS = {
+    "accounts:logout",  # cerraría la sesión del recorrido
+    # vistas sin plantilla todavía (responden 500)
+    "accounts:profile",
+    "accounts:password_change",
+    "accounts:password_change_done",
+    "request_profile",  # el id es un archivo de var/profiles, no una fila
+}
+
+
+# =====================================================
+# 🔹 RECORRIDO DE URL
+# =====================================================
+def _walk(patterns, namespace=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == "admin":
+                continue  # los changelists se agregan aparte
+            prefix = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            yield from _walk(pattern.url_patterns, prefix)
+        elif pattern.name:
+            yield f"{namespace}{pattern.name}", pattern
+
+
+def collect_urls():
+    """[(nombre, url)] de core/urls.py con GET, más los changelists del admin."""
+    urls = []
+    for name, pattern in _walk(get_resolver().url_patterns):
+        if name in SKIP_URLS:
+            continue
+        view_class = getattr(pattern.callback, "view_class", None)
+        if view_class is not None and not hasattr(view_class, "get"):
+            continue  # solo POST: el recorrido hace GET
+        kwargs = {}
+        if "pk" in pattern.pattern.converters:
+            model = getattr(view_class, "model", None)
+            pk = model._default_manager.order_by("pk").values_list("pk", flat=True).first() if model else None
+            if pk is None:
+                raise ValueError(f"{name}: no hay filas para construir la URL (¿base sin sembrar?)")
+            kwargs["pk"] = pk
+        urls.append((name, reverse(name, kwargs=kwargs)))
+
+    urls.append(("admin:index", reverse("admin:index")))
+    for model in admin.site._registry:
+        if model.__module__.split(".")[0] in settings.LOCAL_APPS:
+            name = f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist"
+            urls.append((name, reverse(name)))
+    return sorted(urls)
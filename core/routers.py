@@ -0,0 +1,142 @@
+# core/routers.py
+# Lecturas de reportes, dashboard y exportaciones contra una réplica.
+# Solo se usan dentro de `replica_reads()` (o @use_replica / ReplicaReadsMixin);
+# el resto del código sigue leyendo de la primaria. Tras una escritura el
+# cliente queda fijado a la primaria READ_YOUR_WRITES_SECONDS segundos
+# (ReplicaPinMiddleware) para no leer datos atrasados. Además, si cualquier
+# cliente escribió en las tablas de la vista dentro de ese plazo, el bloque
+# entero lee de la primaria: las cachés y ETag llevan ya la versión nueva de
+# la tabla y no deben guardar bajo ella filas de una réplica atrasada.
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from reports.cache import TRACKED_MODELS, get_tables_changed_at
+
+# Apps que nunca se leen de la réplica: sesión y usuario deben verse al
+# instante tras el login.
+PRIMARY_ONLY_APPS = {"auth", "sessions", "contenttypes", "admin"}
+
+PIN_COOKIE = "db_primary_until"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+# estado del request actual: {"pinned": bool, "wrote": bool}
+_request_state = ContextVar("replica_request_state", default=None)
+
+
+def replica_alias():
+    """Alias de la réplica, o None si no está configurada."""
+    alias = getattr(settings, "READ_REPLICA_ALIAS", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+def recently_written(tables):
+    """True si alguna de las tablas cambió hace menos de READ_YOUR_WRITES_SECONDS."""
+    seconds = getattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+    return time.time() - get_tables_changed_at(tables) < seconds
+
+
+@contextmanager
+def replica_reads(tables=None):
+    """
+    Las lecturas dentro del bloque pueden ir a la réplica, salvo que
+    `tables` (por defecto, todas las de reports.cache.TRACKED_MODELS) hayan
+    cambiado hace menos de READ_YOUR_WRITES_SECONDS.
+    """
+    allowed = replica_alias() is not None and not recently_written(tables or TRACKED_MODELS)
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def use_replica(view_func):
+    """Decorador para vistas función de solo lectura."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads():
+            response = view_func(request, *args, **kwargs)
+            _render(response)
+        return response
+    return wrapper
+
+
+class ReplicaReadsMixin:
+    """
+    Vistas basadas en clase de solo lectura (reportes, dashboard). Si
+    declaran `cache_tables` (ReportCacheMixin) o `conditional_tables`
+    (ConditionalViewMixin), solo las escrituras recientes sobre esas tablas
+    las mandan a la primaria.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        tables = {*getattr(self, "cache_tables", ()), *getattr(self, "conditional_tables", ())}
+        with replica_reads(tables):
+            response = super().dispatch(request, *args, **kwargs)
+            _render(response)
+        return response
+
+
+def _render(response):
+    # TemplateResponse se renderiza después de la vista: hacerlo aquí para que
+    # las consultas perezosas de la plantilla también vayan a la réplica
+    if callable(getattr(response, "render", None)) and not getattr(response, "is_rendered", True):
+        response.render()
+
+
+@contextmanager
+def request_state(pinned):
+    """Lo abre ReplicaPinMiddleware alrededor de cada request."""
+    state = {"pinned": pinned, "wrote": False}
+    token = _request_state.set(state)
+    try:
+        yield state
+    finally:
+        _request_state.reset(token)
+
+
+def is_pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if alias is None or not _replica_reads.get():
+            return None
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        state = _request_state.get()
+        if state and (state["pinned"] or state["wrote"]):
+            return None
+        # dentro de una transacción hay que leer lo que ella misma escribió
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state["wrote"] = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primaria y réplica tienen los mismos datos
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # la réplica recibe el esquema por replicación, no por migrate
+        if db == replica_alias():
+            return False
+        return None
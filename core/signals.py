@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .fragments import bump_groups_version, bump_user_version
+
+
+def _user_changed(sender, instance, **kwargs):
+    bump_user_version(instance.pk)
+
+
+def _user_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """User.groups / User.user_permissions, desde cualquiera de los dos lados."""
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        bump_user_version(instance.pk)
+    elif action == "post_clear":
+        # desde el grupo/permiso no se sabe a quién afectó
+        bump_groups_version()
+    else:
+        for user_id in pk_set or ():
+            bump_user_version(user_id)
+
+
+def _groups_changed(sender, action="post_save", **kwargs):
+    if action.startswith("post_"):
+        bump_groups_version()
+
+
+def connect_signals():
+    User = get_user_model()
+    post_save.connect(_user_changed, sender=User, dispatch_uid="layout:user:save")
+    post_delete.connect(_user_changed, sender=User, dispatch_uid="layout:user:delete")
+    m2m_changed.connect(_user_m2m_changed, sender=User.groups.through, dispatch_uid="layout:user:groups")
+    m2m_changed.connect(
+        _user_m2m_changed, sender=User.user_permissions.through, dispatch_uid="layout:user:perms"
+    )
+    m2m_changed.connect(_groups_changed, sender=Group.permissions.through, dispatch_uid="layout:group:perms")
+    post_delete.connect(_groups_changed, sender=Group, dispatch_uid="layout:group:delete")
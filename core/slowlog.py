@@ -0,0 +1,194 @@
+# core/slowlog.py
+# Registro de consultas lentas. Un execute wrapper (en todas las conexiones,
+# como core/timing.py) mide cada consulta; las que pasan de SLOW_QUERY_MS se
+# registran en el log con su huella normalizada, la vista y la línea del
+# proyecto que la lanzó, y la primera vez que aparece una huella se captura
+# su plan (EXPLAIN QUERY PLAN en SQLite, EXPLAIN en PostgreSQL).
+#
+# Las capturas se acumulan en memoria y SlowQueryLogMiddleware las guarda en
+# core.SlowQuery al terminar el request: escribir en medio de la transacción
+# de la vista podría bloquearla o perderse con un rollback.
+import hashlib
+import logging
+import os
+import re
+import time
+import traceback
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_TABLE = "core_slowquery"
+
+_suppressed = ContextVar("slowlog_suppressed", default=False)
+_current_request = ContextVar("slowlog_request", default=None)
+
+_pending = deque(maxlen=1000)
+_explained = set()  # huellas con plan ya capturado en este proceso
+_lock = Lock()
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+# marcos que no son "el que llamó": este módulo, los ganchos y los middleware
+# de core. Si no queda ninguno, la lanzó Django (sesión, autenticación) o una
+# plantilla al evaluar un queryset perezoso.
+_SKIP_FILES = {
+    __file__,
+    os.path.join(os.path.dirname(__file__), "timing.py"),
+    os.path.join(os.path.dirname(__file__), "middleware.py"),
+    os.path.join(os.path.dirname(__file__), "nplusone.py"),
+    os.path.join(os.path.dirname(__file__), "profiler.py"),
+}
+
+
+def normalize(sql):
+    """SQL sin literales ni listas de parámetros: misma forma, misma huella."""
+    sql = sql.replace("%s", "?")
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def is_full_scan(plan):
+    """True si el plan recorre una tabla completa (SCAN sin índice / Seq Scan)."""
+    for line in (plan or "").splitlines():
+        line = line.strip()
+        if "Seq Scan" in line:
+            return True
+        if line.startswith("SCAN ") and "USING" not in line and "(" not in line and "CONSTANT ROW" not in line:
+            return True
+    return False
+
+
+def project_stack():
+    """Marcos del proyecto (sin dependencias) de más externo a más interno."""
+    base = str(settings.BASE_DIR)
+    frames = [
+        f for f in traceback.extract_stack()
+        if f.filename.startswith(base)
+        and "site-packages" not in f.filename
+        and f.filename not in _SKIP_FILES
+    ]
+    return [f"{os.path.relpath(f.filename, base)}:{f.lineno} en {f.name}" for f in frames[-8:]]
+
+
+def _explain(connection, sql, params):
+    token = _suppressed.set(True)
+    # en PostgreSQL un error dentro de la transacción de la vista la
+    # invalidaría: aislarlo con un savepoint
+    guard = transaction.atomic(using=connection.alias) if connection.in_atomic_block else nullcontext()
+    try:
+        with guard, connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        logger.warning(f"[SLOWLOG] EXPLAIN falló: {e}")
+        return ""
+    finally:
+        _suppressed.reset(token)
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def _slow_query_wrapper(execute, sql, params, many, context):
+    if _suppressed.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed = (time.perf_counter() - started) * 1000
+    if elapsed >= getattr(settings, "SLOW_QUERY_MS", 100) and SLOW_QUERY_TABLE not in sql:
+        _capture(sql, params, many, elapsed, context["connection"])
+    return result
+
+
+def _capture(sql, params, many, elapsed, connection):
+    normalized = normalize(sql)
+    key = fingerprint(normalized)
+
+    plan = None
+    if not many and key not in _explained and _EXPLAINABLE.match(sql):
+        _explained.add(key)
+        plan = _explain(connection, sql, params)
+
+    request = _current_request.get()
+    match = getattr(request, "resolver_match", None)
+    view = match.view_name if match else ""
+    stack = project_stack()
+    call_site = stack[-1] if stack else "(Django / plantilla)"
+
+    logger.warning(f"[SLOWLOG] {elapsed:.1f} ms {view or '-'} {call_site}: {normalized[:200]}")
+    with _lock:
+        _pending.append({
+            "fingerprint": key,
+            "sql": normalized,
+            "database": connection.alias,
+            "duration_ms": elapsed,
+            "view": view,
+            "call_site": call_site,
+            "stack": "\n".join(stack),
+            "plan": plan,
+            "seen_at": timezone.now(),
+        })
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    if _slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_slow_query_wrapper)
+
+
+def install():
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_on_connection_created, dispatch_uid="slow_query_log")
+    for connection in connections.all(initialized_only=True):
+        _on_connection_created(None, connection)
+
+
+def flush():
+    """Guarda las capturas pendientes en core.SlowQuery y recorta la tabla."""
+    with _lock:
+        entries = list(_pending)
+        _pending.clear()
+    if not entries:
+        return
+
+    from .models import SlowQuery
+
+    token = _suppressed.set(True)
+    try:
+        # cada captura por separado: un error no descarta las siguientes
+        for entry in entries:
+            try:
+                SlowQuery.record(**entry)
+            except DatabaseError as e:
+                logger.warning(f"[SLOWLOG] No se pudo guardar {entry['fingerprint'][:8]}: {e}")
+        SlowQuery.prune(getattr(settings, "SLOW_QUERY_LOG_MAX_ROWS", 500))
+    except DatabaseError as e:
+        logger.warning(f"[SLOWLOG] No se pudo recortar el registro: {e}")
+    finally:
+        _suppressed.reset(token)
+
+
+def request_started(request):
+    return _current_request.set(request)
+
+
+def request_finished(token):
+    _current_request.reset(token)
+    flush()
@@ -0,0 +1,181 @@
+# core/static_audit.py
+# Inventario de estáticos: qué archivos referencian realmente las plantillas,
+# los CSS/JS que se sirven y el código Python, y recompresión de las imágenes
+# usadas en STATICFILES_DIRS (antes de collectstatic, para que el hash de su
+# nombre corresponda al contenido servido).
+import json
+import logging
+import posixpath
+import re
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.finders import FileSystemFinder
+
+logger = logging.getLogger(__name__)
+
+RASTER = {".png", ".jpg", ".jpeg"}
+ASSET_EXTENSIONS = "png|jpe?g|gif|svg|webp|avif|ico|woff2?|ttf|eot|otf|css|js|json|mp3|mp4"
+
+# {% static 'x' %}, url(x) y cualquier literal que parezca un estático
+_STATIC_TAG = re.compile(r"""{%\s*static\s+['"]([^'"]+)['"]""")
+_CSS_URL = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+_LITERAL = re.compile(r"""['"(]([^'"()\s]+\.(?:%s))(?:[?#][^'"()\s]*)?['")]""" % ASSET_EXTENSIONS, re.I)
+
+
+def unused_file():
+    return Path(getattr(settings, "STATIC_UNUSED_FILE", settings.BASE_DIR / "var" / "static-unused.json"))
+
+
+def project_static_files():
+    """{ruta relativa: Path} de los estáticos propios (STATICFILES_DIRS)."""
+    files = {}
+    for path, storage in FileSystemFinder().list([]):
+        files[path.replace("\\", "/")] = Path(storage.path(path))
+    return files
+
+
+def _normalize(ref, base_dir, known):
+    """Ruta estática que corresponde a una referencia, o None si no es nuestra."""
+    ref = re.split(r"[?#]", ref, maxsplit=1)[0]
+    if ref.startswith(("data:", "http:", "https:", "//")):
+        return None
+    static_url = settings.STATIC_URL.lstrip("/")
+    ref = ref.lstrip("/")
+    if ref.startswith(static_url):
+        ref = ref[len(static_url):]
+    candidates = [ref, posixpath.normpath(posixpath.join(base_dir, ref))]
+    if "assets/" in ref:
+        candidates.append(ref[ref.index("assets/"):])
+    for candidate in candidates:
+        if candidate in known:
+            return candidate
+    return None
+
+
+def _template_dirs():
+    dirs = []
+    for engine in settings.TEMPLATES:
+        dirs.extend(Path(d) for d in engine.get("DIRS", []))
+    for app in apps.get_app_configs():
+        path = Path(app.path)
+        if path.is_relative_to(settings.BASE_DIR):
+            dirs.append(path / "templates")
+    return [d for d in dirs if d.is_dir()]
+
+
+def _python_files():
+    # Los comandos de gestión no sirven páginas (build_assets cita rutas solo
+    # como referencia para su informe).
+    for app in apps.get_app_configs():
+        path = Path(app.path)
+        if path.is_relative_to(settings.BASE_DIR):
+            yield from (
+                p for p in path.rglob("*.py")
+                if "migrations" not in p.parts and "management" not in p.parts
+            )
+
+
+def find_references():
+    """
+    Conjunto de estáticos referenciados. Parte de plantillas y código
+    Python y sigue los CSS/JS alcanzados (sus url() y literales) hasta
+    cerrar el grafo; las fuentes de los bundles cuentan como alcanzadas.
+    """
+    known = project_static_files()
+    referenced = set()
+    pending = []
+
+    def add(ref, base_dir=""):
+        name = _normalize(ref, base_dir, known)
+        if name and name not in referenced:
+            referenced.add(name)
+            if name.endswith((".css", ".js")):
+                pending.append(name)
+
+    for directory in _template_dirs():
+        for template in directory.rglob("*.html"):
+            text = template.read_text(encoding="utf-8", errors="ignore")
+            for ref in _STATIC_TAG.findall(text) + _LITERAL.findall(text):
+                add(ref)
+    for source in _python_files():
+        for ref in _LITERAL.findall(source.read_text(encoding="utf-8", errors="ignore")):
+            add(ref)
+    for kinds in getattr(settings, "ASSET_BUNDLES", {}).values():
+        for sources in kinds.values():
+            for ref in sources:
+                add(ref)
+
+    while pending:
+        name = pending.pop()
+        text = known[name].read_text(encoding="utf-8", errors="ignore")
+        base_dir = posixpath.dirname(name)
+        refs = _CSS_URL.findall(text) if name.endswith(".css") else []
+        for ref in refs + _LITERAL.findall(text):
+            add(ref, base_dir)
+    return referenced
+
+
+def audit():
+    """Devuelve (referenciados, no referenciados) como {ruta: bytes}."""
+    known = project_static_files()
+    referenced = find_references()
+    used, unused = {}, {}
+    for name, path in known.items():
+        (used if name in referenced else unused)[name] = path.stat().st_size
+    return used, unused
+
+
+def write_unused(unused):
+    path = unused_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(sorted(unused), indent=1))
+    tmp.replace(path)
+    return path
+
+
+def load_unused():
+    try:
+        return set(json.loads(unused_file().read_text()))
+    except (OSError, ValueError):
+        return set()
+
+
+# =====================================================
+# 🔹 OPTIMIZACIÓN DE IMÁGENES (se ejecuta en procesos hijos)
+# =====================================================
+# Por debajo de este ahorro no se reescribe: recomprimir un JPEG ya
+# optimizado solo acumula pérdida.
+MIN_SAVING = 0.05
+
+
+def optimize_image(path, quality=85):
+    """
+    Recomprime `path` en su mismo formato y lo reemplaza si queda al menos
+    un MIN_SAVING más chico. No genera WebP/AVIF: salvo el logo de respaldo,
+    las imágenes usadas son fondos de CSS y el favicon, que no admiten
+    <picture>, y ningún servidor negocia por `Accept`.
+    Devuelve {"original": bytes antes, "optimized": bytes después}.
+    """
+    from io import BytesIO
+
+    from PIL import Image
+
+    path = Path(path)
+    data = path.read_bytes()
+    result = {"original": len(data), "optimized": len(data)}
+    with Image.open(BytesIO(data)) as img:
+        img.load()
+        buf = BytesIO()
+        if path.suffix.lower() == ".png":
+            img.save(buf, "PNG", optimize=True)
+        else:
+            img.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    if buf.tell() <= len(data) * (1 - MIN_SAVING):
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(buf.getvalue())
+        tmp.replace(path)
+        result["optimized"] = buf.tell()
+    return result
@@ -0,0 +1,45 @@
+# core/storage.py
+# Storage de estáticos para producción: nombres con hash (ManifestStaticFilesStorage)
+# y variantes .br/.gz precomprimidas al hacer collectstatic.
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .assets import COMPRESSIBLE, precompress
+
+logger = logging.getLogger(__name__)
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Solo url() e @import de CSS: las librerías del template apuntan a
+    # sourcemaps (//# sourceMappingURL) que no se distribuyen.
+    patterns = (
+        ("*.css", (
+            r"""(?P<matched>url\(['"]{0,1}\s*(?P<url>.*?)["']{0,1}\))""",
+            (
+                r"""(?P<matched>@import\s*["']\s*(?P<url>.*?)["'])""",
+                """@import url("%(url)s")""",
+            ),
+        )),
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        pending = []
+        for hashed_name in set(self.hashed_files.values()):
+            path = self.path(hashed_name)
+            # mismo hash → mismo contenido: las variantes de un deploy anterior sirven
+            if os.path.splitext(hashed_name)[1].lower() in COMPRESSIBLE and not os.path.exists(f"{path}.gz"):
+                pending.append(path)
+        if not pending:
+            return
+
+        # brotli 11 y zopfli son lentos (segundos por MB): un proceso por núcleo
+        with ProcessPoolExecutor() as pool:
+            count = sum(1 for sizes in pool.map(precompress, pending, chunksize=4) if sizes)
+        logger.info(f"[ASSETS] {count} estáticos precomprimidos (.br/.gz)")
@@ -0,0 +1,20 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from core.assets import bundle_urls
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(name, kind):
+    """
+    Incluye un bundle de core/assets.py: {% bundle "core" "css" %}.
+    Con build emite un único archivo; sin él, las fuentes una por una.
+    """
+    urls = [(url,) for url in bundle_urls(name, kind)]
+    if kind == "css":
+        return format_html_join("\n", '<link rel="stylesheet" href="{}">', urls)
+    if kind == "js":
+        return format_html_join("\n", '<script src="{}"></script>', urls)
+    return format_html("")
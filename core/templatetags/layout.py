@@ -0,0 +1,61 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from core.fragments import LayoutCache
+
+register = template.Library()
+
+SCOPES = ("user", "theme")
+
+
+class LayoutCacheNode(template.Node):
+    def __init__(self, nodelist, name, scope, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.scope = scope
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = getattr(settings, "LAYOUT_CACHE_TTL", 600)
+        request = context.get("request")
+        if timeout <= 0 or request is None:
+            return self.nodelist.render(context)
+
+        layout = LayoutCache.for_request(request)
+        vary_on = [layout.key(self.scope), *(var.resolve(context) for var in self.vary_on)]
+        key = make_template_fragment_key(f"layout:{self.name}", vary_on)
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, timeout)
+        return value
+
+
+@register.tag
+def layoutcache(parser, token):
+    """
+    Cachea un fragmento del layout por usuario (id, versión, permisos) y
+    versión del tema, más las variables extra indicadas:
+
+        {% layoutcache "sidebar" request.resolver_match.view_name %}...{% endlayoutcache %}
+        {% layoutcache "footer" scope="theme" %}...{% endlayoutcache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' requiere un nombre de fragmento.")
+    name = bits[1].strip("\"'")
+    scope = "user"
+    vary_on = []
+    for bit in bits[2:]:
+        if bit.startswith("scope="):
+            scope = bit.split("=", 1)[1].strip("\"'")
+            if scope not in SCOPES:
+                raise template.TemplateSyntaxError(f"scope debe ser uno de {SCOPES}.")
+        else:
+            vary_on.append(parser.compile_filter(bit))
+
+    nodelist = parser.parse(("endlayoutcache",))
+    parser.delete_first_token()
+    return LayoutCacheNode(nodelist, name, scope, vary_on)
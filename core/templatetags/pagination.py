@@ -0,0 +1,14 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def page_window(page_obj, around=2):
+    """
+    Números de página alrededor de la actual: {% for num in page_obj|page_window %}.
+    No recorre page_range, que con miles de páginas crece con la tabla.
+    """
+    first = max(1, page_obj.number - around)
+    last = min(page_obj.paginator.num_pages, page_obj.number + around)
+    return range(first, last + 1)
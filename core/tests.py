@@ -0,0 +1,246 @@
+import random
+import tempfile
+import time
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.core.paginator import Paginator
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from cash.models import CashMovement
+from inventory.models import InventoryItem, Unit
+from orders.models import Order
+from reports.cache import CHANGED_KEY, TRACKED_MODELS, bump_table_version
+
+from . import nplusone, slowlog
+from .metrics import compute_gauges
+from .checks import check_shared_cache
+from .finders import PrunedFileSystemFinder
+from .models import SlowQuery
+from .query_budgets import QUERY_BUDGETS, collect_urls
+from .routers import ReplicaRouter, replica_reads, request_state
+from .static_audit import find_references, project_static_files, write_unused
+from .templatetags.pagination import page_window
+
+
+@override_settings(TABLE_VERSIONS_SHARED=True)
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user("listados", password="x")
+        self.client.force_login(user)
+        self.url = reverse("orders:list")
+
+    def test_etag_follows_table_versions(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_table_version("orders.Order")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_parts(self):
+        etag = self.client.get(self.url)["ETag"]
+        # filtros, página parcial y otro usuario cambian el ETag
+        self.assertNotEqual(self.client.get(self.url, {"status": "listo"})["ETag"], etag)
+        self.assertNotEqual(self.client.get(self.url, HTTP_HX_REQUEST="true")["ETag"], etag)
+        other = get_user_model().objects.create_user("otro", password="x")
+        self.client.force_login(other)
+        self.assertNotEqual(self.client.get(self.url)["ETag"], etag)
+
+    @override_settings(TABLE_VERSIONS_SHARED=None)
+    def test_process_local_cache_skips_version_etags(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_table_version("orders.Order")
+        # queda el ETag del contenido (ConditionalGetMiddleware), no el de versiones
+        self.assertEqual(self.client.get(self.url)["ETag"], etag)
+        self.assertEqual([w.id for w in check_shared_cache(None)], ["core.W001"])
+
+
+class GaugeTests(TestCase):
+    def test_low_stock_includes_items_at_the_minimum(self):
+        unit = Unit.objects.create(name="Mililitro", abbreviation="ml")
+        for name, stock in (("Bajo", 5), ("Justo", 10), ("Sobrado", 11)):
+            InventoryItem.objects.create(name=name, unit=unit, current_stock=stock, min_stock=10)
+        self.assertEqual(compute_gauges()["low_stock_items"], 2)
+
+
+class PrunedFinderTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(STATIC_UNUSED_FILE=f"{tmp.name}/static-unused.json")
+        override.enable()
+        self.addCleanup(override.disable)
+        self.referenced = find_references()
+        self.unreferenced = sorted(set(project_static_files()) - self.referenced)
+
+    def _listed(self):
+        return {path.replace("\\", "/") for path, _ in PrunedFileSystemFinder().list([])}
+
+    def test_unused_files_are_not_listed(self):
+        write_unused(self.unreferenced[:1])
+        listed = self._listed()
+        self.assertNotIn(self.unreferenced[0], listed)
+        self.assertTrue(self.referenced <= listed)
+
+    def test_stale_list_fails_instead_of_pruning_a_referenced_file(self):
+        write_unused(self.unreferenced[:1] + sorted(self.referenced)[:1])
+        with self.assertRaisesMessage(ImproperlyConfigured, sorted(self.referenced)[0]):
+            self._listed()
+
+
+@override_settings(DEBUG=False)
+class CurrentDbWalkTests(SimpleTestCase):
+    def test_refused_without_debug_or_flag(self):
+        cache.set("core-tests:keep", 1)
+        for command in ("check_query_budgets", "check_memory_budgets"):
+            with self.subTest(command=command), self.assertRaisesMessage(CommandError, "--i-know"):
+                call_command(command, "--current-db", stdout=StringIO())
+        self.assertEqual(cache.get("core-tests:keep"), 1)
+
+
+class PageWindowTests(SimpleTestCase):
+    def test_window_is_clamped_to_the_page_range(self):
+        paginator = Paginator(range(1000), 10)
+        self.assertEqual(list(page_window(paginator.page(50))), [48, 49, 50, 51, 52])
+        self.assertEqual(list(page_window(paginator.page(1))), [1, 2, 3])
+        self.assertEqual(list(page_window(paginator.page(100), 1)), [99, 100])
+
+
+@mock.patch("core.routers.replica_alias", return_value="replica")
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        # ninguna escritura reciente
+        cache.set_many({CHANGED_KEY.format(label.lower()): time.time() - 60 for label in TRACKED_MODELS}, None)
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_replica_only_inside_block(self, _alias):
+        self.assertIsNone(self.router.db_for_read(Order))
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Order), "replica")
+            self.assertIsNone(self.router.db_for_read(get_user_model()))
+
+    def test_pinned_or_writing_request_reads_primary(self, _alias):
+        with request_state(pinned=True), replica_reads():
+            self.assertIsNone(self.router.db_for_read(Order))
+        with request_state(pinned=False) as state, replica_reads():
+            self.router.db_for_write(Order)
+            self.assertTrue(state["wrote"])
+            self.assertIsNone(self.router.db_for_read(Order))
+
+    def test_recent_write_by_anyone_reads_primary(self, _alias):
+        bump_table_version("orders.Order")  # fuera de una transacción: enseguida
+        with replica_reads(["orders.Order"]):
+            self.assertIsNone(self.router.db_for_read(Order))
+        # otra vista cuyas tablas no cambiaron sigue en la réplica
+        with replica_reads(["cash.CashMovement"]):
+            self.assertEqual(self.router.db_for_read(CashMovement), "replica")
+
+        with override_settings(READ_YOUR_WRITES_SECONDS=0):
+            with replica_reads(["orders.Order"]):
+                self.assertEqual(self.router.db_for_read(Order), "replica")
+
+
+def _slow_entry(fingerprint="a" * 40, duration_ms=150.0):
+    return {
+        "fingerprint": fingerprint, "sql": "SELECT ?", "database": "default", "duration_ms": duration_ms,
+        "view": "orders:list", "call_site": "orders/views.py:1 en get", "stack": "", "plan": "",
+        "seen_at": timezone.now(),
+    }
+
+
+class SlowLogTests(TestCase):
+    def test_normalize(self):
+        self.assertEqual(
+            slowlog.normalize("SELECT * FROM t WHERE a = 'x''y' AND b IN (1, 2, 3)  AND c > 4.5"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) AND c > ?",
+        )
+        self.assertEqual(
+            slowlog.normalize("SELECT %s FROM t_2 WHERE id = %s"),
+            slowlog.normalize("SELECT %s FROM t_2 WHERE id = 17"),
+        )
+
+    def test_record_adds_to_existing(self):
+        SlowQuery.record(**_slow_entry(duration_ms=100))
+        SlowQuery.record(**_slow_entry(duration_ms=300))
+        row = SlowQuery.objects.get()
+        self.assertEqual((row.calls, row.total_ms, row.max_ms, row.last_ms), (2, 400, 300, 300))
+
+    def test_record_race_on_create(self):
+        # otro proceso insertó la huella después de nuestro update (que no vio la fila)
+        SlowQuery.record(**_slow_entry(duration_ms=50))
+        update = QuerySet.update
+        calls = []
+
+        def racing_update(queryset, **kwargs):
+            calls.append(kwargs)
+            return 0 if len(calls) == 1 else update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, "update", racing_update):
+            SlowQuery.record(**_slow_entry(duration_ms=200))
+        row = SlowQuery.objects.get()
+        self.assertEqual((row.calls, row.total_ms, row.max_ms), (2, 250, 200))
+
+    def test_flush_keeps_going_after_an_error(self):
+        slowlog._pending.extend([_slow_entry("a" * 40), _slow_entry("b" * 40)])
+        record = SlowQuery.record
+        calls = iter([DatabaseError("bloqueada")])
+
+        def flaky(**entry):
+            error = next(calls, None)
+            if error:
+                raise error
+            return record(**entry)
+
+        with mock.patch.object(SlowQuery, "record", side_effect=flaky):
+            slowlog.flush()
+        self.assertEqual(list(SlowQuery.objects.values_list("fingerprint", flat=True)), ["b" * 40])
+
+
+@override_settings(READ_REPLICA_ALIAS=None, SLOW_QUERY_MS=float("inf"), NPLUSONE_DETECTION=False)
+class QueryBudgetTests(TestCase):
+    """
+    Recorre con GET todas las URL de core/urls.py y los changelists del
+    admin con la caché vacía: cada una debe hacer exactamente las consultas
+    de core/query_budgets.py y ningún SELECT repetido (N+1).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(0)
+        call_command(
+            "generate_dataset", customers=60, orders_per_day=8, days=21, seed=0,
+            until=date(2025, 6, 30), stdout=StringIO(),
+        )
+        cls.user = get_user_model().objects.create_superuser("budget-admin", "budget@example.com", None)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        nplusone.install()
+
+    def test_urls_within_budget(self):
+        self.client.raise_request_exception = False
+        self.client.force_login(self.user)
+        for name, url in collect_urls():
+            with self.subTest(url=name):
+                for alias in caches:
+                    caches[alias].clear()
+                self.assertIn(name, QUERY_BUDGETS, "sin presupuesto en core/query_budgets.py")
+                with self.assertNumQueries(QUERY_BUDGETS[name]), nplusone.assert_no_nplusone():
+                    response = self.client.get(url)
+                self.assertLess(response.status_code, 400)
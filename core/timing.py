@@ -0,0 +1,262 @@
+# core/timing.py
+# Instrumentación por request: tiempo total, consultas y tiempo de BD,
+# renderizado de plantillas y aciertos de caché. RequestTimingMiddleware abre
+# un RequestTiming en un ContextVar; los ganchos de abajo lo llenan si existe
+# (en los hilos de fanout también: copian el contexto). Los resultados van al
+# encabezado Server-Timing y a un histograma en memoria por nombre de URL,
+# visible para staff en /perf/requests/, y a contadores acumulados que
+# exporta /metrics (core/metrics.py).
+#
+# Todo es por proceso: con varios workers cada uno ve solo sus requests.
+import bisect
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from threading import Lock
+
+from django.conf import settings
+from django.utils import timezone
+
+_current = ContextVar("request_timing", default=None)
+_MISSING = object()
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = Lock()
+
+    def add_query(self, elapsed):
+        with self._lock:
+            self.queries += 1
+            self.db += elapsed
+
+    def add_cache(self, hits, misses):
+        with self._lock:
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        return ", ".join([
+            f"total;dur={self.total * 1000:.1f}",
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} consultas"',
+            f"tpl;dur={self.template * 1000:.1f}",
+            f'cache;desc="{self.cache_hits} aciertos, {self.cache_misses} fallos"',
+        ])
+
+
+def start_request():
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+# =====================================================
+# 🔹 GANCHOS (se instalan una vez, en CoreConfig.ready)
+# =====================================================
+def _query_wrapper(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(time.perf_counter() - started)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    # execute_wrappers vive en el DatabaseWrapper (uno por hilo y alias) y
+    # sobrevive a las reconexiones: agregarlo una sola vez
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+def _instrument_templates():
+    # django.test.signals.template_rendered solo existe con el runner de
+    # tests; se mide Template.render y se cuenta solo el nivel exterior
+    from django.template.base import Template
+
+    original = Template.render
+    if getattr(original, "_timed", False):
+        return
+
+    def render(self, context):
+        timing = _current.get()
+        if timing is None:
+            return original(self, context)
+        timing.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            timing.template_depth -= 1
+            if timing.template_depth == 0:
+                timing.template += time.perf_counter() - started
+
+    render._timed = True
+    Template.render = render
+
+
+def _instrument_cache(backend_class):
+    from django.core.cache.backends.base import BaseCache
+
+    if getattr(backend_class.get, "_timed", False):
+        return
+    original_get, original_get_many = backend_class.get, backend_class.get_many
+
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, _MISSING, version)
+        timing = _current.get()
+        if timing is not None:
+            timing.add_cache(value is not _MISSING, value is _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = original_get_many(self, keys, version)
+        timing = _current.get()
+        if timing is not None:
+            timing.add_cache(len(found), len(keys) - len(found))
+        return found
+
+    get._timed = get_many._timed = True
+    backend_class.get = get
+    # BaseCache.get_many llama a get(): envolverlo contaría dos veces
+    if original_get_many is not BaseCache.get_many:
+        backend_class.get_many = get_many
+
+
+def install():
+    from django.core.cache import caches
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_on_connection_created, dispatch_uid="request_timing")
+    for connection in connections.all(initialized_only=True):
+        _on_connection_created(None, connection)
+    _instrument_templates()
+    for alias in settings.CACHES:
+        _instrument_cache(type(caches[alias]))
+
+
+# =====================================================
+# 🔹 HISTOGRAMA POR NOMBRE DE URL
+# =====================================================
+# Límites (segundos) de los buckets acumulados que exporta /metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class TimingRegistry:
+    """
+    Últimas N muestras por URL y los K requests más lentos. Además, contadores
+    que solo crecen (buckets de latencia, consultas, caché) para /metrics:
+    reset() no los toca, Prometheus espera contadores monótonos.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._samples = defaultdict(self._new_deque)
+        self._worst = []  # heap mínimo de (total, seq, detalle)
+        self._seq = itertools.count()
+        self._totals = defaultdict(self._new_totals)
+        self._cache = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _new_deque():
+        return deque(maxlen=getattr(settings, "REQUEST_TIMING_SAMPLES", 500))
+
+    @staticmethod
+    def _new_totals():
+        # buckets no acumulados (+Inf al final); se acumulan al exportar
+        return {"buckets": [0] * (len(LATENCY_BUCKETS) + 1), "count": 0, "sum": 0.0, "queries": 0, "db": 0.0}
+
+    def record(self, name, path, status, timing):
+        total = timing.total
+        sample = (total, timing.db, timing.queries, timing.template)
+        detail = {
+            "name": name,
+            "path": path,
+            "status": status,
+            "total": total * 1000,
+            "db": timing.db * 1000,
+            "queries": timing.queries,
+            "template": timing.template * 1000,
+            "at": timezone.now(),
+        }
+        keep = getattr(settings, "REQUEST_TIMING_WORST", 20)
+        with self._lock:
+            self._samples[name].append(sample)
+            totals = self._totals[name]
+            totals["buckets"][bisect.bisect_left(LATENCY_BUCKETS, total)] += 1
+            totals["count"] += 1
+            totals["sum"] += total
+            totals["queries"] += timing.queries
+            totals["db"] += timing.db
+            self._cache["hits"] += timing.cache_hits
+            self._cache["misses"] += timing.cache_misses
+            entry = (total, next(self._seq), detail)
+            if len(self._worst) < keep:
+                heapq.heappush(self._worst, entry)
+            elif total > self._worst[0][0]:
+                heapq.heapreplace(self._worst, entry)
+
+    def summary(self):
+        """Filas por URL con p50/p95/p99 (ms), ordenadas por p95."""
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+            worst = sorted(self._worst, reverse=True)
+
+        rows = []
+        for name, samples in snapshot.items():
+            totals = sorted(s[0] for s in samples)
+            rows.append({
+                "name": name,
+                "count": len(samples),
+                "p50": _percentile(totals, 50) * 1000,
+                "p95": _percentile(totals, 95) * 1000,
+                "p99": _percentile(totals, 99) * 1000,
+                "db": sum(s[1] for s in samples) / len(samples) * 1000,
+                "queries": sum(s[2] for s in samples) / len(samples),
+                "template": sum(s[3] for s in samples) / len(samples) * 1000,
+            })
+        rows.sort(key=lambda r: r["p95"], reverse=True)
+        return rows, [entry[2] for entry in worst]
+
+    def counters(self):
+        """Copia de los contadores acumulados: ({url: totales}, {hits, misses})."""
+        with self._lock:
+            totals = {name: {**t, "buckets": list(t["buckets"])} for name, t in self._totals.items()}
+            return totals, dict(self._cache)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._worst.clear()
+
+
+def _percentile(values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[index]
+
+
+registry = TimingRegistry()
@@ -1,10 +1,13 @@
 # core/urls.py
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.shortcuts import redirect
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.assets import serve_bundle
+from core.views import metrics_view, request_profile_view, request_profiles_view, request_timings_view
+
 # Redirección raíz inteligente
 def root_router(request):
     if request.user.is_authenticated:
@@ -39,8 +42,21 @@ urlpatterns = [
     # 🔹 Reportes
     path("reports/", include(("reports.urls", "reports"), namespace="reports")),
 
+    # 🔹 Tiempos por request (solo staff)
+    path("perf/requests/", request_timings_view, name="request_timings"),
+
+    # 🔹 Perfiles a pedido con ?_profile=1 (solo staff)
+    path("perf/profiles/", request_profiles_view, name="request_profiles"),
+    path("perf/profiles/<str:profile_id>/", request_profile_view, name="request_profile"),
+
+    # 🔹 Métricas para Prometheus (METRICS_TOKEN o staff)
+    path("metrics", metrics_view, name="metrics"),
+
     # 🔹 Django Admin
     path("admin/", admin.site.urls),
+
+    # 🔹 Bundles de CSS/JS (core/assets.py)
+    re_path(r"^%s(?P<path>.+)$" % settings.ASSET_BUNDLES_URL.lstrip("/"), serve_bundle),
 ]
 
 if settings.DEBUG:
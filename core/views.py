@@ -0,0 +1,93 @@
+# core/views.py
+import secrets
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET, require_http_methods
+
+from . import metrics, profiler
+from .timing import registry
+
+
+@staff_member_required
+@require_http_methods(["GET", "POST"])
+def request_timings_view(request):
+    """p50/p95/p99 por nombre de URL y los requests más lentos de este proceso."""
+    if request.method == "POST":
+        registry.reset()
+        messages.success(request, "Histograma de tiempos reiniciado.")
+        return redirect("request_timings")
+
+    rows, worst = registry.summary()
+    return render(request, "core/request_timings.html", {
+        "rows": rows,
+        "worst": worst,
+        "samples_per_url": settings.REQUEST_TIMING_SAMPLES,
+    })
+
+
+@staff_member_required
+@require_http_methods(["GET", "POST"])
+def request_profiles_view(request):
+    """Perfiles guardados con ?_profile=1; POST los borra todos."""
+    if request.method == "POST":
+        profiler.prune(0)
+        messages.success(request, "Perfiles borrados.")
+        return redirect("request_profiles")
+
+    return render(request, "core/request_profiles.html", {
+        **admin.site.each_context(request),
+        "title": "Perfiles de requests",
+        "profiles": profiler.list_profiles(),
+        "param": profiler.PROFILE_PARAM,
+        "max_files": settings.PROFILE_MAX_FILES,
+    })
+
+
+@staff_member_required
+def request_profile_view(request, profile_id):
+    """Funciones por tiempo acumulado o propio y las consultas del request."""
+    loaded = profiler.load(profile_id)
+    if loaded is None:
+        raise Http404("Perfil inexistente")
+    meta, stats = loaded
+    if "download" in request.GET:
+        path = profiler.profile_dir() / f"{profile_id}.prof"
+        return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
+
+    sort = "tottime" if request.GET.get("sort") == "tottime" else "cumulative"
+    project_only = "project" in request.GET
+    rows, total_ms = profiler.stats_rows(stats, sort, project_only)
+    return render(request, "core/request_profile.html", {
+        **admin.site.each_context(request),
+        "title": f"Perfil {meta['method']} {meta['path']}",
+        "meta": meta,
+        "rows": rows,
+        "profiled_ms": total_ms,
+        "sort": sort,
+        "project_only": project_only,
+    })
+
+
+@never_cache
+@require_GET
+def metrics_view(request):
+    """
+    Métricas para Prometheus. Con METRICS_TOKEN el scraper envía
+    `Authorization: Bearer <token>`; sin token solo las ve staff.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    authorized = (
+        secrets.compare_digest(header, f"Bearer {token}") if token and header
+        else request.user.is_staff
+    )
+    if not authorized:
+        response = HttpResponse("No autorizado.\n", status=401, content_type="text/plain; charset=utf-8")
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+    return HttpResponse(metrics.render_metrics(), content_type=metrics.CONTENT_TYPE)
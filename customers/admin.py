@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Customer
+from reports.cache import bump_table_version
 
 @admin.register(Customer)
 class CustomerAdmin(admin.ModelAdmin):
@@ -10,5 +11,6 @@ class CustomerAdmin(admin.ModelAdmin):
 
     def desactivar_clientes(self, request, queryset):
         count = queryset.update(is_active=False)
+        bump_table_version(Customer._meta.label)  # update() no dispara post_save
         self.message_user(request, f"{count} clientes desactivados correctamente.")
     desactivar_clientes.short_description = "Desactivar clientes seleccionados"
@@ -1,3 +1,20 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Customer
+from .views import CustomerListView
+
+
+class CustomerCreateInvalidTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("recepcion", password="x")
+        self.client.force_login(user)
+        Customer.objects.bulk_create(Customer(name=f"Cliente {n:02d}") for n in range(15))
+
+    def test_invalid_form_renders_the_paginated_list(self):
+        response = self.client.post(reverse("customers:add"), {"name": ""})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].errors)
+        self.assertEqual(len(response.context["customers"]), CustomerListView.paginate_by)
+        self.assertEqual(response.context["page_obj"].paginator.count, 15)
@@ -8,14 +8,19 @@ from django.http import JsonResponse
 from django.template.loader import render_to_string
 from django.db.models import Q  # 👈 para búsqueda
 
+from core.conditional import ConditionalViewMixin
+from core.partials import PartialListMixin
+
 from .models import Customer
 from .forms import CustomerForm
 
 
-class CustomerListView(LoginRequiredMixin, ListView):
+class CustomerListView(LoginRequiredMixin, ConditionalViewMixin, PartialListMixin, ListView):
     """Listado principal de clientes activos, con búsqueda y paginación."""
     model = Customer
     template_name = "customers/list.html"
+    partial_template_name = "customers/_results.html"  # 👈 búsqueda/paginación vía XHR
+    conditional_tables = ("customers.Customer",)  # 👈 304 si no hubo cambios
     context_object_name = "customers"
     paginate_by = 10  # 👈 activa la paginación
 
@@ -55,12 +60,11 @@ class CustomerCreateView(LoginRequiredMixin, CreateView):
     def form_invalid(self, form):
         """Si hay errores, renderiza el listado con el form con errores."""
         messages.error(self.request, "Corrige los errores antes de continuar.")
-        customers = Customer.objects.filter(is_active=True).order_by("name")
-        return render(
-            self.request,
-            "customers/list.html",
-            {"customers": customers, "form": form},
-        )
+        # misma página (paginada) que el listado, no todos los clientes
+        listing = CustomerListView()
+        listing.setup(self.request)
+        listing.object_list = listing.get_queryset()
+        return render(self.request, "customers/list.html", listing.get_context_data(form=form))
 
 
 class CustomerEditPartialView(LoginRequiredMixin, UpdateView):
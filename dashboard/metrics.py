@@ -0,0 +1,149 @@
+# dashboard/metrics.py
+# Métricas del dashboard: todos los indicadores en una consulta de
+# agregación condicional (con subconsultas escalares para caja y clientes),
+# más las dos listas, y una micro-caché de unos segundos con protección
+# contra estampida.
+import datetime
+import logging
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Subquery, Sum, Value
+from django.utils import timezone
+
+from cash.models import CashMovement, CashRegister
+from core.fanout import fanout
+from customers.models import Customer
+from inventory.models import InventoryItem
+from orders.models import Order
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "dashboard:metrics"
+STALE_KEY = "dashboard:metrics:stale"
+LOCK_KEY = "dashboard:metrics:lock"
+
+CHART_STATUSES = ("pendiente", "en_proceso", "listo", "entregado")
+
+
+class _Scalar(Subquery):
+    """
+    Subconsulta escalar aceptada dentro de aggregate(). No depende de las
+    filas agregadas: SELECT COUNT(...) FILTER (...), (SELECT SUM(...)) FROM ...
+    devuelve una fila aunque la tabla base esté vacía.
+    """
+    contains_aggregate = True
+
+
+def _scalar(queryset, **aggregate):
+    """Un único agregado de otra tabla como subconsulta: _scalar(qs, total=Sum("amount"))."""
+    (name, expression), = aggregate.items()
+    # agrupar por una constante = sin GROUP BY: siempre una fila
+    return _Scalar(
+        queryset.order_by().annotate(_all=Value(1)).values("_all").annotate(**{name: expression}).values(name)[:1]
+    )
+
+
+def compute_metrics():
+    """Calcula todas las métricas del dashboard (sin caché): tres consultas."""
+    today = timezone.now().date()
+    week_start = today - datetime.timedelta(days=7)
+    in_week = Q(date_created__date__gte=week_start)
+
+    data = fanout({
+        # 🔹 Una sola consulta para todos los indicadores
+        "counts": lambda: Order.objects.aggregate(
+            orders_today=Count("id", filter=Q(date_created__date=today)),
+            in_process=Count("id", filter=Q(status="en_proceso")),
+            delivered_today=Count("id", filter=Q(status="entregado", date_created__date=today)),
+            **{
+                f"week_{status}": Count("id", filter=in_week & Q(status=status))
+                for status in CHART_STATUSES
+            },
+            cash_in=_scalar(
+                CashMovement.objects.filter(movement_type="ingreso", created_at__date=today),
+                total=Sum("amount"),
+            ),
+            total_customers=_scalar(Customer.objects.filter(is_active=True), total=Count("id")),
+            # la caja abierta más antigua, como CashRegister.objects.filter(is_open=True).last()
+            cash_balance=_Scalar(
+                CashRegister.objects.filter(is_open=True).order_by("opened_at").values("opening_balance")[:1]
+            ),
+        ),
+        # 🔹 Las dos listas: filas de otras tablas, no caben en la fila agregada
+        "recent_orders": lambda: list(
+            Order.objects.select_related("customer").order_by("-date_created")[:5]
+        ),
+        "low_stock_items": lambda: list(
+            InventoryItem.objects.filter(is_active=True).order_by("current_stock")[:5]
+        ),
+    })
+    counts = data["counts"]
+
+    low_stock_alerts = [
+        {
+            "name": item.name,
+            "stock": item.current_stock,
+            "min": item.min_stock,
+            "status": (
+                "danger"
+                if item.current_stock <= item.min_stock
+                else "warning"
+                if item.current_stock <= item.min_stock * Decimal("1.25")
+                else "normal"
+            ),
+        }
+        for item in data["low_stock_items"]
+    ]
+
+    return {
+        "orders_today": counts["orders_today"],
+        "in_process": counts["in_process"],
+        "delivered_today": counts["delivered_today"],
+        "cash_in": counts["cash_in"] or Decimal("0.00"),
+        "recent_orders": data["recent_orders"],
+        "low_stock_alerts": low_stock_alerts,
+        "chart_data": {status: counts[f"week_{status}"] for status in CHART_STATUSES},
+        "total_customers": counts["total_customers"] or 0,
+        "cash_balance": counts["cash_balance"] or Decimal("0.00"),
+    }
+
+
+def get_metrics():
+    """
+    Devuelve las métricas cacheadas por DASHBOARD_METRICS_TTL segundos.
+
+    Solo un worker recalcula a la vez (candado con cache.add); los demás
+    sirven la última copia conocida o esperan brevemente a que aparezca.
+    """
+    ttl = getattr(settings, "DASHBOARD_METRICS_TTL", 5)
+    if ttl <= 0:
+        return compute_metrics()
+
+    data = cache.get(CACHE_KEY)
+    if data is not None:
+        return data
+
+    if cache.add(LOCK_KEY, 1, timeout=30):
+        try:
+            data = compute_metrics()
+            cache.set(CACHE_KEY, data, ttl)
+            cache.set(STALE_KEY, data, ttl * 60)
+        finally:
+            cache.delete(LOCK_KEY)
+        logger.debug("[DASHBOARD] Métricas recalculadas")
+        return data
+
+    stale = cache.get(STALE_KEY)
+    if stale is not None:
+        return stale
+
+    # Arranque en frío: otro worker está calculando; se espera un poco.
+    for _ in range(20):
+        time.sleep(0.05)
+        data = cache.get(CACHE_KEY)
+        if data is not None:
+            return data
+    return compute_metrics()
@@ -1,3 +1,79 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from cash.models import CashRegister
+from customers.models import Customer
+from orders.models import Order
+
+from .timeseries import MAX_SPAN_DAYS, build_series
+
+
+class BuildSeriesTests(TestCase):
+    def test_zero_fill_and_merge(self):
+        customer = Customer.objects.create(name="Cliente")
+        start = datetime.date(2025, 1, 1)
+        for offset, amount in ((0, "10"), (1, "5"), (5, "7")):
+            day = start + datetime.timedelta(days=offset)
+            at = timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+            Order.objects.create(customer=customer, date_created=at, final_amount=Decimal(amount))
+
+        daily = build_series(start, start + datetime.timedelta(days=9), granularity="day")
+        self.assertEqual(daily["step"], 1)
+        self.assertEqual(daily["orders"], [1, 1, 0, 0, 0, 1, 0, 0, 0, 0])
+
+        merged = build_series(start, start + datetime.timedelta(days=9), granularity="day", points=3)
+        self.assertEqual(merged["step"], 4)
+        self.assertEqual(merged["t"], ["2025-01-01", "2025-01-05", "2025-01-09"])
+        self.assertEqual(merged["orders"], [2, 1, 0])
+        self.assertEqual(merged["sales"], [15.0, 7.0, 0.0])
+
+    def test_last_bucket_before_date_max(self):
+        data = build_series(datetime.date(9999, 12, 25), datetime.date(9999, 12, 31), granularity="week")
+        self.assertEqual(data["t"], ["9999-12-20", "9999-12-27"])
+
+
+class ChartDataViewTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("graficos", password="x")
+        self.client.force_login(user)
+
+    def test_extreme_dates(self):
+        url = reverse("dashboard:chart_data")
+        response = self.client.get(url, {"start": "9999-12-25", "end": "9999-12-31", "granularity": "week"})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url, {"start": "0001-01-01", "end": "2026-01-31", "granularity": "day"})
+        self.assertEqual(response.status_code, 200)
+        start = datetime.date.fromisoformat(response.json()["start"])
+        self.assertEqual((datetime.date(2026, 1, 31) - start).days + 1, MAX_SPAN_DAYS)
+
+
+class DashboardHomeQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user("tablero", password="x")
+        self.client.force_login(user)
+        customer = Customer.objects.create(name="Cliente")
+        for _ in range(3):
+            Order.objects.create(customer=customer)
+        CashRegister.objects.create(name="Caja 1", opened_by=user, opening_balance=Decimal("500.00"))
+
+    def test_query_count(self):
+        url = reverse("dashboard:home")
+        # sesión + usuario, las 3 consultas de compute_metrics, el tema y
+        # los permisos del menú (usuario y grupos)
+        with self.assertNumQueries(8):
+            response = self.client.get(url)
+        self.assertEqual(response.context["total_customers"], 1)
+        self.assertEqual(response.context["cash_balance"], Decimal("500.00"))
+        self.assertEqual(response.context["chart_data"]["pendiente"], 3)
 
-# Create your tests here.
+        # métricas, tema y fragmentos del layout ya en caché
+        with self.assertNumQueries(2):
+            self.client.get(url)
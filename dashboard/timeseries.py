@@ -0,0 +1,122 @@
+# dashboard/timeseries.py
+# Series temporales para los gráficos del dashboard: un GROUP BY por tabla,
+# agrupado por día/semana/mes, y reducido a un presupuesto fijo de puntos.
+import datetime
+import math
+from decimal import Decimal
+
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from cash.models import CashMovement
+from orders.models import Order
+
+GRANULARITIES = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+DEFAULT_POINTS = 120
+MAX_POINTS = 500
+# rango máximo de un gráfico: más atrás solo hay buckets vacíos que rellenar
+MAX_SPAN_DAYS = 5 * 366
+
+
+def bucket_start(day, granularity):
+    """Primer día del bucket que contiene `day`."""
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, granularity):
+    if granularity == "week":
+        return day + datetime.timedelta(days=7)
+    if granularity == "month":
+        return (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return day + datetime.timedelta(days=1)
+
+
+def clamp_range(start, end):
+    """Recorta `start` para que el rango no supere MAX_SPAN_DAYS."""
+    try:
+        earliest = end - datetime.timedelta(days=MAX_SPAN_DAYS - 1)
+    except OverflowError:  # `end` cerca de date.min
+        return start, end
+    return max(start, earliest), end
+
+
+def pick_granularity(start, end, points):
+    """Granularidad más fina cuyo número de buckets cabe en el presupuesto."""
+    days = (end - start).days + 1
+    if days <= points:
+        return "day"
+    if days / 7 <= points:
+        return "week"
+    return "month"
+
+
+def _grouped(queryset, field, granularity, **aggregates):
+    trunc = GRANULARITIES[granularity](field, output_field=DateField())
+    rows = queryset.annotate(bucket=trunc).values("bucket").annotate(**aggregates).order_by("bucket")
+    return {row["bucket"]: row for row in rows}
+
+
+def build_series(start, end, granularity=None, points=DEFAULT_POINTS):
+    """
+    Devuelve un dict columnar: {"t": [...], "sales": [...], "orders": [...], "cash_in": [...]}.
+
+    Los buckets sin datos se rellenan con cero. Si hay más buckets que
+    `points`, se fusionan buckets consecutivos (sumando) hasta caber.
+    """
+    points = max(1, min(points, MAX_POINTS))
+    granularity = granularity or pick_granularity(start, end, points)
+
+    orders = _grouped(
+        Order.objects.filter(date_created__date__gte=start, date_created__date__lte=end),
+        "date_created", granularity,
+        count=Count("id"), sales=Sum("final_amount"),
+    )
+    cash = _grouped(
+        CashMovement.objects.filter(
+            movement_type="ingreso", created_at__date__gte=start, created_at__date__lte=end
+        ),
+        "created_at", granularity,
+        cash_in=Sum("amount"),
+    )
+
+    t, sales, counts, cash_in = [], [], [], []
+    day = bucket_start(start, granularity)
+    while day <= end:
+        row = orders.get(day, {})
+        t.append(day)
+        sales.append(row.get("sales") or Decimal("0"))
+        counts.append(row.get("count") or 0)
+        cash_in.append(cash.get(day, {}).get("cash_in") or Decimal("0"))
+        try:
+            day = next_bucket(day, granularity)
+        except OverflowError:  # último bucket antes de date.max
+            break
+
+    factor = math.ceil(len(t) / points) if t else 1
+    if factor > 1:
+        t = t[::factor]
+        sales = _merge(sales, factor)
+        counts = _merge(counts, factor)
+        cash_in = _merge(cash_in, factor)
+
+    return {
+        "granularity": granularity,
+        "step": factor,
+        "t": [d.isoformat() for d in t],
+        "sales": [float(v) for v in sales],
+        "orders": counts,
+        "cash_in": [float(v) for v in cash_in],
+    }
+
+
+def _merge(values, factor):
+    return [sum(values[i:i + factor]) for i in range(0, len(values), factor)]
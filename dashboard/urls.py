@@ -1,9 +1,10 @@
 # dashboard/urls.py
 from django.urls import path
-from .views import home_view
+from .views import home_view, chart_data_view
 
 app_name = "dashboard"
 
 urlpatterns = [
     path("", home_view, name="home"),  # /dashboard/
+    path("chart-data/", chart_data_view, name="chart_data"),  # /dashboard/chart-data/
 ]
@@ -1,109 +1,77 @@
 import datetime
-from decimal import Decimal
+import hashlib
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from django.utils import timezone
-from django.db.models import Sum, Count, Q
-from orders.models import Order
-from inventory.models import InventoryItem
-from cash.models import CashMovement, CashRegister
-from customers.models import Customer
+from core.routers import use_replica
+from reports.cache import get_table_versions, versions_are_shared
+
+from .metrics import get_metrics
+from .timeseries import DEFAULT_POINTS, GRANULARITIES, build_series, clamp_range
 
 
 @login_required
+@use_replica
 def home_view(request):
     """Dashboard principal de Lavandería con métricas globales."""
-    today = timezone.now().date()
-    week_start = today - datetime.timedelta(days=7)
-
-    # =============================
-    # 🔹 MÉTRICAS DE ÓRDENES
-    # =============================
-    orders_today = Order.objects.filter(date_created__date=today).count()
-    in_process = Order.objects.filter(status="en_proceso").count()
-    delivered_today = Order.objects.filter(
-        status="entregado", date_created__date=today
-    ).count()
+    return render(request, "dashboard/home.html", get_metrics())
 
-    # 🔹 Ingresos del día (por órdenes entregadas)
-    cash_in = (
-        CashMovement.objects.filter(
-            movement_type="ingreso", created_at__date=today
-        ).aggregate(total=Sum("amount"))["total"]
-        or Decimal("0.00")
-    )
 
-    # =============================
-    # 🔹 ÓRDENES RECIENTES
-    # =============================
-    recent_orders = (
-        Order.objects.select_related("customer")
-        .order_by("-date_created")[:5]
-    )
+# =============================
+# 🔹 SERIES PARA GRÁFICOS (JSON)
+# =============================
+def _chart_params(request):
+    """Lee start/end/granularity/points del querystring con valores seguros."""
+    today = timezone.localdate()
+    try:
+        end = datetime.date.fromisoformat(request.GET.get("end", ""))
+    except ValueError:
+        end = today
+    try:
+        start = datetime.date.fromisoformat(request.GET.get("start", ""))
+    except ValueError:
+        start = end - datetime.timedelta(days=29)
+    if start > end:
+        start, end = end, start
+    start, end = clamp_range(start, end)
 
-    # =============================
-    # 🔹 ALERTA DE INVENTARIO
-    # =============================
-    low_stock_items = InventoryItem.objects.filter(is_active=True).order_by(
-        "current_stock"
-    )[:5]
-    low_stock_alerts = [
-        {
-            "name": item.name,
-            "stock": item.current_stock,
-            "min": item.min_stock,
-            "status": (
-                "danger"
-                if item.current_stock <= item.min_stock
-                else "warning"
-                if item.current_stock <= item.min_stock * Decimal("1.25")
-                else "normal"
-            ),
-        }
-        for item in low_stock_items
-    ]
+    granularity = request.GET.get("granularity")
+    if granularity not in GRANULARITIES:
+        granularity = None
+    try:
+        points = int(request.GET.get("points", DEFAULT_POINTS))
+    except ValueError:
+        points = DEFAULT_POINTS
+    return start, end, granularity, points
 
-    # =============================
-    # 🔹 ÓRDENES POR ESTADO (últimos 7 días)
-    # =============================
-    orders_week = (
-        Order.objects.filter(date_created__date__gte=week_start)
-        .values("status")
-        .annotate(count=Count("id"))
-    )
-    chart_data = {
-        "pendiente": 0,
-        "en_proceso": 0,
-        "listo": 0,
-        "entregado": 0,
-    }
-    for o in orders_week:
-        chart_data[o["status"]] = o["count"]
 
-    # =============================
-    # 🔹 CLIENTES Y CAJA
-    # =============================
-    total_customers = Customer.objects.filter(is_active=True).count()
-    active_register = CashRegister.objects.filter(is_open=True).last()
-    cash_balance = (
-        active_register.closing_balance
-        if active_register and not active_register.is_open
-        else (active_register.opening_balance if active_register else Decimal("0.00"))
-    )
+def _chart_etag(request):
+    """
+    ETag a partir de las versiones de tabla: no cambia si nadie escribió.
+    None (sin ETag de versiones) si la caché es por proceso.
+    """
+    if not versions_are_shared():
+        return None
+    versions = get_table_versions(["orders.Order", "cash.CashMovement"])
+    raw = "|".join([
+        request.GET.urlencode(),
+        str(timezone.localdate()),
+        ",".join(f"{label}={version}" for label, version in sorted(versions.items())),
+    ])
+    return hashlib.md5(raw.encode()).hexdigest()
 
-    # =============================
-    # 🔹 CONTEXTO FINAL
-    # =============================
-    context = {
-        "orders_today": orders_today,
-        "in_process": in_process,
-        "delivered_today": delivered_today,
-        "cash_in": cash_in,
-        "recent_orders": recent_orders,
-        "low_stock_alerts": low_stock_alerts,
-        "chart_data": chart_data,
-        "total_customers": total_customers,
-        "cash_balance": cash_balance,
-    }
 
-    return render(request, "dashboard/home.html", context)
+@require_GET
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_chart_etag)
+@use_replica
+def chart_data_view(request):
+    """Ventas, cantidad de órdenes e ingresos de caja agrupados por período."""
+    start, end, granularity, points = _chart_params(request)
+    data = build_series(start, end, granularity=granularity, points=points)
+    data.update({"start": start.isoformat(), "end": end.isoformat()})
+    return JsonResponse(data, json_dumps_params={"separators": (",", ":")})
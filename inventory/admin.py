@@ -70,6 +70,8 @@ class InventoryMovementAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
     list_per_page = 25
+    # __str__ de insumo y orden usan la unidad y el cliente
+    list_select_related = ("item__unit", "order__customer", "related_service", "user")
 
     fieldsets = (
         (
@@ -8,6 +8,9 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.template.loader import render_to_string
 
+from core.conditional import ConditionalViewMixin
+from core.partials import PartialListMixin
+
 from .models import InventoryItem, InventoryMovement
 from .forms import InventoryItemForm
 
@@ -17,16 +20,18 @@ logger = logging.getLogger(__name__)
 # ======================================
 # 🔹 LISTADO PRINCIPAL DE INSUMOS
 # ======================================
-class InventoryListView(LoginRequiredMixin, ListView):
+class InventoryListView(LoginRequiredMixin, ConditionalViewMixin, PartialListMixin, ListView):
     """Vista principal del inventario (insumos activos con estado visual)."""
     model = InventoryItem
     template_name = "inventory/list.html"
+    partial_template_name = "inventory/_results.html"
+    conditional_tables = ("inventory.InventoryItem", "inventory.Unit")
     context_object_name = "items"
     paginate_by = 10
 
     def get_queryset(self):
         q = self.request.GET.get("q", "").strip()
-        qs = InventoryItem.objects.filter(is_active=True)
+        qs = InventoryItem.objects.filter(is_active=True).select_related("unit")
         if q:
             qs = qs.filter(name__icontains=q)
         logger.debug(f"[INVENTORY] Listando insumos → búsqueda='{q}'")
@@ -74,9 +79,14 @@ class InventoryCreateView(LoginRequiredMixin, CreateView):
 
     def form_invalid(self, form):
         messages.error(self.request, "Corrige los errores antes de continuar.")
-        items = InventoryItem.objects.filter(is_active=True)
         logger.warning("[INVENTORY] Error al crear insumo.")
-        return render(self.request, "inventory/list.html", {"items": items, "form": form})
+        # misma página (paginada) que el listado, no todos los insumos
+        listing = InventoryListView()
+        listing.setup(self.request)
+        listing.object_list = listing.get_queryset()
+        ctx = listing.get_context_data()
+        ctx["form"] = form
+        return render(self.request, "inventory/list.html", ctx)
 
 
 # ======================================
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Order, OrderLine, OrderTracking
+from reports.cache import bump_table_version
 
 
 @admin.register(Order)
@@ -18,6 +19,7 @@ class OrderAdmin(admin.ModelAdmin):
     date_hierarchy = "date_created"
     ordering = ("-date_created",)
     list_editable = ("status", "is_paid")
+    list_select_related = ("customer",)
     readonly_fields = ("code", "date_created")
     autocomplete_fields = ("customer",)
     fieldsets = (
@@ -48,6 +50,10 @@ class OrderAdmin(admin.ModelAdmin):
 
     actions = ["marcar_en_proceso", "marcar_entregado", "cancelar_y_reponer"]
 
+    def get_queryset(self, request):
+        # service_summary recorre las líneas de cada orden
+        return super().get_queryset(request).prefetch_related("lines__service")
+
     @admin.action(description="Marcar como 'En proceso' y descontar inventario")
     def marcar_en_proceso(self, request, queryset):
         for order in queryset:
@@ -60,6 +66,7 @@ class OrderAdmin(admin.ModelAdmin):
     @admin.action(description="Marcar como 'Entregado'")
     def marcar_entregado(self, request, queryset):
         updated = queryset.update(status="entregado")
+        bump_table_version(Order._meta.label)  # update() no dispara post_save
         self.message_user(request, f"{updated} orden(es) marcadas como entregadas.")
 
     @admin.action(description="Cancelar orden y devolver insumos al inventario")
@@ -78,6 +85,7 @@ class OrderLineAdmin(admin.ModelAdmin):
     list_filter = ("service",)
     search_fields = ("order__code", "service__name")
     autocomplete_fields = ("order", "service")
+    list_select_related = ("order__customer", "service")
     ordering = ("-order__date_created",)
 
 
@@ -95,4 +103,5 @@ class OrderTrackingAdmin(admin.ModelAdmin):
     search_fields = ("order__code", "notes")
     date_hierarchy = "timestamp"
     autocomplete_fields = ("order", "changed_by")
+    list_select_related = ("order__customer", "changed_by")
     ordering = ("-timestamp",)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordertracking',
+            name='previous_duration',
+            field=models.DurationField(blank=True, null=True, verbose_name='Tiempo en estado anterior'),
+        ),
+        migrations.AddIndex(
+            model_name='ordertracking',
+            index=models.Index(fields=['order', 'timestamp'], name='orders_tracking_order_ts_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from datetime import timedelta
 from decimal import Decimal
+from django.conf import settings
 from django.db import models, transaction
 from django.utils import timezone
 from inventory.models import InventoryMovement  # 👈 integración directa con inventario
@@ -162,11 +164,37 @@ class OrderTracking(models.Model):
         verbose_name="Modificado por",
     )
     notes = models.TextField(blank=True, null=True)
+    previous_duration = models.DurationField(
+        blank=True,
+        null=True,
+        verbose_name="Tiempo en estado anterior",
+    )
 
     class Meta:
         verbose_name = "Historial de orden"
         verbose_name_plural = "Historial de órdenes"
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["order", "timestamp"], name="orders_tracking_order_ts_idx"),
+        ]
 
     def __str__(self):
         return f"{self.order.code} → {self.new_status}"
+
+    def save(self, *args, **kwargs):
+        """Al registrar una transición, guarda cuánto duró el estado anterior."""
+        if (
+            self._state.adding
+            and self.previous_duration is None
+            and self.previous_status
+            and getattr(settings, "ORDER_SLA_PERSIST_DURATIONS", True)
+        ):
+            last = (
+                OrderTracking.objects.filter(order_id=self.order_id, timestamp__lte=self.timestamp)
+                .order_by("-timestamp", "-id")
+                .values_list("timestamp", flat=True)
+                .first()
+            )
+            entered_at = last or self.order.date_created
+            self.previous_duration = max(self.timestamp - entered_at, timedelta(0))
+        super().save(*args, **kwargs)
@@ -0,0 +1,139 @@
+# orders/sla.py
+# Tiempos de permanencia por estado (SLA) calculados desde OrderTracking.
+import logging
+import math
+from array import array
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import F, Window
+from django.db.models.functions import Coalesce, Lag
+
+from .models import Order, OrderLine, OrderTracking
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _filter_by_created(qs, prefix, start, end):
+    if start:
+        qs = qs.filter(**{f"{prefix}date_created__date__gte": start})
+    if end:
+        qs = qs.filter(**{f"{prefix}date_created__date__lte": end})
+    return qs
+
+
+def dwell_times(start=None, end=None):
+    """
+    Una tupla (order_id, estado, siguiente, segundos) por transición con el
+    tiempo que la orden pasó en el estado anterior. Usa LAG(timestamp) sobre
+    (order, timestamp) en una sola consulta; la primera transición se mide
+    desde la creación de la orden. Si la fila ya trae previous_duration
+    (guardado al registrar la transición, ORDER_SLA_PERSIST_DURATIONS) se
+    usa ese valor; LAG cubre las filas anteriores a esa columna.
+
+    El filtro de fechas es por fecha de creación de la orden, para que la
+    ventana siempre vea el historial completo de cada orden. Se recorre con
+    iterator() en orden de order_id: no se materializa el historial.
+    """
+    qs = _filter_by_created(OrderTracking.objects.all(), "order__", start, end)
+
+    window = {"partition_by": [F("order_id")], "order_by": [F("timestamp").asc(), F("id").asc()]}
+    qs = qs.annotate(
+        entered_at=Coalesce(
+            Window(Lag("timestamp"), **window),
+            F("order__date_created"),
+        ),
+        prev_status=Coalesce(
+            Window(Lag("new_status"), **window),
+            F("previous_status"),
+        ),
+    ).values_list(
+        "order_id", "prev_status", "new_status", "entered_at", "timestamp", "previous_duration",
+    ).order_by("order_id")
+
+    for order_id, prev_status, new_status, entered_at, timestamp, stored in qs.iterator(chunk_size=2000):
+        if not prev_status:
+            continue
+        seconds = (stored if stored is not None else timestamp - entered_at).total_seconds()
+        yield order_id, prev_status, new_status, max(0.0, seconds)
+
+
+def _categories_by_order(start=None, end=None):
+    """(order_id, {categorías}) en orden de order_id, para cruzar con dwell_times."""
+    orders = _filter_by_created(Order.objects.all(), "", start, end)
+    rows = (
+        OrderLine.objects.filter(order__in=orders)
+        .values_list("order_id", "service__category__name")
+        .distinct()
+        .order_by("order_id")
+    )
+    current, categories = None, set()
+    for order_id, category in rows.iterator(chunk_size=2000):
+        if order_id != current:
+            if current is not None:
+                yield current, categories
+            current, categories = order_id, set()
+        categories.add(category or "Sin categoría")
+    if current is not None:
+        yield current, categories
+
+
+def _summarize(values):
+    values = sorted(values)
+    summary = {"count": len(values)}
+    for pct in PERCENTILES:
+        value = percentile(values, pct)
+        summary[f"p{pct}"] = timedelta(seconds=round(value)) if value is not None else None
+    return summary
+
+
+def sla_summary(start=None, end=None):
+    """
+    Percentiles p50/p90/p99 (timedelta) del tiempo en cada estado, en
+    total y por categoría de servicio. Una orden con líneas de varias
+    categorías cuenta en cada una de ellas.
+    """
+    # solo los segundos, en arrays de dobles: 8 bytes por transición y categoría
+    by_status = defaultdict(lambda: array("d"))
+    by_category = defaultdict(lambda: array("d"))
+    categories = _categories_by_order(start, end)
+    order_id, order_categories = next(categories, (None, ()))
+    transitions = 0
+    for row_order, status, _, seconds in dwell_times(start, end):
+        transitions += 1
+        by_status[status].append(seconds)
+        # ambos recorridos van en orden de order_id: se avanzan a la par
+        while order_id is not None and order_id < row_order:
+            order_id, order_categories = next(categories, (None, ()))
+        if order_id == row_order:
+            for category in order_categories:
+                by_category[(category, status)].append(seconds)
+
+    labels = dict(Order.STATUS_CHOICES)
+    status_order = [code for code, _ in Order.STATUS_CHOICES]
+    result = {
+        "by_status": [
+            {"status": status, "label": labels.get(status, status), **_summarize(by_status[status])}
+            for status in status_order if status in by_status
+        ],
+        "by_category": [
+            {"category": category, "status": status, "label": labels.get(status, status),
+             **_summarize(values)}
+            for (category, status), values in sorted(
+                by_category.items(),
+                key=lambda kv: (kv[0][0], status_order.index(kv[0][1]) if kv[0][1] in status_order else 99),
+            )
+        ],
+    }
+    logger.debug(f"[SLA] {transitions} transiciones analizadas ({start} - {end})")
+    return result
@@ -1,3 +1,129 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog.models import Service, ServiceCategory
+from customers.models import Customer
+
+from .models import Order, OrderLine, OrderTracking
+from .sla import dwell_times, percentile, sla_summary
+from .views import OrderWorkflowView
+
+T0 = datetime(2025, 6, 2, 8, 0, tzinfo=dt_timezone.utc)
+
+
+class PercentileTests(TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 11))
+        self.assertEqual(percentile(values, 50), 5)
+        self.assertEqual(percentile(values, 90), 9)
+        self.assertEqual(percentile(values, 99), 10)
+        self.assertIsNone(percentile([], 50))
+
+
+class SLASummaryTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Cliente")
+        wash = ServiceCategory.objects.create(name="Lavado")
+        iron = ServiceCategory.objects.create(name="Planchado")
+        self.wash = Service.objects.create(name="Lavado normal", category=wash, base_price=Decimal("100"))
+        self.iron = Service.objects.create(name="Planchado camisa", category=iron, base_price=Decimal("50"))
+
+    def _order(self, services, hours_pending, hours_in_process):
+        order = Order.objects.create(customer=self.customer, date_created=T0)
+        for service in services:
+            OrderLine.objects.create(order=order, service=service, unit_price=service.base_price)
+        started = T0 + timedelta(hours=hours_pending)
+        OrderTracking.objects.create(
+            order=order, previous_status="pendiente", new_status="en_proceso", timestamp=started,
+        )
+        OrderTracking.objects.create(
+            order=order, previous_status="en_proceso", new_status="listo",
+            timestamp=started + timedelta(hours=hours_in_process),
+        )
+        return order
+
+    def test_dwell_percentiles_by_status_and_category(self):
+        self._order([self.wash], 1, 2)
+        self._order([self.wash, self.iron], 3, 4)
+        self._order([self.iron], 5, 6)
+
+        summary = sla_summary()
+        by_status = {row["status"]: row for row in summary["by_status"]}
+        self.assertEqual(by_status["pendiente"]["count"], 3)
+        self.assertEqual(by_status["pendiente"]["p50"], timedelta(hours=3))
+        self.assertEqual(by_status["pendiente"]["p99"], timedelta(hours=5))
+        self.assertEqual(by_status["en_proceso"]["p50"], timedelta(hours=4))
+
+        # la orden con dos categorías cuenta en ambas
+        by_category = {(row["category"], row["status"]): row for row in summary["by_category"]}
+        self.assertEqual(by_category[("Lavado", "pendiente")]["count"], 2)
+        self.assertEqual(by_category[("Lavado", "pendiente")]["p99"], timedelta(hours=3))
+        self.assertEqual(by_category[("Planchado", "en_proceso")]["p50"], timedelta(hours=4))
+        self.assertEqual(by_category[("Planchado", "en_proceso")]["p99"], timedelta(hours=6))
+
+    def test_date_filter_uses_order_creation(self):
+        self._order([self.wash], 1, 2)
+        self.assertEqual(sla_summary(start=(T0 + timedelta(days=1)).date()), {"by_status": [], "by_category": []})
+
+    def test_transitions_store_the_previous_duration(self):
+        order = self._order([self.wash], 1, 2)
+        durations = list(order.tracking.order_by("timestamp").values_list("previous_duration", flat=True))
+        self.assertEqual(durations, [timedelta(hours=1), timedelta(hours=2)])
+
+    def test_stored_duration_wins_and_lag_covers_missing_ones(self):
+        order = self._order([self.wash], 1, 2)
+        # una corrección guardada manda sobre el cálculo con LAG
+        order.tracking.filter(new_status="en_proceso").update(previous_duration=timedelta(minutes=30))
+        with override_settings(ORDER_SLA_PERSIST_DURATIONS=False):
+            legacy = self._order([self.wash], 3, 4)
+        self.assertFalse(legacy.tracking.exclude(previous_duration=None).exists())
+
+        seconds = {(row[0], row[1]): row[3] for row in dwell_times()}
+        self.assertEqual(seconds[(order.pk, "pendiente")], 30 * 60)
+        self.assertEqual(seconds[(order.pk, "en_proceso")], 2 * 3600)
+        self.assertEqual(seconds[(legacy.pk, "pendiente")], 3 * 3600)
+        self.assertEqual(seconds[(legacy.pk, "en_proceso")], 4 * 3600)
+
+
+@mock.patch.object(OrderWorkflowView, "COLUMN_LIMIT", 2)
+class WorkflowColumnTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("tablero", password="x")
+        self.client.force_login(user)
+        customer = Customer.objects.create(name="Cliente")
+        self.orders = {
+            status: [
+                Order.objects.create(customer=customer, status=status, date_created=T0 + timedelta(days=day))
+                for day in range(3)
+            ]
+            for status in ("pendiente", "entregado")
+        }
+
+    def test_active_columns_keep_the_oldest(self):
+        response = self.client.get(reverse("orders:workflow"))
+        pending = self.orders["pendiente"]
+        delivered = self.orders["entregado"]
+        self.assertEqual(response.context["pending_orders"], pending[:2])
+        self.assertEqual(response.context["delivered_orders"], delivered[:0:-1])
+        self.assertEqual(response.context["column_totals"], {"pendiente": 3, "entregado": 3})
+        self.assertContains(response, "2 más antiguas de 3")
+        self.assertContains(response, f'href="{reverse("orders:pending")}"')
+        self.assertContains(response, "2 más recientes de 3")
+
+    def test_columns_and_cards_carry_their_sort_key(self):
+        # partials.js inserta la tarjeta movida con estos atributos
+        response = self.client.get(reverse("orders:workflow"))
+        self.assertContains(response, 'data-workflow-column="pendiente" data-workflow-order="asc"')
+        self.assertContains(response, 'data-workflow-column="entregado" data-workflow-order="desc"')
+        oldest = self.orders["pendiente"][0]
+        self.assertContains(response, f'data-created="{int(oldest.date_created.timestamp())}"')
+
+        response = self.client.post(
+            reverse("orders:advance", args=[oldest.pk]), HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertContains(response, f'data-created="{int(oldest.date_created.timestamp())}"')
@@ -4,25 +4,41 @@ from types import SimpleNamespace
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
+from django.db.models import Case, Count, F, Prefetch, Q, When, Window
+from django.db.models.functions import RowNumber
 from django.shortcuts import get_object_or_404, redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DetailView, View, TemplateView
 
+from core.conditional import ConditionalViewMixin
+from core.partials import PartialListMixin, is_partial, render_fragment
+
 from .models import Order, OrderLine, OrderTracking
-from catalog.models import Service
+from catalog.models import Service, ServiceComponent
 from customers.models import Customer
 from cash.models import CashMovement, CashRegister  # ✅ integración caja
 
 logger = logging.getLogger(__name__)
 
 
+def _workflow_response(request, order, text, level):
+    """Desde el Kanban vía XHR: solo la tarjeta actualizada; si no, mensaje y redirect."""
+    if is_partial(request):
+        return render_fragment(
+            request, "orders/_workflow_order_card.html", {"order": order}, message=text, level=level
+        )
+    getattr(messages, level)(request, text)
+    return redirect("orders:workflow")
+
+
 # ===============================
 # 🔹 LISTA GENERAL DE ÓRDENES
 # ===============================
-class OrderListView(LoginRequiredMixin, ListView):
+class OrderListView(LoginRequiredMixin, ConditionalViewMixin, PartialListMixin, ListView):
     model = Order
     template_name = "orders/list.html"
+    partial_template_name = "orders/_results.html"
+    conditional_tables = ("orders.Order", "orders.OrderLine", "customers.Customer", "catalog.Service")
     context_object_name = "orders"
     paginate_by = 10
 
@@ -115,8 +131,14 @@ class OrderDetailView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         order = self.object
-        ctx["lines"] = order.lines.select_related("service")
-        ctx["tracking"] = order.tracking.all().order_by("-timestamp")
+        # una consulta para las líneas y otra para todos sus componentes
+        lines = list(
+            order.lines.select_related("service").prefetch_related(
+                Prefetch("service__components", queryset=ServiceComponent.objects.select_related("item__unit"))
+            )
+        )
+        ctx["lines"] = lines
+        ctx["tracking"] = order.tracking.select_related("changed_by").order_by("-timestamp")
 
         ctx["components"] = [
             {
@@ -127,10 +149,10 @@ class OrderDetailView(LoginRequiredMixin, DetailView):
                         "used": float(line.quantity * c.quantity_used),
                         "unit": getattr(c.item.unit, "name", ""),
                     }
-                    for c in line.service.components.select_related("item")
+                    for c in line.service.components.all()
                 ],
             }
-            for line in order.lines.all()
+            for line in lines
         ]
         return ctx
 
@@ -241,12 +263,11 @@ class OrderAdvanceView(LoginRequiredMixin, View):
     }
 
     def post(self, request, pk):
-        order = get_object_or_404(Order, pk=pk)
+        order = get_object_or_404(Order.objects.select_related("customer"), pk=pk)
         next_status = self.transitions.get(order.status)
 
         if not next_status:
-            messages.warning(request, "No se puede avanzar más esta orden.")
-            return redirect("orders:workflow")
+            return _workflow_response(request, order, "No se puede avanzar más esta orden.", "warning")
 
         previous = order.status
         order.status = next_status
@@ -282,8 +303,7 @@ class OrderAdvanceView(LoginRequiredMixin, View):
             changed_by=request.user,
         )
 
-        messages.success(request, f"La orden {order.code} pasó a '{next_status}'.")
-        return redirect("orders:workflow")
+        return _workflow_response(request, order, f"La orden {order.code} pasó a '{next_status}'.", "success")
 
 
 # ===============================
@@ -320,14 +340,56 @@ class OrderReadyListView(OrderListView):
 # ===============================
 class OrderWorkflowView(LoginRequiredMixin, TemplateView):
     template_name = "orders/workflow.html"
+    COLUMNS = {
+        "pending_orders": "pendiente",
+        "in_process_orders": "en_proceso",
+        "ready_orders": "listo",
+        "delivered_orders": "entregado",
+        "cancelled_orders": "cancelado",
+    }
+    # las columnas crecen con el historial: cada una muestra COLUMN_LIMIT
+    # tarjetas con el total en el encabezado. En las activas van las más
+    # antiguas (las que más esperan), con enlace a su listado completo; en
+    # entregadas y canceladas, las más recientes.
+    COLUMN_LIMIT = 50
+    ACTIVE_STATUSES = ("pendiente", "en_proceso", "listo")
+
+    def column_links(self):
+        return {
+            "pendiente": reverse("orders:pending"),
+            "en_proceso": f"{reverse('orders:list')}?status=en_proceso",
+            "listo": reverse("orders:ready"),
+        }
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["pending_orders"] = Order.objects.filter(status="pendiente").select_related("customer")
-        ctx["in_process_orders"] = Order.objects.filter(status="en_proceso").select_related("customer")
-        ctx["ready_orders"] = Order.objects.filter(status="listo").select_related("customer")
-        ctx["delivered_orders"] = Order.objects.filter(status="entregado").select_related("customer")
-        ctx["cancelled_orders"] = Order.objects.filter(status="cancelado").select_related("customer")
+        # una sola consulta repartida por columna (antes, una por estado);
+        # ROW_NUMBER por estado recorta cada columna en la base. En las
+        # columnas cerradas la primera clave es NULL y decide la segunda.
+        by_status = {"partition_by": [F("status")]}
+        oldest_if_active = Case(When(status__in=self.ACTIVE_STATUSES, then=F("date_created")))
+        orders = (
+            Order.objects.filter(status__in=self.COLUMNS.values())
+            .select_related("customer")
+            .annotate(
+                column_rank=Window(
+                    RowNumber(), order_by=[oldest_if_active.asc(), F("date_created").desc()], **by_status
+                ),
+                column_total=Window(Count("id"), **by_status),
+            )
+            .filter(column_rank__lte=self.COLUMN_LIMIT)
+            .order_by("column_rank")
+        )
+        columns = {status: [] for status in self.COLUMNS.values()}
+        totals = {}
+        for order in orders:
+            columns[order.status].append(order)
+            totals[order.status] = order.column_total
+        for name, status in self.COLUMNS.items():
+            ctx[name] = columns[status]
+        ctx["column_totals"] = totals
+        ctx["column_limit"] = self.COLUMN_LIMIT
+        ctx["column_links"] = self.column_links()
         logger.debug("[ORDERS] Renderizando vista Kanban de flujo de órdenes")
         return ctx
 
@@ -337,11 +399,10 @@ class OrderWorkflowView(LoginRequiredMixin, TemplateView):
 # ===============================
 class OrderCancelView(LoginRequiredMixin, View):
     def post(self, request, pk):
-        order = get_object_or_404(Order, pk=pk)
+        order = get_object_or_404(Order.objects.select_related("customer"), pk=pk)
 
         if order.status == "cancelado":
-            messages.warning(request, f"La orden {order.code} ya estaba cancelada.")
-            return redirect("orders:workflow")
+            return _workflow_response(request, order, f"La orden {order.code} ya estaba cancelada.", "warning")
 
         previous = order.status
         order.status = "cancelado"
@@ -359,5 +420,4 @@ class OrderCancelView(LoginRequiredMixin, View):
             new_status="cancelado",
             changed_by=request.user,
         )
-        messages.error(request, f"Orden {order.code} cancelada correctamente.")
-        return redirect("orders:workflow")
+        return _workflow_response(request, order, f"Orden {order.code} cancelada correctamente.", "error")
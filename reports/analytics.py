@@ -0,0 +1,399 @@
+# reports/analytics.py
+# Snapshot columnar (NumPy, memory-mapped) para agrupar reportes en memoria
+# sin volver a consultar las tablas operativas en cada cambio de filtro.
+import json
+import logging
+import os
+import shutil
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 20_000
+KEEP_SNAPSHOTS = 2
+CURRENT_FILE = "CURRENT"
+MAX_DENSE_GROUPS = 5_000_000
+
+# Tipos de columna:
+#   "day"    → días desde 1970-01-01 (hora local), int32
+#   "code"   → código categórico (índice en `labels`), int32
+#   "scaled" → decimal entero escalado (centavos, milésimas), int64
+#   "id"     → clave primaria / foránea, int64
+DTYPES = {"day": np.int32, "code": np.int32, "scaled": np.int64, "id": np.int64}
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def to_epoch_day(value):
+    """Convierte date/datetime a días desde epoch (en la zona horaria local)."""
+    if value is None:
+        return None
+    if hasattr(value, "hour"):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def from_epoch_day(value):
+    return date.fromordinal(int(value) + EPOCH_ORDINAL)
+
+
+def get_snapshot_dir():
+    return Path(getattr(settings, "ANALYTICS_SNAPSHOT_DIR", settings.BASE_DIR / "var" / "analytics"))
+
+
+# =====================================================
+# 🔹 CONSTRUCCIÓN DEL SNAPSHOT
+# =====================================================
+class _Categories:
+    """Asigna códigos densos a valores categóricos en orden de aparición."""
+
+    def __init__(self, labels=()):
+        self.labels = list(labels)
+        self.codes = {label: i for i, label in enumerate(self.labels)}
+
+    def code(self, label):
+        if label not in self.codes:
+            self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return self.codes[label]
+
+
+class _TableWriter:
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = columns          # {columna: (tipo, escala)}
+        self.chunks = {col: [] for col in columns}
+        self.buffer = {col: [] for col in columns}
+        self.rows = 0
+
+    def append(self, **values):
+        for col in self.columns:
+            self.buffer[col].append(values[col])
+        self.rows += 1
+        if len(self.buffer[next(iter(self.columns))]) >= CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self):
+        for col, (kind, _scale) in self.columns.items():
+            if self.buffer[col]:
+                self.chunks[col].append(np.asarray(self.buffer[col], dtype=DTYPES[kind]))
+                self.buffer[col] = []
+
+    def save(self, path, categories):
+        self._flush()
+        meta = {"rows": self.rows, "columns": {}}
+        for col, (kind, scale) in self.columns.items():
+            arr = (
+                np.concatenate(self.chunks[col])
+                if self.chunks[col] else np.empty(0, dtype=DTYPES[kind])
+            )
+            np.save(path / f"{self.name}.{col}.npy", arr, allow_pickle=False)
+            info = {"kind": kind}
+            if scale:
+                info["scale"] = scale
+            if kind == "code":
+                info["labels"] = categories[col].labels
+            meta["columns"][col] = info
+        return meta
+
+
+def _scaled(value, scale):
+    return int((Decimal(value or 0) * scale).to_integral_value())
+
+
+def build_snapshot():
+    """Extrae las tablas operativas a columnas NumPy y publica el snapshot."""
+    from orders.models import Order, OrderLine
+    from customers.models import Customer
+    from catalog.models import Service
+    from cash.models import CashMovement
+    from inventory.models import InventoryItem, InventoryMovement
+
+    base = get_snapshot_dir()
+    base.mkdir(parents=True, exist_ok=True)
+    built_at = timezone.now()
+    name = f"snap-{built_at:%Y%m%d%H%M%S%f}"
+    tmp = base / f".{name}"
+    tmp.mkdir()
+
+    # --- Dimensiones ---
+    customers = {
+        pk: (name_, ctype)
+        for pk, name_, ctype in Customer.objects.values_list("id", "name", "customer_type").iterator()
+    }
+    services = {
+        pk: (name_, cat or "")
+        for pk, name_, cat in Service.objects.values_list("id", "name", "category__name").iterator()
+    }
+    items = dict(InventoryItem.objects.values_list("id", "name").iterator())
+
+    cats = {
+        "status": _Categories(code for code, _label in Order.STATUS_CHOICES),
+        "customer": _Categories(),
+        "customer_type": _Categories(),
+        "service": _Categories(),
+        "category": _Categories(),
+        "movement_type": _Categories(),
+        "item": _Categories(),
+    }
+
+    tables = {}
+
+    # --- Órdenes ---
+    orders = _TableWriter("orders", {
+        "id": ("id", None), "day": ("day", None), "status": ("code", None),
+        "customer": ("code", None), "customer_type": ("code", None),
+        "total": ("scaled", 100), "final": ("scaled", 100),
+    })
+    qs = Order.objects.values_list(
+        "id", "date_created", "status", "customer_id", "total_amount", "final_amount"
+    ).order_by()
+    for pk, created, status, customer_id, total, final in qs.iterator(chunk_size=CHUNK_SIZE):
+        customer_name, customer_type = customers.get(customer_id, ("", ""))
+        orders.append(
+            id=pk, day=to_epoch_day(created), status=cats["status"].code(status),
+            customer=cats["customer"].code(customer_name),
+            customer_type=cats["customer_type"].code(customer_type),
+            total=_scaled(total, 100), final=_scaled(final, 100),
+        )
+    tables["orders"] = orders
+
+    # --- Líneas (con el día de la orden desnormalizado) ---
+    # la fecha sale del JOIN y no de la pasada de órdenes: una orden creada
+    # entre ambas consultas no cae en 1970-01-01
+    lines = _TableWriter("lines", {
+        "order": ("id", None), "day": ("day", None),
+        "service": ("code", None), "category": ("code", None),
+        "quantity": ("scaled", 100), "subtotal": ("scaled", 100),
+    })
+    qs = OrderLine.objects.values_list(
+        "order_id", "order__date_created", "service_id", "quantity", "subtotal"
+    ).order_by()
+    for order_id, created, service_id, qty, subtotal in qs.iterator(chunk_size=CHUNK_SIZE):
+        service_name, category = services.get(service_id, ("", ""))
+        lines.append(
+            order=order_id, day=to_epoch_day(created),
+            service=cats["service"].code(service_name),
+            category=cats["category"].code(category),
+            quantity=_scaled(qty, 100), subtotal=_scaled(subtotal, 100),
+        )
+    tables["lines"] = lines
+
+    # --- Movimientos de caja ---
+    cash = _TableWriter("cash", {
+        "day": ("day", None), "movement_type": ("code", None),
+        "register": ("id", None), "amount": ("scaled", 100),
+    })
+    qs = CashMovement.objects.values_list("created_at", "movement_type", "register_id", "amount").order_by()
+    for created, mtype, register_id, amount in qs.iterator(chunk_size=CHUNK_SIZE):
+        cash.append(
+            day=to_epoch_day(created), movement_type=cats["movement_type"].code(mtype),
+            register=register_id, amount=_scaled(amount, 100),
+        )
+    tables["cash"] = cash
+
+    # --- Movimientos de inventario ---
+    inventory = _TableWriter("inventory", {
+        "day": ("day", None), "item": ("code", None),
+        "movement_type": ("code", None), "quantity": ("scaled", 1000),
+    })
+    qs = InventoryMovement.objects.values_list("created_at", "item_id", "movement_type", "quantity").order_by()
+    for created, item_id, mtype, qty in qs.iterator(chunk_size=CHUNK_SIZE):
+        inventory.append(
+            day=to_epoch_day(created), item=cats["item"].code(items.get(item_id, "")),
+            movement_type=cats["movement_type"].code(mtype), quantity=_scaled(qty, 1000),
+        )
+    tables["inventory"] = inventory
+
+    meta = {"built_at": built_at.isoformat(), "tables": {}}
+    for table_name, writer in tables.items():
+        meta["tables"][table_name] = writer.save(tmp, cats)
+    (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    # Publicación atómica: renombrar el directorio y luego el puntero CURRENT.
+    final = base / name
+    os.replace(tmp, final)
+    pointer = base / f".{CURRENT_FILE}.tmp"
+    pointer.write_text(name, encoding="utf-8")
+    os.replace(pointer, base / CURRENT_FILE)
+    _prune(base, keep=name)
+
+    counts = ", ".join(f"{t}={m['rows']}" for t, m in meta["tables"].items())
+    logger.info(f"[ANALYTICS] Snapshot publicado {name} → {counts}")
+    return final
+
+
+def _prune(base, keep):
+    snapshots = sorted(p for p in base.glob("snap-*") if p.is_dir())
+    for old in snapshots[:-KEEP_SNAPSHOTS]:
+        if old.name != keep:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+# =====================================================
+# 🔹 LECTURA Y CONSULTA
+# =====================================================
+class Table:
+    """Tabla columnar de solo lectura con filtros y agrupación en memoria."""
+
+    def __init__(self, path, name, meta):
+        self.name = name
+        self.rows = meta["rows"]
+        self.meta = meta["columns"]
+        self._path = path
+        self._columns = {}
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, col):
+        if col not in self._columns:
+            self._columns[col] = np.load(self._path / f"{self.name}.{col}.npy", mmap_mode="r")
+        return self._columns[col]
+
+    def labels(self, col):
+        return self.meta[col].get("labels", [])
+
+    def between(self, col, start=None, end=None, mask=None):
+        """Máscara booleana para start <= col <= end (fechas o días epoch)."""
+        values = self.column(col)
+        mask = np.ones(self.rows, dtype=bool) if mask is None else mask
+        if start is not None:
+            mask &= values >= (to_epoch_day(start) if isinstance(start, date) else start)
+        if end is not None:
+            mask &= values <= (to_epoch_day(end) if isinstance(end, date) else end)
+        return mask
+
+    def equals(self, col, label, mask=None):
+        """Máscara para una columna categórica igual a `label`."""
+        labels = self.labels(col)
+        mask = np.ones(self.rows, dtype=bool) if mask is None else mask
+        if label not in labels:
+            return np.zeros(self.rows, dtype=bool)
+        return mask & (self.column(col) == labels.index(label))
+
+    def _decode(self, col, raw):
+        info = self.meta[col]
+        if info["kind"] == "code":
+            return info["labels"][raw]
+        if info["kind"] == "day":
+            return from_epoch_day(raw)
+        if info["kind"] == "scaled":
+            return Decimal(int(raw)).scaleb(-(len(str(info["scale"])) - 1))
+        return int(raw)
+
+    def total(self, col, mask=None):
+        values = self.column(col) if mask is None else self.column(col)[mask]
+        return self._decode(col, values.sum(dtype=np.int64))
+
+    def count(self, mask=None):
+        return int(self.rows if mask is None else np.count_nonzero(mask))
+
+    def group_by(self, dims, sums=(), mask=None, order_by=None, limit=None):
+        """
+        Agrupa por las columnas `dims` y suma `sums`.
+
+        Devuelve una lista de dicts con las dimensiones decodificadas, cada
+        suma y `count`. `order_by` admite "-columna" para orden descendente.
+        """
+        dims = list(dims)
+        index = np.flatnonzero(mask) if mask is not None else None
+
+        def values(col):
+            arr = self.column(col)
+            return arr[index] if index is not None else np.asarray(arr)
+
+        if dims:
+            keys = [values(d).astype(np.int64) for d in dims]
+            lows = [int(k.min()) if k.size else 0 for k in keys]
+            shape = [int(k.max()) - low + 1 if k.size else 1 for k, low in zip(keys, lows)]
+            combined = np.ravel_multi_index([k - low for k, low in zip(keys, lows)], shape)
+            if np.prod(shape) <= MAX_DENSE_GROUPS:
+                # Códigos densos: el índice combinado es directamente el bin (sin ordenar).
+                bins, nbins, bin_keys = combined, int(np.prod(shape)), None
+            else:
+                bin_keys, bins = np.unique(combined, return_inverse=True)
+                nbins = len(bin_keys)
+        else:
+            size = len(index) if index is not None else self.rows
+            bins, nbins, bin_keys = np.zeros(size, dtype=np.int64), 1, None
+            lows = shape = []
+
+        counts = np.bincount(bins, minlength=nbins)
+        present = np.flatnonzero(counts)
+        # Pesos float64: exactos mientras cada suma sea menor que 2**53 unidades.
+        totals = {
+            col: np.rint(np.bincount(bins, weights=values(col), minlength=nbins)[present]).astype(np.int64)
+            for col in sums
+        }
+        if dims:
+            decoded = np.unravel_index(present if bin_keys is None else bin_keys[present], shape)
+
+        rows = []
+        for g, bin_ in enumerate(present):
+            row = {d: self._decode(d, decoded[i][g] + lows[i]) for i, d in enumerate(dims)}
+            for col in sums:
+                row[col] = self._decode(col, totals[col][g])
+            row["count"] = int(counts[bin_])
+            rows.append(row)
+
+        if order_by:
+            key = order_by.lstrip("-")
+            rows.sort(key=lambda r: r[key], reverse=order_by.startswith("-"))
+        return rows[:limit] if limit else rows
+
+
+class Snapshot:
+    def __init__(self, path):
+        self.path = path
+        self.meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        self.built_at = datetime.fromisoformat(self.meta["built_at"])
+        self.tables = {
+            name: Table(path, name, meta) for name, meta in self.meta["tables"].items()
+        }
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    @property
+    def age(self):
+        return (timezone.now() - self.built_at).total_seconds()
+
+
+_loaded = None
+
+
+def load_snapshot():
+    """Devuelve el snapshot publicado más reciente, o None si no hay ninguno."""
+    global _loaded
+    base = get_snapshot_dir()
+    try:
+        name = (base / CURRENT_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if _loaded is None or _loaded.path.name != name:
+        try:
+            _loaded = Snapshot(base / name)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[ANALYTICS] No se pudo cargar el snapshot '{name}': {e}")
+            return None
+    return _loaded
+
+
+def get_usable_snapshot():
+    """Snapshot activo y no más viejo que ANALYTICS_SNAPSHOT_MAX_AGE, o None."""
+    if not getattr(settings, "ANALYTICS_SNAPSHOT_ENABLED", False):
+        return None
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+    if snapshot.age > getattr(settings, "ANALYTICS_SNAPSHOT_MAX_AGE", 60 * 15):
+        logger.debug(f"[ANALYTICS] Snapshot vencido ({snapshot.age:.0f}s): se usa SQL")
+        return None
+    return snapshot
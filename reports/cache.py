@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Tablas cuyo contenido alimenta a los reportes. Cada escritura sobre
+# cualquiera de ellas incrementa su contador de versión (ver signals.py).
+TRACKED_MODELS = [
+    "orders.Order",
+    "orders.OrderLine",
+    "orders.OrderTracking",
+    "cash.CashMovement",
+    "cash.CashRegister",
+    "inventory.InventoryMovement",
+    "catalog.Service",
+    "catalog.ServiceCategory",
+    # listados con GET condicional (core/conditional.py)
+    "customers.Customer",
+    "inventory.InventoryItem",
+    "inventory.Unit",
+]
+
+# Backends que guardan cada clave en el proceso que la escribió
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+VERSION_KEY = "tblver:{}"
+CHANGED_KEY = "tblmod:{}"
+STATS_KEY = "report_cache:{}"
+
+
+# =====================================================
+# 🔹 VERSIONES POR TABLA
+# =====================================================
+def _version_key(label):
+    return VERSION_KEY.format(label.lower())
+
+
+def bump_table_version(label, using=None):
+    """
+    Incrementa la versión de una tabla (invalida los reportes que la usan)
+    cuando la transacción en curso confirma; fuera de una, enseguida. Antes
+    del commit otro request todavía lee las filas viejas: si la versión ya
+    fuera la nueva, las cachearía bajo ella hasta la próxima escritura.
+    """
+    transaction.on_commit(partial(_bump, label), using=using)
+
+
+def _bump(label):
+    key = _version_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # La clave expiró o nunca existió: se reinicia con un valor nuevo.
+        cache.set(key, int(timezone.now().timestamp() * 1000), None)
+    cache.set(CHANGED_KEY.format(label.lower()), time.time(), None)
+
+
+def versions_are_shared():
+    """
+    True si las versiones viven en una caché que ven todos los workers.
+    Con LocMemCache cada proceso tiene sus contadores: una escritura
+    atendida por un worker no cambia los ETag de los demás, que seguirían
+    respondiendo 304 indefinidamente. TABLE_VERSIONS_SHARED fuerza el valor
+    (p. ej. True con un único proceso).
+    """
+    forced = getattr(settings, "TABLE_VERSIONS_SHARED", None)
+    if forced is not None:
+        return forced
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+def get_table_versions(labels):
+    """Devuelve {label: versión} para las tablas indicadas."""
+    keys = {_version_key(label): label for label in labels}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, label in keys.items():
+        if key not in found:
+            found[key] = int(timezone.now().timestamp() * 1000)
+            if not cache.add(key, found[key], None):
+                found[key] = cache.get(key, found[key])
+        versions[label] = found[key]
+    return versions
+
+
+def get_tables_changed_at(labels):
+    """
+    Momento (epoch) de la última escritura sobre cualquiera de las tablas.
+    Sin registro previo se asume "ahora": es la opción conservadora.
+    """
+    keys = [CHANGED_KEY.format(label.lower()) for label in labels]
+    found = cache.get_many(keys)
+    now = time.time()
+    for key in keys:
+        if key not in found:
+            found[key] = now
+            if not cache.add(key, now, None):
+                found[key] = cache.get(key, now)
+    return max(found.values(), default=now)
+
+
+# =====================================================
+# 🔹 ESTADÍSTICAS DE ACIERTOS
+# =====================================================
+def _count(stat):
+    key = STATS_KEY.format(stat)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_cache_stats():
+    """Aciertos y fallos acumulados de la caché de reportes."""
+    found = cache.get_many([STATS_KEY.format("hits"), STATS_KEY.format("misses")])
+    hits = found.get(STATS_KEY.format("hits"), 0)
+    misses = found.get(STATS_KEY.format("misses"), 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "ratio": (hits / total) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([STATS_KEY.format("hits"), STATS_KEY.format("misses")])
+
+
+# =====================================================
+# 🔹 MIXIN PARA VISTAS DE REPORTE
+# =====================================================
+class ReportCacheMixin:
+    """
+    Cachea el resultado de `get_report_data(start, end)`.
+
+    La clave combina la vista, los filtros y la versión de cada tabla en
+    `cache_tables`, de modo que cualquier escritura relevante la invalida.
+    Los rangos cerrados (que terminan antes de hoy) reciben un TTL largo.
+    """
+    cache_tables = ()
+
+    def get_report_data(self, start, end):
+        raise NotImplementedError
+
+    def get_cache_timeout(self, start, end):
+        if end and end < timezone.localdate():
+            return getattr(settings, "REPORT_CACHE_CLOSED_TTL", 60 * 60 * 24)
+        return getattr(settings, "REPORT_CACHE_TTL", 60 * 5)
+
+    def get_cache_variant(self):
+        """Parte extra de la clave (p. ej. el snapshot analítico usado)."""
+        return ""
+
+    def get_cache_key(self, start, end):
+        versions = get_table_versions(self.cache_tables)
+        raw = "|".join([
+            self.__class__.__name__,
+            str(start or ""),
+            str(end or ""),
+            self.get_cache_variant(),
+            ",".join(f"{label}={versions[label]}" for label in sorted(versions)),
+        ])
+        return "report:" + hashlib.md5(raw.encode()).hexdigest()
+
+    def get_cached_report_data(self, start, end):
+        if not getattr(settings, "REPORT_CACHE_ENABLED", True):
+            return self.get_report_data(start, end)
+
+        key = self.get_cache_key(start, end)
+        data = cache.get(key)
+        if data is not None:
+            _count("hits")
+            logger.debug(f"[REPORT] Cache HIT → {self.__class__.__name__} ({start} - {end})")
+            return data
+
+        _count("misses")
+        data = self.get_report_data(start, end)
+        cache.set(key, data, self.get_cache_timeout(start, end))
+        logger.debug(f"[REPORT] Cache MISS → {self.__class__.__name__} ({start} - {end})")
+        return data
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.routers import replica_reads
+from reports.analytics import build_snapshot, load_snapshot
+
+
+class Command(BaseCommand):
+    help = "Extrae órdenes, líneas y movimientos a un snapshot columnar para los reportes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every", type=int, default=0,
+            help="Repite la extracción cada N segundos (0 = una sola vez).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            with replica_reads():  # extracción completa: mejor en la réplica si la hay
+                path = build_snapshot()
+            snapshot = load_snapshot()
+            rows = ", ".join(f"{name}={len(table)}" for name, table in snapshot.tables.items())
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Snapshot {path.name} en {time.perf_counter() - started:.1f}s → {rows}"
+            ))
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
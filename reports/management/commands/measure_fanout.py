@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from core.fanout import can_run_parallel
+
+URLS = [
+    "/dashboard/",
+    "/reports/orders/",
+    "/reports/inventory/",
+    "/reports/financial/",
+    "/reports/services/",
+]
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de pared del dashboard y reportes con consultas en serie vs. en paralelo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Repeticiones por URL.")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(is_superuser=True).first()
+        if not user:
+            raise CommandError("Se necesita un superusuario para autenticar las peticiones.")
+
+        client = Client()
+        client.force_login(user)
+        repeat = options["repeat"]
+
+        if not can_run_parallel():
+            self.stdout.write(self.style.WARNING(
+                "⚠️ La base de datos actual no admite consultas en paralelo (SQLite o "
+                "QUERY_FANOUT_WORKERS<=1): ambas columnas medirán ejecución en serie."
+            ))
+
+        self.stdout.write(f"{'URL':<24}{'serie (ms)':>14}{'paralelo (ms)':>16}")
+        # sin cachés de reportes ni de métricas del dashboard: cada petición consulta
+        with override_settings(REPORT_CACHE_ENABLED=False, DASHBOARD_METRICS_TTL=0):
+            for url in URLS:
+                with override_settings(QUERY_FANOUT_WORKERS=1):
+                    serial = self._measure(client, url, repeat)
+                parallel = self._measure(client, url, repeat)
+                self.stdout.write(f"{url:<24}{serial:>14.1f}{parallel:>16.1f}")
+
+    def _measure(self, client, url, repeat):
+        client.get(url)  # calentamiento
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get(url)
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reports.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Muestra los aciertos/fallos de la caché de reportes (para ajustar TTLs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reinicia los contadores.")
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"📊 Caché de reportes → aciertos={stats['hits']} fallos={stats['misses']} "
+            f"ratio={stats['ratio']:.1%}"
+        )
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("✅ Contadores reiniciados."))
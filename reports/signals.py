@@ -0,0 +1,17 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .cache import TRACKED_MODELS, bump_table_version
+
+
+def _bump_version(sender, using=None, **kwargs):
+    """Marca la tabla del modelo como modificada (al confirmar la transacción)."""
+    bump_table_version(sender._meta.label, using=using)
+
+
+def connect_signals():
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        uid = f"report_cache:{label}"
+        post_save.connect(_bump_version, sender=model, dispatch_uid=uid + ":save")
+        post_delete.connect(_bump_version, sender=model, dispatch_uid=uid + ":delete")
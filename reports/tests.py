@@ -1,3 +1,83 @@
-from django.test import TestCase
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from catalog.models import Service
+from customers.models import Customer
+from orders.models import Order, OrderLine
+
+from .analytics import build_snapshot, load_snapshot, to_epoch_day
+from .cache import ReportCacheMixin, bump_table_version, get_table_versions
+from .views import SLAReportView
+
+
+class _CountingReport(ReportCacheMixin):
+    cache_tables = ("orders.Order", "cash.CashMovement")
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_report_data(self, start, end):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+class TableVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_waits_for_commit(self):
+        before = get_table_versions(["orders.Order"])["orders.Order"]
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                bump_table_version("orders.Order")
+                # dentro de la transacción otro request aún ve la versión vieja
+                self.assertEqual(get_table_versions(["orders.Order"])["orders.Order"], before)
+        self.assertNotEqual(get_table_versions(["orders.Order"])["orders.Order"], before)
+
+    def test_cache_key_follows_versions(self):
+        report = _CountingReport()
+        key = report.get_cache_key(None, None)
+        self.assertEqual(report.get_cache_key(None, None), key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_table_version("customers.Customer")
+        self.assertEqual(report.get_cache_key(None, None), key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_table_version("cash.CashMovement")
+        self.assertNotEqual(report.get_cache_key(None, None), key)
+
+    def test_sla_report_follows_category_renames(self):
+        key = SLAReportView().get_cache_key(None, None)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_table_version("catalog.ServiceCategory")
+        self.assertNotEqual(SLAReportView().get_cache_key(None, None), key)
+
+    def test_cached_report_recomputes_after_write(self):
+        report = _CountingReport()
+        self.assertEqual(report.get_cached_report_data(None, None), {"calls": 1})
+        self.assertEqual(report.get_cached_report_data(None, None), {"calls": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_table_version("orders.Order")
+        self.assertEqual(report.get_cached_report_data(None, None), {"calls": 2})
+
+
+class AnalyticsSnapshotTests(TestCase):
+    def test_lines_carry_their_order_day(self):
+        customer = Customer.objects.create(name="Cliente")
+        service = Service.objects.create(name="Lavado", base_price=Decimal("100"))
+        created = datetime(2025, 3, 14, 15, 0, tzinfo=dt_timezone.utc)
+        order = Order.objects.create(customer=customer, date_created=created)
+        OrderLine.objects.create(order=order, service=service, quantity=2, unit_price=Decimal("100"))
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(ANALYTICS_SNAPSHOT_DIR=tmp):
+            build_snapshot()
+            snapshot = load_snapshot()
+            self.assertEqual(snapshot["lines"].column("day").tolist(), [to_epoch_day(created)])
+            self.assertEqual(snapshot["orders"].column("day").tolist(), [to_epoch_day(created)])
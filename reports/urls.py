@@ -9,4 +9,5 @@ urlpatterns = [
     path("financial/", views.FinancialReportView.as_view(), name="financial_report"),
     path("customers/", views.CustomersReportView.as_view(), name="customers_report"),
     path("services/", views.ServicesReportView.as_view(), name="services_report"),
+    path("sla/", views.SLAReportView.as_view(), name="sla_report"),
 ]
@@ -7,19 +7,31 @@ from django.db.models import Sum, Count, F, Q
 from django.views.generic import TemplateView
 
 from orders.models import Order, OrderLine
+from orders.sla import sla_summary
 from customers.models import Customer
 from catalog.models import Service, ServiceCategory
 from inventory.models import InventoryItem, InventoryMovement
 from cash.models import CashRegister, CashMovement
 
+from core.conditional import ConditionalViewMixin
+from core.fanout import fanout
+from core.routers import ReplicaReadsMixin
+
+from .analytics import get_usable_snapshot
+from .cache import ReportCacheMixin
+
 logger = logging.getLogger(__name__)
 
 
 # =====================================================
 # 🔹 BASE VIEW
 # =====================================================
-class BaseReportView(LoginRequiredMixin, TemplateView):
-    """Base para todos los reportes: agrega soporte de filtros globales."""
+class BaseReportView(LoginRequiredMixin, ConditionalViewMixin, ReplicaReadsMixin, TemplateView):
+    """
+    Base para todos los reportes: agrega soporte de filtros globales. Los que
+    declaran `conditional_tables` responden 304 si esas tablas no cambiaron.
+    Las consultas van a la réplica si hay una configurada.
+    """
 
     def get_date_range(self):
         """Devuelve rango de fechas válido desde GET params."""
@@ -39,6 +51,7 @@ class BaseReportView(LoginRequiredMixin, TemplateView):
 # =====================================================
 class OrdersReportView(BaseReportView):
     template_name = "reports/orders.html"
+    conditional_tables = ("orders.Order", "orders.OrderLine", "customers.Customer")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -50,21 +63,25 @@ class OrdersReportView(BaseReportView):
         if end:
             qs = qs.filter(date_created__date__lte=end)
 
-        total_orders = qs.count()
-        total_sales = qs.aggregate(total=Sum("final_amount"))["total"] or Decimal("0.00")
-        avg_ticket = (total_sales / total_orders) if total_orders else Decimal("0.00")
-
-        top_services = (
-            OrderLine.objects.values(name=F("service__name"))
-            .annotate(total=Sum("subtotal"), qty=Sum("quantity"))
-            .order_by("-total")[:5]
-        )
+        data = fanout({
+            "total_orders": lambda: qs.count(),
+            "total_sales": lambda: qs.aggregate(total=Sum("final_amount"))["total"],
+            "top_services": lambda: list(
+                OrderLine.objects.values(name=F("service__name"))
+                .annotate(total=Sum("subtotal"), qty=Sum("quantity"))
+                .order_by("-total")[:5]
+            ),
+            "top_customers": lambda: list(
+                qs.values(name=F("customer__name"))
+                .annotate(total=Sum("final_amount"), count=Count("id"))
+                .order_by("-total")[:5]
+            ),
+            "orders": lambda: list(qs.order_by("-date_created")[:50]),
+        })
 
-        top_customers = (
-            qs.values(name=F("customer__name"))
-            .annotate(total=Sum("final_amount"), count=Count("id"))
-            .order_by("-total")[:5]
-        )
+        total_orders = data["total_orders"]
+        total_sales = data["total_sales"] or Decimal("0.00")
+        avg_ticket = (total_sales / total_orders) if total_orders else Decimal("0.00")
 
         ctx.update({
             "start": start,
@@ -72,9 +89,9 @@ class OrdersReportView(BaseReportView):
             "total_orders": total_orders,
             "total_sales": total_sales,
             "avg_ticket": avg_ticket,
-            "top_services": top_services,
-            "top_customers": top_customers,
-            "orders": qs.order_by("-date_created")[:50],
+            "top_services": data["top_services"],
+            "top_customers": data["top_customers"],
+            "orders": data["orders"],
         })
         logger.debug(f"[REPORT] OrdersReport → {total_orders} órdenes, RD${total_sales}")
         return ctx
@@ -85,6 +102,7 @@ class OrdersReportView(BaseReportView):
 # =====================================================
 class InventoryReportView(BaseReportView):
     template_name = "reports/inventory.html"
+    conditional_tables = ("inventory.InventoryItem", "inventory.InventoryMovement", "inventory.Unit")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -100,21 +118,26 @@ class InventoryReportView(BaseReportView):
         else:
             moves = InventoryMovement.objects.all()
 
-        total_entries = moves.filter(movement_type="entrada").aggregate(Sum("quantity"))["quantity__sum"] or 0
-        total_exits = moves.filter(movement_type="salida").aggregate(Sum("quantity"))["quantity__sum"] or 0
-
-        low_stock = items.filter(current_stock__lte=F("min_stock")).count()
-        critical_stock = items.filter(current_stock__lt=F("min_stock") / 2).count()
+        data = fanout({
+            "total_entries": lambda: moves.filter(movement_type="entrada").aggregate(Sum("quantity"))["quantity__sum"],
+            "total_exits": lambda: moves.filter(movement_type="salida").aggregate(Sum("quantity"))["quantity__sum"],
+            "low_stock": lambda: items.filter(current_stock__lte=F("min_stock")).count(),
+            "critical_stock": lambda: items.filter(current_stock__lt=F("min_stock") / 2).count(),
+            "items": lambda: list(items.select_related("unit").order_by("name")),
+            "movements": lambda: list(moves.select_related("item").order_by("-created_at")[:50]),
+        })
+        total_entries = data["total_entries"] or 0
+        total_exits = data["total_exits"] or 0
 
         ctx.update({
             "start": start,
             "end": end,
-            "items": items.order_by("name"),
-            "movements": moves.order_by("-created_at")[:50],
+            "items": data["items"],
+            "movements": data["movements"],
             "total_entries": total_entries,
             "total_exits": total_exits,
-            "low_stock": low_stock,
-            "critical_stock": critical_stock,
+            "low_stock": data["low_stock"],
+            "critical_stock": data["critical_stock"],
         })
         logger.debug(f"[REPORT] InventoryReport → Entradas={total_entries}, Salidas={total_exits}")
         return ctx
@@ -123,36 +146,43 @@ class InventoryReportView(BaseReportView):
 # =====================================================
 # 💰 3️⃣ REPORTES FINANCIEROS
 # =====================================================
-class FinancialReportView(BaseReportView):
+class FinancialReportView(ReportCacheMixin, BaseReportView):
     template_name = "reports/financial.html"
+    cache_tables = ("cash.CashMovement", "cash.CashRegister")
+    conditional_tables = cache_tables
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         start, end = self.get_date_range()
+        ctx.update({"start": start, "end": end})
+        ctx.update(self.get_cached_report_data(start, end))
+        return ctx
 
+    def get_report_data(self, start, end):
         movements = CashMovement.objects.all()
         if start:
             movements = movements.filter(created_at__date__gte=start)
         if end:
             movements = movements.filter(created_at__date__lte=end)
 
-        total_ingresos = movements.filter(movement_type="ingreso").aggregate(Sum("amount"))["amount__sum"] or Decimal("0.00")
-        total_egresos = movements.filter(movement_type="egreso").aggregate(Sum("amount"))["amount__sum"] or Decimal("0.00")
+        data = fanout({
+            "total_ingresos": lambda: movements.filter(movement_type="ingreso").aggregate(Sum("amount"))["amount__sum"],
+            "total_egresos": lambda: movements.filter(movement_type="egreso").aggregate(Sum("amount"))["amount__sum"],
+            "movements": lambda: list(movements.select_related("created_by").order_by("-created_at")[:50]),
+            "registers": lambda: list(CashRegister.objects.order_by("-opened_at")[:5]),
+        })
+        total_ingresos = data["total_ingresos"] or Decimal("0.00")
+        total_egresos = data["total_egresos"] or Decimal("0.00")
         balance = total_ingresos - total_egresos
 
-        registers = CashRegister.objects.order_by("-opened_at")[:5]
-
-        ctx.update({
-            "start": start,
-            "end": end,
-            "movements": movements.order_by("-created_at")[:50],
+        logger.debug(f"[REPORT] FinancialReport → Ingresos={total_ingresos}, Egresos={total_egresos}")
+        return {
+            "movements": data["movements"],
             "total_ingresos": total_ingresos,
             "total_egresos": total_egresos,
             "balance": balance,
-            "registers": registers,
-        })
-        logger.debug(f"[REPORT] FinancialReport → Ingresos={total_ingresos}, Egresos={total_egresos}")
-        return ctx
+            "registers": data["registers"],
+        }
 
 
 # =====================================================
@@ -160,65 +190,152 @@ class FinancialReportView(BaseReportView):
 # =====================================================
 class CustomersReportView(BaseReportView):
     template_name = "reports/customers.html"
+    conditional_tables = ("orders.Order", "customers.Customer")
+
+    def get_conditional_variant(self):
+        snapshot = get_usable_snapshot()
+        return snapshot.path.name if snapshot else ""
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         start, end = self.get_date_range()
 
-        orders = Order.objects.all().select_related("customer")
-        if start:
-            orders = orders.filter(date_created__date__gte=start)
-        if end:
-            orders = orders.filter(date_created__date__lte=end)
+        snapshot = get_usable_snapshot()
+        if snapshot:
+            customer_stats = self.get_snapshot_stats(snapshot, start, end)
+        else:
+            orders = Order.objects.all().select_related("customer")
+            if start:
+                orders = orders.filter(date_created__date__gte=start)
+            if end:
+                orders = orders.filter(date_created__date__lte=end)
 
-        customer_stats = (
-            orders.values("customer__name", "customer__customer_type")
-            .annotate(total=Sum("final_amount"), count=Count("id"))
-            .order_by("-total")[:20]
-        )
+            customer_stats = (
+                orders.values("customer__name", "customer__customer_type")
+                .annotate(total=Sum("final_amount"), count=Count("id"))
+                .order_by("-total")[:20]
+            )
 
         ctx.update({
             "start": start,
             "end": end,
             "customer_stats": customer_stats,
+            "snapshot_built_at": snapshot.built_at if snapshot else None,
         })
         logger.debug(f"[REPORT] CustomersReport → {len(customer_stats)} clientes")
         return ctx
 
+    def get_snapshot_stats(self, snapshot, start, end):
+        """Mismo agrupado que la consulta SQL, calculado sobre el snapshot."""
+        orders = snapshot["orders"]
+        rows = orders.group_by(
+            ["customer", "customer_type"], sums=["final"],
+            mask=orders.between("day", start, end), order_by="-final", limit=20,
+        )
+        return [
+            {
+                "customer__name": r["customer"],
+                "customer__customer_type": r["customer_type"],
+                "total": r["final"],
+                "count": r["count"],
+            }
+            for r in rows
+        ]
+
 
 # =====================================================
 # 🧾 5️⃣ REPORTES DE SERVICIOS
 # =====================================================
-class ServicesReportView(BaseReportView):
+class ServicesReportView(ReportCacheMixin, BaseReportView):
     template_name = "reports/services.html"
+    cache_tables = ("orders.Order", "orders.OrderLine", "catalog.Service", "catalog.ServiceCategory")
+    conditional_tables = cache_tables
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         start, end = self.get_date_range()
+        snapshot = get_usable_snapshot()
+        ctx.update({
+            "start": start,
+            "end": end,
+            "snapshot_built_at": snapshot.built_at if snapshot else None,
+        })
+        ctx.update(self.get_cached_report_data(start, end))
+        return ctx
 
+    def get_cache_variant(self):
+        snapshot = get_usable_snapshot()
+        return snapshot.path.name if snapshot else ""
+
+    get_conditional_variant = get_cache_variant
+
+    def get_report_data(self, start, end):
+        snapshot = get_usable_snapshot()
         lines = OrderLine.objects.select_related("service", "order")
         if start:
             lines = lines.filter(order__date_created__date__gte=start)
         if end:
             lines = lines.filter(order__date_created__date__lte=end)
 
-        service_stats = (
-            lines.values("service__name", "service__category__name")
-            .annotate(total_sales=Sum("subtotal"), total_qty=Sum("quantity"))
-            .order_by("-total_sales")[:20]
-        )
+        data = fanout({
+            "service_stats": lambda: (
+                self.get_snapshot_stats(snapshot, start, end) if snapshot else list(
+                    lines.values("service__name", "service__category__name")
+                    .annotate(total_sales=Sum("subtotal"), total_qty=Sum("quantity"))
+                    .order_by("-total_sales")[:20]
+                )
+            ),
+            # ✅ Ajuste aquí: ahora usa "services" (por el related_name en catalog.models)
+            "categories": lambda: list(
+                ServiceCategory.objects.annotate(service_count=Count("services"))
+                .order_by("name")
+            ),
+        })
+        service_stats = data["service_stats"]
 
-        # ✅ Ajuste aquí: ahora usa "services" (por el related_name en catalog.models)
-        categories = (
-            ServiceCategory.objects.annotate(service_count=Count("services"))
-            .order_by("name")
+        logger.debug(f"[REPORT] ServicesReport → {len(service_stats)} servicios analizados")
+        return {
+            "service_stats": service_stats,
+            "categories": data["categories"],
+        }
+
+    def get_snapshot_stats(self, snapshot, start, end):
+        """Mismo agrupado que la consulta SQL, calculado sobre el snapshot."""
+        lines = snapshot["lines"]
+        rows = lines.group_by(
+            ["service", "category"], sums=["subtotal", "quantity"],
+            mask=lines.between("day", start, end), order_by="-subtotal", limit=20,
         )
+        return [
+            {
+                "service__name": r["service"],
+                "service__category__name": r["category"] or None,
+                "total_sales": r["subtotal"],
+                "total_qty": r["quantity"],
+            }
+            for r in rows
+        ]
 
-        ctx.update({
-            "start": start,
-            "end": end,
-            "service_stats": service_stats,
-            "categories": categories,
-        })
-        logger.debug(f"[REPORT] ServicesReport → {len(service_stats)} servicios analizados")
+
+# =====================================================
+# ⏱️ 6️⃣ REPORTE DE TIEMPOS (SLA)
+# =====================================================
+class SLAReportView(ReportCacheMixin, BaseReportView):
+    """Percentiles de permanencia por estado, en total y por categoría."""
+    template_name = "reports/sla.html"
+    cache_tables = (
+        "orders.Order", "orders.OrderLine", "orders.OrderTracking", "catalog.Service", "catalog.ServiceCategory",
+    )
+    # sin GET condicional: las permanencias dependen de la hora actual
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        start, end = self.get_date_range()
+        ctx.update({"start": start, "end": end})
+        ctx.update(self.get_cached_report_data(start, end))
         return ctx
+
+    def get_report_data(self, start, end):
+        summary = sla_summary(start, end)
+        logger.debug(f"[REPORT] SLAReport → {len(summary['by_status'])} estados")
+        return summary
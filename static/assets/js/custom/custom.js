@@ -147,7 +147,9 @@
 	} catch (err) { }
 
 	// Clipboard
-	new ClipboardJS('.copy-btn');
+	if (typeof ClipboardJS !== "undefined") {
+		new ClipboardJS('.copy-btn');
+	}
 
 	// Popover
 	const popoverTriggerList = document.querySelectorAll('[data-bs-toggle="popover"]')
@@ -655,414 +657,417 @@
 		});
 	}
 
-	// Courses Slider JS
-	var swiper = new Swiper(".courses-slide", {
-		slidesPerView: 1,
-		spaceBetween: 24,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: true,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			el: ".swiper-pagination2",
-			clickable: true,
-		},
-	});
-
-	// Upcoming Events JS
-	var swiper = new Swiper(".upcoming-events-slide", {
-		slidesPerView: 1,
-		spaceBetween: 24,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: true,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			el: ".swiper-pagination1",
-			clickable: true,
-		},
-	});
-
-	// Recent Property JS
-	var swiper = new Swiper(".recent-property-slide", {
-		slidesPerView: 1,
-		spaceBetween: 24,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: true,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			el: ".swiper-pagination3",
-			clickable: true,
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			1199: {
-				slidesPerView: 2,
-			},
-			1400: {
-				slidesPerView: 1,
-			},
-			1600: {
-				slidesPerView: 1,
+	// Sliders JS (solo si Swiper está cargado en la página)
+	if (typeof Swiper !== "undefined") {
+		// Courses Slider JS
+		var swiper = new Swiper(".courses-slide", {
+			slidesPerView: 1,
+			spaceBetween: 24,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: true,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				el: ".swiper-pagination2",
+				clickable: true,
 			},
-			1700: {
-				slidesPerView: 2,
-			},
-		}
-	});
+		});
 
-	// Team Slider JS
-	var swiper = new Swiper(".team-slide", {
-		slidesPerView: 1,
-		spaceBetween: 25,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: true,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		navigation: {
-			nextEl: ".prev",
-			prevEl: ".next",
-		},
-		pagination: {
-			clickable: true,
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
+		// Upcoming Events JS
+		var swiper = new Swiper(".upcoming-events-slide", {
+			slidesPerView: 1,
+			spaceBetween: 24,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: true,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				el: ".swiper-pagination1",
+				clickable: true,
 			},
-			768: {
-				slidesPerView: 2,
-			},
-			1199: {
-				slidesPerView: 3,
-			},
-			1440: {
-				slidesPerView: 3,
-			},
-			1600: {
-				slidesPerView: 3,
-			},
-		}
-	});
+		});
 
-	// Cryptocurrency Slider JS
-	var swiper = new Swiper(".cryptocurrency-slide", {
-		slidesPerView: 1,
-		spaceBetween: 25,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		navigation: {
-			nextEl: ".prev",
-			prevEl: ".next",
-		},
-		pagination: {
-			clickable: true,
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			992: {
-				slidesPerView: 3,
-			},
-			1199: {
-				slidesPerView: 3,
-			},
-			1440: {
-				slidesPerView: 4,
-			},
-			1600: {
-				slidesPerView: 4,
-			},
-		}
-	});
+		// Recent Property JS
+		var swiper = new Swiper(".recent-property-slide", {
+			slidesPerView: 1,
+			spaceBetween: 24,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: true,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				el: ".swiper-pagination3",
+				clickable: true,
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				1199: {
+					slidesPerView: 2,
+				},
+				1400: {
+					slidesPerView: 1,
+				},
+				1600: {
+					slidesPerView: 1,
+				},
+				1700: {
+					slidesPerView: 2,
+				},
+			}
+		});
 
-	// NFT Slider JS
-	var swiper = new Swiper(".nft-slide", {
-		slidesPerView: 1,
-		spaceBetween: 25,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		navigation: {
-			nextEl: ".prev",
-			prevEl: ".next",
-		},
-		pagination: {
-			clickable: true,
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			992: {
-				slidesPerView: 3,
-			},
-			1199: {
-				slidesPerView: 3,
-			},
-			1440: {
-				slidesPerView: 4,
-			},
-			1600: {
-				slidesPerView: 4,
-			},
-		}
-	});
+		// Team Slider JS
+		var swiper = new Swiper(".team-slide", {
+			slidesPerView: 1,
+			spaceBetween: 25,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: true,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			navigation: {
+				nextEl: ".prev",
+				prevEl: ".next",
+			},
+			pagination: {
+				clickable: true,
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				1199: {
+					slidesPerView: 3,
+				},
+				1440: {
+					slidesPerView: 3,
+				},
+				1600: {
+					slidesPerView: 3,
+				},
+			}
+		});
 
-	// NFT Slider Two JS
-	var swiper = new Swiper(".nft-slide-two", {
-		slidesPerView: 1,
-		spaceBetween: 25,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		navigation: {
-			nextEl: ".prev",
-			prevEl: ".next",
-		},
-		pagination: {
-			clickable: true,
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			992: {
-				slidesPerView: 2,
-			},
-			1199: {
-				slidesPerView: 2,
-			},
-			1440: {
-				slidesPerView: 3,
-			},
-			1600: {
-				slidesPerView: 3,
-			},
-		}
-	});
+		// Cryptocurrency Slider JS
+		var swiper = new Swiper(".cryptocurrency-slide", {
+			slidesPerView: 1,
+			spaceBetween: 25,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			navigation: {
+				nextEl: ".prev",
+				prevEl: ".next",
+			},
+			pagination: {
+				clickable: true,
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				992: {
+					slidesPerView: 3,
+				},
+				1199: {
+					slidesPerView: 3,
+				},
+				1440: {
+					slidesPerView: 4,
+				},
+				1600: {
+					slidesPerView: 4,
+				},
+			}
+		});
 
-	// Top Collections JS
-	var swiper = new Swiper(".top-collections-slide", {
-		slidesPerView: 1,
-		spaceBetween: 25,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 8000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			clickable: true,
-			el: ".swiper-pagination-top-collections",
-		},
-	});
+		// NFT Slider JS
+		var swiper = new Swiper(".nft-slide", {
+			slidesPerView: 1,
+			spaceBetween: 25,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			navigation: {
+				nextEl: ".prev",
+				prevEl: ".next",
+			},
+			pagination: {
+				clickable: true,
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				992: {
+					slidesPerView: 3,
+				},
+				1199: {
+					slidesPerView: 3,
+				},
+				1440: {
+					slidesPerView: 4,
+				},
+				1600: {
+					slidesPerView: 4,
+				},
+			}
+		});
 
-	// Mastering Digital Marketing JS
-	var swiper = new Swiper(".mastering-digital-marketing-slide", {
-		slidesPerView: 1,
-		spaceBetween: 25,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 15000,
-			disableOnInteraction: true,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			clickable: true,
-			el: ".swiper-pagination-mastering-digital-marketing",
-		},
-	});
+		// NFT Slider Two JS
+		var swiper = new Swiper(".nft-slide-two", {
+			slidesPerView: 1,
+			spaceBetween: 25,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			navigation: {
+				nextEl: ".prev",
+				prevEl: ".next",
+			},
+			pagination: {
+				clickable: true,
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				992: {
+					slidesPerView: 2,
+				},
+				1199: {
+					slidesPerView: 2,
+				},
+				1440: {
+					slidesPerView: 3,
+				},
+				1600: {
+					slidesPerView: 3,
+				},
+			}
+		});
 
-	// Popular Rooms Slide JS
-	var swiper = new Swiper(".popular-rooms-slide", {
-		slidesPerView: 1,
-		spaceBetween: 30,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 5000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			clickable: true,
-			el: ".swiper-pagination-popular-rooms",
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			576: {
-				slidesPerView: 2,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			992: {
-				slidesPerView: 3,
-			},
-			1200: {
-				slidesPerView: 4,
-			},
-			1440: {
-				slidesPerView: 4,
+		// Top Collections JS
+		var swiper = new Swiper(".top-collections-slide", {
+			slidesPerView: 1,
+			spaceBetween: 25,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 8000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				clickable: true,
+				el: ".swiper-pagination-top-collections",
 			},
-			1850: {
-				slidesPerView: 4,
-			},
-		}
-	});
+		});
 
-	// My Featured Listings Slide JS
-	var swiper = new Swiper(".my-featured-listings-slide", {
-		slidesPerView: 1,
-		spaceBetween: 30,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 5000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			clickable: true,
-			el: ".swiper-pagination-my-featured-listings",
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			576: {
-				slidesPerView: 1,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			992: {
-				slidesPerView: 2,
-			},
-			1200: {
-				slidesPerView: 2,
-			},
-			1440: {
-				slidesPerView: 2,
+		// Mastering Digital Marketing JS
+		var swiper = new Swiper(".mastering-digital-marketing-slide", {
+			slidesPerView: 1,
+			spaceBetween: 25,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 15000,
+				disableOnInteraction: true,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				clickable: true,
+				el: ".swiper-pagination-mastering-digital-marketing",
 			},
-			1850: {
-				slidesPerView: 2,
-			},
-		}
-	});
+		});
 
-	// Client Ratings Slide JS
-	var swiper = new Swiper(".client-ratings-slide", {
-		slidesPerView: 1,
-		spaceBetween: 30,
-		centeredSlides: false,
-		preventClicks: true,
-		loop: false,
-		autoplay: {
-			delay: 5000,
-			disableOnInteraction: false,
-			pauseOnMouseEnter: true,
-		},
-		pagination: {
-			clickable: true,
-			el: ".swiper-pagination-client-ratings",
-		},
-		breakpoints: {
-			0: {
-				slidesPerView: 1,
-			},
-			576: {
-				slidesPerView: 2,
-			},
-			768: {
-				slidesPerView: 2,
-			},
-			992: {
-				slidesPerView: 2,
-			},
-			1200: {
-				slidesPerView: 2,
-			},
-			1440: {
-				slidesPerView: 3,
-			},
-			1850: {
-				slidesPerView: 3,
-			},
-		}
-	});
+		// Popular Rooms Slide JS
+		var swiper = new Swiper(".popular-rooms-slide", {
+			slidesPerView: 1,
+			spaceBetween: 30,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 5000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				clickable: true,
+				el: ".swiper-pagination-popular-rooms",
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				576: {
+					slidesPerView: 2,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				992: {
+					slidesPerView: 3,
+				},
+				1200: {
+					slidesPerView: 4,
+				},
+				1440: {
+					slidesPerView: 4,
+				},
+				1850: {
+					slidesPerView: 4,
+				},
+			}
+		});
 
-	// Room Details Slide JS
-	var swiper = new Swiper(".room-details-slide", {
-		spaceBetween: 15,
-		slidesPerView: 4,
-		freeMode: true,
-		watchSlidesProgress: true,
+		// My Featured Listings Slide JS
+		var swiper = new Swiper(".my-featured-listings-slide", {
+			slidesPerView: 1,
+			spaceBetween: 30,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 5000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				clickable: true,
+				el: ".swiper-pagination-my-featured-listings",
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				576: {
+					slidesPerView: 1,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				992: {
+					slidesPerView: 2,
+				},
+				1200: {
+					slidesPerView: 2,
+				},
+				1440: {
+					slidesPerView: 2,
+				},
+				1850: {
+					slidesPerView: 2,
+				},
+			}
+		});
+
+		// Client Ratings Slide JS
+		var swiper = new Swiper(".client-ratings-slide", {
+			slidesPerView: 1,
+			spaceBetween: 30,
+			centeredSlides: false,
+			preventClicks: true,
+			loop: false,
+			autoplay: {
+				delay: 5000,
+				disableOnInteraction: false,
+				pauseOnMouseEnter: true,
+			},
+			pagination: {
+				clickable: true,
+				el: ".swiper-pagination-client-ratings",
+			},
+			breakpoints: {
+				0: {
+					slidesPerView: 1,
+				},
+				576: {
+					slidesPerView: 2,
+				},
+				768: {
+					slidesPerView: 2,
+				},
+				992: {
+					slidesPerView: 2,
+				},
+				1200: {
+					slidesPerView: 2,
+				},
+				1440: {
+					slidesPerView: 3,
+				},
+				1850: {
+					slidesPerView: 3,
+				},
+			}
+		});
+
+		// Room Details Slide JS
+		var swiper = new Swiper(".room-details-slide", {
+			spaceBetween: 15,
+			slidesPerView: 4,
+			freeMode: true,
+			watchSlidesProgress: true,
 		
-	});
-	var swiper = new Swiper(".room-details-slide2", {
-		spaceBetween: 15,
-		thumbs: {
-			swiper: swiper,
-		},
-	});
+		});
+		var swiper = new Swiper(".room-details-slide2", {
+			spaceBetween: 15,
+			thumbs: {
+				swiper: swiper,
+			},
+		});
+	}
 
 	// Thumb Images Upload JS
 	const getImagePreviewId = document.getElementById('imagePreview');
@@ -0,0 +1,139 @@
+(function () {
+	"use strict";
+
+	// Respuestas parciales (core/partials.py): la misma URL, pedida con
+	// X-Requested-With, devuelve solo el fragmento a reemplazar.
+	const HEADERS = { "X-Requested-With": "XMLHttpRequest" };
+	const ALERT_LEVELS = { error: "danger", debug: "secondary" };
+
+	function fetchFragment(url, options) {
+		return fetch(url, Object.assign({ credentials: "same-origin", headers: HEADERS }, options)).then(res => {
+			// sesión vencida → login: que lo resuelva la navegación normal
+			if (!res.ok || res.redirected) {
+				throw new Error("partial");
+			}
+			return res.text().then(html => ({ html, res }));
+		});
+	}
+
+	function showMessage(res) {
+		const text = res.headers.get("X-Message");
+		const box = document.getElementById("page-messages");
+		if (!text || !box) {
+			return;
+		}
+		const level = res.headers.get("X-Message-Level") || "info";
+		const alert = document.createElement("div");
+		alert.className = `alert alert-${ALERT_LEVELS[level] || level} mb-2`;
+		alert.setAttribute("role", "alert");
+		alert.textContent = decodeURIComponent(text);
+		box.replaceChildren(alert);
+		box.classList.add("mb-3");
+	}
+
+	// Listados: búsqueda y paginación → [data-partial-results]
+	document.querySelectorAll("[data-partial-list]").forEach(list => {
+		const results = list.querySelector("[data-partial-results]");
+		const form = list.querySelector("form[data-partial-search]");
+		let controller = null;
+		let timer = null;
+
+		function load(url) {
+			if (controller) {
+				controller.abort();
+			}
+			controller = new AbortController();
+			fetchFragment(url, { signal: controller.signal })
+				.then(({ html }) => {
+					results.innerHTML = html;
+					history.replaceState(null, "", url);
+				})
+				.catch(err => {
+					if (err.name !== "AbortError") {
+						window.location.href = url;
+					}
+				});
+		}
+
+		function searchUrl() {
+			const url = new URL(form.getAttribute("action") || window.location.pathname, window.location.href);
+			url.search = new URLSearchParams(new FormData(form)).toString();
+			return url.toString();
+		}
+
+		if (form && results) {
+			form.addEventListener("input", () => {
+				clearTimeout(timer);
+				timer = setTimeout(() => load(searchUrl()), 300);
+			});
+			form.addEventListener("submit", event => {
+				event.preventDefault();
+				clearTimeout(timer);
+				load(searchUrl());
+			});
+		}
+
+		if (results) {
+			results.addEventListener("click", event => {
+				const link = event.target.closest(".pagination a[href]");
+				if (!link || link.getAttribute("href") === "#") {
+					return;
+				}
+				event.preventDefault();
+				load(link.href);
+			});
+		}
+	});
+
+	// Kanban: la tarjeta movida entra en el mismo orden que usa la vista
+	// (activas: más antiguas primero; cerradas: más recientes primero)
+	function insertSorted(column, fresh) {
+		const created = Number(fresh.dataset.created);
+		const newestFirst = column.dataset.workflowOrder === "desc";
+		const next = Array.from(column.querySelectorAll("[data-order-card]")).find(other => {
+			const otherCreated = Number(other.dataset.created);
+			return newestFirst ? otherCreated < created : otherCreated > created;
+		});
+		column.insertBefore(fresh, next || null);
+	}
+
+	// Kanban: avanzar/cancelar devuelve la tarjeta con su nuevo estado
+	document.addEventListener("submit", event => {
+		const form = event.target.closest("form[data-partial-card]");
+		// el confirm() inline de cancelar ya canceló el envío
+		if (!form || event.defaultPrevented) {
+			return;
+		}
+		event.preventDefault();
+		const card = form.closest("[data-order-card]");
+
+		fetchFragment(form.action, { method: "POST", body: new FormData(form) })
+			.then(({ html, res }) => {
+				const template = document.createElement("template");
+				template.innerHTML = html.trim();
+				const fresh = template.content.firstElementChild;
+				const source = card.parentElement;
+				const target = document.querySelector(`[data-workflow-column="${fresh.dataset.status}"]`);
+
+				if (target && target !== source) {
+					const empty = target.querySelector("[data-workflow-empty]");
+					if (empty) {
+						empty.remove();
+					}
+					insertSorted(target, fresh);
+					card.remove();
+					if (!source.querySelector("[data-order-card]")) {
+						source.insertAdjacentHTML(
+							"beforeend",
+							'<p class="text-muted small text-center mb-0" data-workflow-empty>Sin órdenes</p>'
+						);
+					}
+				} else {
+					card.replaceWith(fresh);
+				}
+				showMessage(res);
+			})
+			// sin reenviar el POST: recargar muestra el estado real
+			.catch(() => window.location.reload());
+	});
+})();
@@ -0,0 +1,64 @@
+# theme/cache.py
+# Caché en proceso del tema activo, invalidada por una versión compartida
+# que se incrementa cuando confirma la transacción de Theme.save()/delete().
+# Con una caché por proceso (LocMemCache) la versión no llega a los demás
+# workers: entonces caduca cada THEME_LOCAL_CACHE_TTL segundos.
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from reports.cache import versions_are_shared
+
+VERSION_KEY = "theme:version"
+
+_cached = None  # (versión, tema)
+
+
+def bump_theme_version(using=None):
+    """
+    Invalida el tema cacheado en todos los procesos cuando la transacción en
+    curso confirma (fuera de una, enseguida). Antes del commit otro request
+    releería el tema viejo y lo guardaría bajo la versión nueva.
+    """
+    transaction.on_commit(_bump, using=using)
+
+
+def _bump():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def get_theme_version():
+    """
+    Versión del tema (también la usan los fragmentos del layout). Si la
+    caché no es compartida, se le agrega un tramo de THEME_LOCAL_CACHE_TTL
+    segundos para que los otros workers vean el cambio a lo sumo entonces.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+    if versions_are_shared():
+        return version
+    ttl = getattr(settings, "THEME_LOCAL_CACHE_TTL", 5)
+    window = int(time.time() // ttl) if ttl > 0 else time.time_ns()
+    return f"{version}.{window}"
+
+
+def get_active_theme():
+    """Tema activo; solo consulta la base de datos si cambió la versión."""
+    global _cached
+    from .models import Theme
+
+    version = get_theme_version()
+    if _cached is not None and _cached[0] == version:
+        return _cached[1]
+
+    theme = Theme.objects.filter(is_active=True).first()
+    _cached = (version, theme)
+    return theme
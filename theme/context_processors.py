@@ -1,5 +1,8 @@
-from .models import Theme
+from django.utils.functional import SimpleLazyObject
+
+from .cache import get_active_theme
+
 
 def active_theme(request):
-    """Provee el tema activo a todas las plantillas."""
-    return {"active_theme": Theme.objects.filter(is_active=True).first()}
+    """Provee el tema activo a las plantillas (se resuelve solo si se usa)."""
+    return {"active_theme": SimpleLazyObject(get_active_theme)}
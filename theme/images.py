@@ -0,0 +1,139 @@
+# theme/images.py
+# Variantes responsivas del logo y favicon, generadas fuera del request
+# (después del commit, en un hilo de fondo) con nombres por hash de contenido.
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = "theme/variants"
+
+# nombre de variante → caja máxima (ancho, alto)
+LOGO_SIZES = {"1x": (300, 300), "2x": (600, 600)}
+FAVICON_SIZES = {"16": (16, 16), "32": (32, 32), "64": (64, 64)}
+FORMATS = {"webp": ("WEBP", {"quality": 85, "method": 6}), "png": ("PNG", {"optimize": True})}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="theme-images")
+
+
+def source_names(theme):
+    return {
+        "logo": theme.logo.name if theme.logo else "",
+        "favicon": theme.favicon.name if theme.favicon else "",
+    }
+
+
+def needs_processing(theme):
+    """True si el logo/favicon cambió desde la última generación de variantes."""
+    return (theme.image_variants or {}).get("source") != source_names(theme)
+
+
+def schedule_processing(theme):
+    """Programa la generación de variantes para cuando se confirme la transacción."""
+    pk = theme.pk
+    if not getattr(settings, "THEME_IMAGES_ASYNC", True):
+        transaction.on_commit(lambda: process_theme_images(pk))
+        return
+    transaction.on_commit(lambda: _executor.submit(_run_in_background, pk))
+
+
+def _run_in_background(pk):
+    close_old_connections()
+    try:
+        process_theme_images(pk)
+    except Exception:
+        logger.exception(f"[THEME] Error generando variantes del tema {pk}")
+    finally:
+        close_old_connections()
+
+
+def _render(img, box, fmt):
+    """Redimensiona (sin agrandar ni deformar) y codifica en el formato pedido."""
+    img = img.copy()
+    img.thumbnail(box, Image.LANCZOS)
+    if fmt == "PNG" or img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+    else:
+        img = img.convert("RGB")
+    pil_format, options = FORMATS[fmt.lower()]
+    buf = BytesIO()
+    img.save(buf, format=pil_format, **options)
+    return buf.getvalue(), img.size
+
+
+def _store(kind, variant, ext, content):
+    """Guarda con nombre por hash: el mismo contenido reutiliza el archivo."""
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    name = f"{VARIANTS_DIR}/{kind}-{variant}.{digest}.{ext}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def _build_variants(field, kind, sizes):
+    try:
+        with field.open("rb") as fh:
+            img = Image.open(fh)
+            img.load()
+    except Exception as e:
+        logger.warning(f"[THEME] '{field.name}' no es una imagen válida: {e}")
+        return {}
+
+    result = {}
+    for ext, (pil_format, _options) in FORMATS.items():
+        result[ext] = {}
+        for variant, box in sizes.items():
+            content, (width, height) = _render(img, box, pil_format)
+            result[ext][variant] = {
+                "name": _store(kind, variant, ext, content),
+                "width": width,
+                "height": height,
+            }
+    return result
+
+
+def process_theme_images(pk):
+    """Genera y registra las variantes del logo y el favicon de un tema."""
+    from .cache import bump_theme_version
+    from .models import Theme
+
+    theme = Theme.objects.filter(pk=pk).first()
+    if theme is None or not needs_processing(theme):
+        return
+
+    previous = theme.image_variants or {}
+    variants = {"source": source_names(theme)}
+    if theme.logo:
+        variants["logo"] = _build_variants(theme.logo, "logo", LOGO_SIZES)
+    if theme.favicon:
+        variants["favicon"] = _build_variants(theme.favicon, "favicon", FAVICON_SIZES)
+
+    # update() evita volver a disparar Theme.save()
+    Theme.objects.filter(pk=pk).update(image_variants=variants)
+    bump_theme_version()
+    _delete_unused(previous, variants)
+    logger.info(f"[THEME] Variantes generadas para '{theme.name}'")
+
+
+def _variant_names(variants):
+    names = set()
+    for kind in ("logo", "favicon"):
+        for by_size in variants.get(kind, {}).values():
+            names.update(v["name"] for v in by_size.values())
+    return names
+
+
+def _delete_unused(previous, current):
+    for name in _variant_names(previous) - _variant_names(current):
+        try:
+            default_storage.delete(name)
+        except OSError:
+            pass
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theme', '0002_alter_theme_options_alter_theme_favicon_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='theme',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,9 +1,10 @@
 import os
-from io import BytesIO
-from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.db import models
 from django.core.exceptions import ValidationError
-from PIL import Image
+
+from .cache import bump_theme_version
+from .images import FAVICON_SIZES, LOGO_SIZES, needs_processing, schedule_processing
 
 
 def upload_logo_path(instance, filename):
@@ -26,6 +27,7 @@ class Theme(models.Model):
     preloader_text = models.CharField(max_length=50, default="TREZO")
     footer_text = models.CharField(max_length=200, default="© Trezo - 2025")
     is_active = models.BooleanField(default=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -35,29 +37,49 @@ class Theme(models.Model):
             raise ValidationError("Ya existe un tema activo. Solo uno puede estarlo.")
 
     def save(self, *args, **kwargs):
-        """Guarda el tema y convierte/redimensiona imágenes."""
+        """Guarda el tema y programa (después del commit) sus variantes de imagen."""
         if self.is_active:
             Theme.objects.exclude(pk=self.pk).update(is_active=False)
 
         super().save(*args, **kwargs)
 
-        # Procesar logo
-        if self.logo:
-            self._resize_image(self.logo, max_size=(300, 300))  # tamaño visible sin deformar
-
-        # Procesar favicon
-        if self.favicon:
-            self._resize_image(self.favicon, max_size=(64, 64), convert_to="PNG")  # favicon pequeño y cuadrado
-
-    def _resize_image(self, field, max_size=(300, 300), convert_to=None):
-        """Redimensiona y opcionalmente convierte la imagen a PNG."""
-        try:
-            img = Image.open(field.path)
-        except Exception:
-            return  # si no es imagen válida, lo deja
-
-        # Convertir a modo RGB (evita errores con transparencia)
-        if img.mode not in ("RGB", "RGBA"):
-            img = img.convert("RGBA" if convert_to == "PNG" else "RGB")
-
-        # Redimensionar
+        if needs_processing(self):
+            schedule_processing(self)
+
+        bump_theme_version(using=self._state.db)
+
+    def delete(self, *args, **kwargs):
+        using = self._state.db
+        result = super().delete(*args, **kwargs)
+        bump_theme_version(using=using)
+        return result
+
+    # 🔹 Variantes responsivas (ver theme/images.py)
+    def _variant(self, kind, ext, size):
+        variant = (self.image_variants or {}).get(kind, {}).get(ext, {}).get(size)
+        return default_storage.url(variant["name"]) if variant else None
+
+    def _srcset(self, ext):
+        urls = [(size, self._variant("logo", ext, size)) for size in LOGO_SIZES]
+        return ", ".join(f"{url} {size}" for size, url in urls if url)
+
+    @property
+    def logo_src(self):
+        return self._variant("logo", "png", "1x") or (self.logo.url if self.logo else "")
+
+    @property
+    def logo_srcset(self):
+        return self._srcset("png")
+
+    @property
+    def logo_webp_srcset(self):
+        return self._srcset("webp")
+
+    @property
+    def favicon_links(self):
+        """[(tamaño, url)] de los favicons PNG generados."""
+        return [
+            (size, url)
+            for size in FAVICON_SIZES
+            if (url := self._variant("favicon", "png", size))
+        ]
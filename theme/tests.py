@@ -1,3 +1,54 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from .cache import get_active_theme, get_theme_version
+from .models import Theme
+
+
+@override_settings(THEME_IMAGES_ASYNC=False, TABLE_VERSIONS_SHARED=True)
+class ThemeVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_waits_for_commit(self):
+        before = get_theme_version()
+        self.assertIsNone(get_active_theme())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Theme.objects.create(name="Nuevo", is_active=True)
+                # otro request aún no debe ver una versión nueva
+                self.assertEqual(get_theme_version(), before)
+        self.assertNotEqual(get_theme_version(), before)
+        self.assertEqual(get_active_theme().name, "Nuevo")
+
+    def test_delete_invalidates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            theme = Theme.objects.create(name="Viejo", is_active=True)
+        self.assertEqual(get_active_theme(), theme)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            theme.delete()
+        self.assertIsNone(get_active_theme())
+
+
+@override_settings(THEME_IMAGES_ASYNC=False, TABLE_VERSIONS_SHARED=False, THEME_LOCAL_CACHE_TTL=5)
+class ProcessLocalThemeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_other_workers_see_the_change_after_the_ttl(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Theme.objects.create(name="Viejo", is_active=True)
+        with mock.patch("theme.cache.time.time", return_value=1000.0):
+            self.assertEqual(get_active_theme().name, "Viejo")
+
+        # otro worker guardó el tema: su bump no llega a esta caché
+        Theme.objects.update(name="Nuevo")
+        with mock.patch("theme.cache.time.time", return_value=1003.0):
+            self.assertEqual(get_active_theme().name, "Viejo")
+        with mock.patch("theme.cache.time.time", return_value=1006.0):
+            self.assertEqual(get_active_theme().name, "Nuevo")